@@ -0,0 +1,20 @@
+import os
+import sys
+
+# The shared core is vendored next to this file in the deployment package; fall
+# back to the source tree layout when running from a checkout
+try:
+    from watchy_core import run_multi_monitor
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from watchy_core import run_multi_monitor
+from watchy_core.providers import load_providers
+
+def lambda_handler(event, context):
+    """Main Lambda handler polling every configured provider in one invocation
+
+    Providers come from event['providers'] when present, otherwise from the
+    WATCHY_PROVIDERS environment variable; both are JSON lists of registry
+    names or {"type": ..., "api_url": ..., "namespace": ..., "log_group": ...}.
+    """
+    return run_multi_monitor(load_providers(event), context)
@@ -0,0 +1,19 @@
+"""Shared, provider-agnostic core of the Watchy monitoring functions.
+
+Every monitoring Lambda vendors this package into its deployment zip and only
+supplies a Provider adapter describing its status API; fetching, deduplication,
+log publishing and metric publishing all live here.
+"""
+import os
+
+from . import startup
+
+# Version information - will be set during build
+VERSION = os.getenv('LAMBDA_VERSION', '1.0.0')
+
+from .provider import Provider  # noqa: E402
+from .pipeline import run_monitor, run_multi_monitor  # noqa: E402
+
+startup.mark_init_complete()
+
+__all__ = ['VERSION', 'Provider', 'run_monitor', 'run_multi_monitor']
@@ -0,0 +1,248 @@
+"""Content-addressed archive of the raw status payloads, kept locally or in S3
+
+Every changed payload a provider fetches is stored gzip-compressed under the
+SHA-256 of its bytes (blobs/<2 hex>/<digest>.json.gz), so a document fetched
+again later is stored once, and indexed by fetch time under
+index/<provider>/<epoch ms, 13 digits>-<digest>. Index entries are empty
+objects whose key says everything, so writing one never reads anything back
+and the functions only need to put objects. A snapshot is in effect from its
+index time until the next entry; tools/archive.py lists, shows and replays
+the snapshots of a time range.
+
+The raw bytes are compressed as they stream in, next to the decoding, and
+written by the publishing stage of the run, so a payload is archived exactly
+as the API returned it, already published notes included.
+"""
+import gzip
+import os
+import time
+import zlib
+from functools import partial
+from typing import Dict, Callable, List, Optional, Set, Tuple
+
+from .clients import get_boto3_client
+from .log import log_json
+from .timing import record_duration
+
+# Snapshots fetched but not archived yet, per provider state key: fetch time,
+# digest and compressed body
+_PENDING_SNAPSHOTS: Dict[str, Tuple[int, str, bytes]] = {}
+
+# Blobs known to be stored, per archive location, and the digest last indexed
+# per location and provider, kept across warm invocations
+_STORED_BLOBS: Set[Tuple[str, str]] = set()
+_LAST_INDEXED: Dict[Tuple[str, str], str] = {}
+
+def blob_key(digest: str) -> str:
+    return f"blobs/{digest[:2]}/{digest}.json.gz"
+
+def index_key(provider_name: str, fetched_ms: int, digest: str) -> str:
+    return f"index/{provider_name}/{fetched_ms:013d}-{digest}"
+
+def parse_index_name(name: str) -> Tuple[int, str]:
+    """(fetch time, digest) of an index entry name"""
+    fetched_ms, _, digest = name.rpartition('/')[2].partition('-')
+    return int(fetched_ms), digest
+
+def in_effect(entries: List[Tuple[int, str]], since_ms: Optional[int] = None,
+              until_ms: Optional[int] = None) -> List[Tuple[int, str]]:
+    """The time-ordered index entries in effect during [since_ms, until_ms)
+
+    That is the entries indexed in the window plus the last one before it,
+    which is what the API returned when the window started.
+    """
+    entries = sorted(entries)
+    start = 0
+    if since_ms is not None:
+        while start + 1 < len(entries) and entries[start + 1][0] <= since_ms:
+            start += 1
+    return [entry for entry in entries[start:] if until_ms is None or entry[0] < until_ms]
+
+class SnapshotArchive:
+    """Where the snapshot blobs and their time index live"""
+    location = ''
+
+    def has_blob(self, digest: str) -> bool:
+        """Whether a blob is known to be stored; False when checking would cost a request"""
+        return False
+
+    def put_blob(self, digest: str, blob: bytes):
+        raise NotImplementedError
+
+    def get_blob(self, digest: str) -> bytes:
+        raise NotImplementedError
+
+    def put_index(self, provider_name: str, fetched_ms: int, digest: str):
+        raise NotImplementedError
+
+    def list_index(self, provider_name: str) -> List[Tuple[int, str]]:
+        """Every (fetch time, digest) entry of a provider, oldest first"""
+        raise NotImplementedError
+
+    def store(self, provider_name: str, fetched_ms: int, digest: str, blob: bytes) -> bool:
+        """Store one compressed snapshot; returns whether its blob was written
+
+        The blob is skipped when this container already stored it, and the
+        index entry when the provider's last indexed snapshot is the same one,
+        e.g. when a run retries publishing a payload.
+        """
+        written = False
+        if (self.location, digest) not in _STORED_BLOBS and not self.has_blob(digest):
+            self.put_blob(digest, blob)
+            written = True
+        _STORED_BLOBS.add((self.location, digest))
+        if _LAST_INDEXED.get((self.location, provider_name)) != digest:
+            self.put_index(provider_name, fetched_ms, digest)
+            _LAST_INDEXED[(self.location, provider_name)] = digest
+        return written
+
+    def snapshots(self, provider_name: str, since_ms: Optional[int] = None,
+                  until_ms: Optional[int] = None) -> List[Tuple[int, str]]:
+        """The (fetch time, digest) entries in effect during [since_ms, until_ms)"""
+        return in_effect(self.list_index(provider_name), since_ms, until_ms)
+
+    def load(self, digest: str) -> bytes:
+        """The raw payload bytes of a snapshot"""
+        return gzip.decompress(self.get_blob(digest))
+
+class FileSnapshotArchive(SnapshotArchive):
+    """Snapshots kept as files in a local directory"""
+
+    def __init__(self, directory: str):
+        self.location = self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, *key.split('/'))
+
+    def has_blob(self, digest: str) -> bool:
+        return os.path.exists(self._path(blob_key(digest)))
+
+    def put_blob(self, digest: str, blob: bytes):
+        path = self._path(blob_key(digest))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+
+    def get_blob(self, digest: str) -> bytes:
+        with open(self._path(blob_key(digest)), 'rb') as f:
+            return f.read()
+
+    def put_index(self, provider_name: str, fetched_ms: int, digest: str):
+        path = self._path(index_key(provider_name, fetched_ms, digest))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'wb').close()
+
+    def list_index(self, provider_name: str) -> List[Tuple[int, str]]:
+        try:
+            names = os.listdir(self._path(f"index/{provider_name}"))
+        except FileNotFoundError:
+            return []
+        return sorted(parse_index_name(name) for name in names)
+
+class S3SnapshotArchive(SnapshotArchive):
+    """Snapshots stored as S3 objects under a prefix"""
+
+    def __init__(self, bucket: str, prefix: str = 'watchy-archive/'):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.location = f"s3://{bucket}/{prefix}"
+
+    def put_blob(self, digest: str, blob: bytes):
+        # Overwriting a blob after a cold start rewrites the same bytes, which is
+        # cheaper than asking first and needs no read permission
+        get_boto3_client('s3').put_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{blob_key(digest)}",
+            Body=blob,
+            ContentType='application/json',
+            ContentEncoding='gzip'
+        )
+
+    def get_blob(self, digest: str) -> bytes:
+        response = get_boto3_client('s3').get_object(Bucket=self.bucket, Key=f"{self.prefix}{blob_key(digest)}")
+        return response['Body'].read()
+
+    def put_index(self, provider_name: str, fetched_ms: int, digest: str):
+        get_boto3_client('s3').put_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{index_key(provider_name, fetched_ms, digest)}",
+            Body=b''
+        )
+
+    def list_index(self, provider_name: str) -> List[Tuple[int, str]]:
+        paginator = get_boto3_client('s3').get_paginator('list_objects_v2')
+        entries = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}index/{provider_name}/"):
+            entries.extend(parse_index_name(item['Key']) for item in page.get('Contents', []))
+        return sorted(entries)
+
+def parse_archive_location(backend: str, location: str) -> Optional[SnapshotArchive]:
+    """Build an archive from a backend name and its directory or bucket[/prefix]"""
+    if backend == 's3':
+        bucket, _, prefix = location.partition('/')
+        return S3SnapshotArchive(bucket, f"{prefix.strip('/')}/" if prefix else 'watchy-archive/')
+    if backend == 'file':
+        return FileSnapshotArchive(location or '/tmp/watchy-archive')
+    return None
+
+def get_snapshot_archive() -> Optional[SnapshotArchive]:
+    """Build the archive selected by WATCHY_ARCHIVE_BACKEND / WATCHY_ARCHIVE_LOCATION, if any"""
+    return parse_archive_location(os.getenv('WATCHY_ARCHIVE_BACKEND', 'none').lower(),
+                                  os.getenv('WATCHY_ARCHIVE_LOCATION', ''))
+
+class SnapshotStager:
+    """Compresses one fetched payload as it streams in, staged once it turns out to have changed
+
+    seconds is the time spent compressing, which the fetch reports as Archive.
+    """
+
+    def __init__(self, state_key: str):
+        self.state_key = state_key
+        self.seconds = 0.0
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip
+        self._parts: List[bytes] = []
+
+    def feed(self, part: bytes):
+        stage_start = time.time()
+        self._parts.append(self._compressor.compress(part))
+        self.seconds += time.time() - stage_start
+
+    def stage(self, digest: str):
+        """Keep the compressed payload until the run publishes"""
+        self._parts.append(self._compressor.flush())
+        _PENDING_SNAPSHOTS[self.state_key] = (int(time.time() * 1000), digest, b''.join(self._parts))
+        self._parts = []
+
+def snapshot_hook(provider) -> Optional[Callable[[], SnapshotStager]]:
+    """The fetch's factory of stagers for a provider's raw payloads, or None when archiving is off"""
+    if os.getenv('WATCHY_ARCHIVE_BACKEND', 'none').lower() not in ('file', 's3'):
+        return None
+    return partial(SnapshotStager, provider.state_key)
+
+def discard_snapshot(provider):
+    """Drop the provider's staged snapshot, whose payload will not be published"""
+    _PENDING_SNAPSHOTS.pop(provider.state_key, None)
+
+def archive_snapshot(provider) -> bool:
+    """Write the provider's staged snapshot to the archive; returns whether a new blob was stored"""
+    pending = _PENDING_SNAPSHOTS.pop(provider.state_key, None)
+    archive = get_snapshot_archive()
+    if pending is None or archive is None:
+        return False
+    fetched_ms, digest, blob = pending
+    stage_start = time.time()
+    try:
+        written = archive.store(provider.name, fetched_ms, digest, blob)
+        log_json("DEBUG", "Archived status snapshot",
+                provider=provider.name,
+                digest=digest,
+                blob_bytes=len(blob),
+                new_blob=written)
+        return written
+    except Exception as e:
+        log_json("ERROR", "Failed to archive status snapshot", provider=provider.name, error=str(e))
+        return False
+    finally:
+        record_duration('Archive', time.time() - stage_start)
@@ -0,0 +1,135 @@
+"""Adaptive polling cadence
+
+The schedule fires every POLLING_INTERVAL_MINUTES whatever a vendor's state.
+While a provider has open incidents, the invocation keeps polling it every
+WATCHY_FAST_POLL_SECONDS until shortly before the next scheduled run, so
+escalations and updates show up within a minute. Once a provider has been
+healthy for WATCHY_RELAX_AFTER_MINUTES, scheduled runs only fetch it every
+WATCHY_SLOW_POLL_MINUTES and re-emit its last metrics in between, so the
+alarms keep their data. The cadence state lives in the warm container, so a
+cold start always polls.
+"""
+import os
+import time
+from typing import Dict, Any, Iterator, List, Optional, Set
+
+from .log import log_json
+from .model import Incident
+from .timing import maximum
+
+# Per state key: when this container last fetched the provider, since when it
+# has been healthy (None while incidents are open or the API fails) and whether
+# incidents were open at the last poll
+_POLL_STATE: Dict[str, Dict[str, Any]] = {}
+
+# Fast polling stops this long before the next scheduled run would start
+FAST_POLL_MARGIN_SECONDS = 30
+
+# Time kept back from the Lambda deadline at the end of the fast polls
+FAST_POLL_RESERVE_SECONDS = 30
+
+# A relaxed provider is fetched when its slow interval is this close to elapsing,
+# so schedule jitter does not push the fetch a whole schedule period out
+SLOW_POLL_TOLERANCE_MS = 60 * 1000
+
+def get_cadence_config() -> Dict[str, int]:
+    """Return the fast poll interval (seconds), slow poll interval and relax delay (minutes); 0 disables"""
+    return {
+        'fast_poll_seconds': int(os.getenv('WATCHY_FAST_POLL_SECONDS', '60')),
+        'slow_poll_minutes': int(os.getenv('WATCHY_SLOW_POLL_MINUTES', '0')),
+        'relax_after_minutes': int(os.getenv('WATCHY_RELAX_AFTER_MINUTES', '60'))
+    }
+
+def _poll_state(provider) -> Dict[str, Any]:
+    return _POLL_STATE.setdefault(provider.state_key, {'last_poll': None, 'healthy_since': None, 'active': False})
+
+def poll_due(provider, now_ms: Optional[int] = None) -> bool:
+    """Whether this run should fetch the provider rather than re-emit its last metrics"""
+    slow_poll_minutes = get_cadence_config()['slow_poll_minutes']
+    state = _POLL_STATE.get(provider.state_key)
+    if not slow_poll_minutes or state is None or state['last_poll'] is None or state['healthy_since'] is None:
+        return True
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    if now_ms - state['healthy_since'] < get_cadence_config()['relax_after_minutes'] * 60 * 1000:
+        return True
+    return now_ms - state['last_poll'] >= slow_poll_minutes * 60 * 1000 - SLOW_POLL_TOLERANCE_MS
+
+def poll_window_minutes(provider, now_ms: Optional[int] = None) -> Optional[float]:
+    """Minutes since this container last fetched the provider, or None when it has not yet
+
+    Without usable cursors, deduplication falls back to publishing the items
+    of this window; with a variable cadence it is the time since the previous
+    fetch rather than the fixed polling interval.
+    """
+    state = _POLL_STATE.get(provider.state_key)
+    if state is None or state['last_poll'] is None:
+        return None
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    return (now_ms - state['last_poll']) / 60000
+
+def record_poll(provider, metrics: Dict[str, Any], polled: bool, now_ms: Optional[int] = None):
+    """Remember the outcome of a run for the cadence of the next ones"""
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    state = _poll_state(provider)
+    if polled:
+        state['last_poll'] = now_ms
+    if metrics.get('APIResponse') != 200:
+        state['healthy_since'] = None
+        state['active'] = False
+        return
+    state['active'] = metrics.get(provider.active_incidents_metric, 0) > 0
+    if state['active']:
+        state['healthy_since'] = None
+    elif state['healthy_since'] is None:
+        state['healthy_since'] = now_ms
+
+def has_open_incidents(provider) -> bool:
+    state = _POLL_STATE.get(provider.state_key)
+    return state is not None and state['active']
+
+def fast_polls(providers: List[Any], context, start_time: float, polling_interval: int) -> Iterator[List[Any]]:
+    """Yield the providers with open incidents every fast poll interval while time remains
+
+    Each pass after a yield must finish before the next scheduled run starts
+    and before the Lambda deadline, judged by the slowest pass so far. Without
+    a Lambda context (local tools) nothing is yielded.
+    """
+    fast_poll_seconds = get_cadence_config()['fast_poll_seconds']
+    if fast_poll_seconds <= 0 or context is None:
+        return
+    deadline = min(start_time + polling_interval * 60 - FAST_POLL_MARGIN_SECONDS,
+                   time.time() + context.get_remaining_time_in_millis() / 1000 - FAST_POLL_RESERVE_SECONDS)
+    longest_pass = 0.0
+    while True:
+        active = [provider for provider in providers if has_open_incidents(provider)]
+        if not active or time.time() + fast_poll_seconds + longest_pass > deadline:
+            return
+        time.sleep(fast_poll_seconds)
+        log_json("DEBUG", "Fast poll", providers=[provider.name for provider in active])
+        pass_start = time.time()
+        yield active
+        longest_pass = max(longest_pass, time.time() - pass_start)
+
+def record_detections(provider, incidents: List[Incident], cursor_state: Dict[str, Any],
+                      known_incidents: Optional[Set[str]], now_ms: Optional[int] = None):
+    """Report DetectionLatency for incidents seen for the first time and give each a cursor
+
+    known_incidents are the cursor keys from before this run, or None when the
+    cursors are only being bootstrapped and every incident looks new. The
+    empty cursor marks an incident as seen even before it has log items, and
+    still lets all its items through.
+    """
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    cursors = cursor_state.setdefault('incidents', {})
+    for incident in incidents:
+        incident_key = incident.key
+        if incident_key not in cursors:
+            cursors[incident_key] = {'ts': 0, 'ids': [], 'seen': now_ms}
+        if known_incidents is None or incident_key in known_incidents or incident.started_ms is None:
+            continue
+        latency_seconds = max(0, (now_ms - incident.started_ms) // 1000)
+        maximum('DetectionLatency', latency_seconds)
+        log_json("INFO", "Detected new incident",
+                provider=provider.name,
+                incident_id=incident_key,
+                detection_latency_seconds=latency_seconds)
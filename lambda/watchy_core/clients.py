@@ -0,0 +1,76 @@
+"""Warm-container caches for boto3 clients and HTTP connections
+
+Module-level state lives as long as the Lambda execution environment, so
+clients and connections are only built on a cold start and dropped on error.
+boto3 itself is imported on first use: it dominates the import time of the
+package, and a run with nothing to send (EMF metrics, unchanged payload, file
+state) never needs it.
+"""
+import http.client
+import threading
+import urllib.parse
+from typing import Dict, Any, List, Tuple
+
+from .log import log_json
+
+_BOTO3_CLIENTS: Dict[str, Any] = {}
+# Idle keep-alive connections per (scheme, host). A connection is checked out
+# while a request is in flight, so concurrent fetches never share one
+_HTTP_CONNECTIONS: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+_LOCK = threading.Lock()
+
+def get_boto3_client(service_name: str):
+    """Return a boto3 client cached for the lifetime of the execution environment"""
+    client = _BOTO3_CLIENTS.get(service_name)
+    if client is None:
+        # Creating clients from the default session is not thread-safe
+        with _LOCK:
+            client = _BOTO3_CLIENTS.get(service_name)
+            if client is None:
+                import boto3  # Deferred: see module docstring
+                client = boto3.client(service_name)
+                _BOTO3_CLIENTS[service_name] = client
+                log_json("DEBUG", "Created boto3 client", service=service_name)
+    return client
+
+def set_boto3_client(service_name: str, client):
+    """Install a client for a service, e.g. a local stand-in used by the benchmarks"""
+    with _LOCK:
+        _BOTO3_CLIENTS[service_name] = client
+
+def invalidate_boto3_client(service_name: str):
+    """Drop a cached boto3 client so the next call builds a fresh one"""
+    _BOTO3_CLIENTS.pop(service_name, None)
+
+def get_http_connection(api_url: str, timeout: int = 30) -> Tuple[http.client.HTTPConnection, str, bool]:
+    """Check out a keep-alive connection for the API host, the request path and whether it was reused
+
+    Hand the connection back with release_http_connection() once the response
+    has been read, or close it with invalidate_http_connection() on error.
+    """
+    parsed = urllib.parse.urlsplit(api_url)
+    key = (parsed.scheme, parsed.netloc)
+    path = parsed.path or '/'
+    if parsed.query:
+        path = f"{path}?{parsed.query}"
+
+    with _LOCK:
+        idle = _HTTP_CONNECTIONS.get(key)
+        if idle:
+            return idle.pop(), path, True
+
+    if parsed.scheme == 'https':
+        conn = http.client.HTTPSConnection(parsed.netloc, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(parsed.netloc, timeout=timeout)
+    return conn, path, False
+
+def release_http_connection(api_url: str, conn: http.client.HTTPConnection):
+    """Return a connection whose response has been fully read to the idle pool"""
+    parsed = urllib.parse.urlsplit(api_url)
+    with _LOCK:
+        _HTTP_CONNECTIONS.setdefault((parsed.scheme, parsed.netloc), []).append(conn)
+
+def invalidate_http_connection(conn: http.client.HTTPConnection):
+    """Close a checked-out connection instead of returning it to the pool"""
+    conn.close()
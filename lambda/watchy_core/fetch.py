@@ -0,0 +1,612 @@
+"""Status API fetching with conditional GET, compression, retries and a circuit breaker"""
+import codecs
+import functools
+import hashlib
+import http.client
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from .clients import get_http_connection, release_http_connection, invalidate_http_connection
+from .log import log_json
+from .timing import count, record_duration
+
+# Statuses worth another attempt; anything else non-2xx fails straight away
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8
+
+# Circuit breaker state per API URL, kept across warm invocations: consecutive
+# failed fetches and, while open, when the next trial request is allowed
+_CIRCUITS: Dict[str, Dict[str, Any]] = {}
+_CIRCUIT_LOCK = threading.Lock()
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a status API whose circuit is open"""
+
+class RetryableStatusError(Exception):
+    """A transient HTTP status that is worth retrying"""
+
+class ContentDecodingError(http.client.HTTPException):
+    """A compressed body that cannot be decoded, retried like a broken connection"""
+
+class FetchCancelled(Exception):
+    """Raised instead of staging the results of a fetch its pass stopped waiting for"""
+
+# The cancellation token of the fetch executing on each thread, see FetchToken
+_ACTIVE_FETCH = threading.local()
+
+class FetchToken:
+    """Lets a pass give up on a fetch still running in a worker thread
+
+    The worker stages its validators, snapshot and poll record under the
+    token's lock, so once cancel() returns nothing more is staged for the
+    pass; whatever was staged before is the pass's to discard.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+
+    @contextmanager
+    def active(self) -> Iterator['FetchToken']:
+        """Make this the token that staging() checks on the current thread"""
+        previous = getattr(_ACTIVE_FETCH, 'token', None)
+        _ACTIVE_FETCH.token = self
+        try:
+            yield self
+        finally:
+            _ACTIVE_FETCH.token = previous
+
+@contextmanager
+def staging() -> Iterator[None]:
+    """Stage a fetch's results, or raise FetchCancelled when its pass gave up on it"""
+    token = getattr(_ACTIVE_FETCH, 'token', None)
+    if token is None:
+        yield
+        return
+    with token._lock:
+        if token.cancelled:
+            raise FetchCancelled("Fetch abandoned after its pass timed out")
+        yield
+
+# Response bodies are read and decompressed in chunks of this size, and may not
+# expand beyond MAX_DECODED_BYTES, so a broken or hostile server cannot make a
+# small compressed answer exhaust the function's memory
+READ_CHUNK_BYTES = 64 * 1024
+MAX_DECODED_BYTES = 64 * 1024 * 1024
+# Decompressed parts are decoded to text this much at a time, so the text of a
+# whole part is never held next to the part and the document decoded from it
+DECODE_SLICE_BYTES = 16 * 1024
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters a number may go on with, e.g. '1.' or '1e' cut off by the end of a part
+_JSON_NUMBER_TAIL = re.compile(r'[0-9eE.+\-]*')
+
+# Conditional GET state per API URL: validators and body hash of the last fully
+# published payload, plus the metrics to re-emit as a heartbeat while it is unchanged
+_CONDITIONAL_CACHE: Dict[str, Dict[str, Any]] = {}
+_PENDING_VALIDATORS: Dict[str, Dict[str, Any]] = {}
+
+def get_conditional_cache(api_url: str) -> Optional[Dict[str, Any]]:
+    """Return the cached validators, metrics and incident count of the last published payload"""
+    return _CONDITIONAL_CACHE.get(api_url)
+
+def discard_conditional_validators(api_url: str):
+    """Forget the validators staged by a fetch whose payload will not be published"""
+    _PENDING_VALIDATORS.pop(api_url, None)
+
+def commit_conditional_validators(api_url: str, metrics: Dict[str, int], active_incidents: int):
+    """Remember the validators of the last fetched payload once it has been published"""
+    pending = _PENDING_VALIDATORS.pop(api_url, None)
+    if pending is not None:
+        _CONDITIONAL_CACHE[api_url] = {
+            **pending,
+            'metrics': dict(metrics),
+            'active_incidents': active_incidents
+        }
+
+def get_fetch_config() -> Tuple[int, float, float, float]:
+    """Return the retry count, connect and read timeouts, and the total time budget of a fetch
+
+    WATCHY_RETRY_ATTEMPTS is the number of retries after the first attempt. All
+    attempts and backoff sleeps together stay within a quarter of the function
+    timeout (WATCHY_TIMEOUT_SECONDS), so a hung status API cannot eat the run.
+    """
+    retries = max(0, int(os.getenv('WATCHY_RETRY_ATTEMPTS', '3')))
+    connect_timeout = float(os.getenv('WATCHY_CONNECT_TIMEOUT_SECONDS', '3'))
+    read_timeout = float(os.getenv('WATCHY_READ_TIMEOUT_SECONDS', '10'))
+    budget = max(connect_timeout + read_timeout, int(os.getenv('WATCHY_TIMEOUT_SECONDS', '240')) / 4)
+    return retries, connect_timeout, read_timeout, budget
+
+def get_circuit_config() -> Tuple[int, int]:
+    """Return the consecutive failures that open a circuit and how long it stays open"""
+    threshold = max(1, int(os.getenv('WATCHY_CIRCUIT_FAILURE_THRESHOLD', '3')))
+    cooldown = int(os.getenv('WATCHY_CIRCUIT_COOLDOWN_SECONDS', '300'))
+    return threshold, cooldown
+
+def check_circuit(api_url: str) -> bool:
+    """Fail fast while the circuit is open; return whether this call is a half-open trial"""
+    with _CIRCUIT_LOCK:
+        circuit = _CIRCUITS.get(api_url)
+        if circuit is None or circuit['open_until'] is None:
+            return False
+        if time.time() < circuit['open_until']:
+            raise CircuitOpenError(f"Circuit open after {circuit['failures']} consecutive failures, "
+                                   f"retrying in {int(circuit['open_until'] - time.time())}s")
+        # Cooldown over: let exactly one trial request through
+        circuit['open_until'] = time.time() + get_circuit_config()[1]
+        return True
+
+def record_fetch_result(api_url: str, success: bool):
+    """Close the circuit on success, or count the failure and open it at the threshold"""
+    with _CIRCUIT_LOCK:
+        if success:
+            if api_url in _CIRCUITS and _CIRCUITS[api_url]['open_until'] is not None:
+                log_json("INFO", "Circuit closed", api_url=api_url)
+            _CIRCUITS.pop(api_url, None)
+            return
+
+        threshold, cooldown = get_circuit_config()
+        circuit = _CIRCUITS.setdefault(api_url, {'failures': 0, 'open_until': None})
+        circuit['failures'] += 1
+        if circuit['failures'] >= threshold:
+            circuit['open_until'] = time.time() + cooldown
+            log_json("WARN", "Circuit opened",
+                    api_url=api_url,
+                    consecutive_failures=circuit['failures'],
+                    cooldown_seconds=cooldown)
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Full-jitter exponential backoff, honouring a numeric Retry-After header"""
+    delay = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, min(BACKOFF_MAX_SECONDS, int(retry_after)))
+    return delay
+
+@functools.lru_cache(maxsize=None)
+def _load_codec(encoding: str) -> Any:
+    """Module decoding a content coding beyond gzip, or None when this runtime lacks it"""
+    try:
+        if encoding == 'zstd':
+            from compression import zstd  # Standard library from Python 3.14
+            return zstd
+        if encoding == 'br':
+            import brotli  # Optional, not bundled with the functions
+            return brotli
+    except ImportError:
+        pass
+    return None
+
+def accept_encoding() -> Optional[str]:
+    """Accept-Encoding of status API requests: gzip, plus zstd and br when they can be decoded
+
+    Returns None, sending no Accept-Encoding and getting the identity coding,
+    when WATCHY_COMPRESSED_FETCH is false.
+    """
+    if os.getenv('WATCHY_COMPRESSED_FETCH', 'true').lower() != 'true':
+        return None
+    return ', '.join(['gzip'] + [encoding for encoding in ('zstd', 'br') if _load_codec(encoding)])
+
+def _decompressor(encoding: str) -> Tuple[Callable[[bytes], bytes], Callable[[], bool]]:
+    """Return a chunk decompressing function and a check that the whole stream was seen"""
+    if encoding in ('gzip', 'x-gzip'):
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        return decoder.decompress, lambda: decoder.eof
+    codec = _load_codec(encoding)
+    if encoding == 'zstd' and codec:
+        decoder = codec.ZstdDecompressor()
+        return decoder.decompress, lambda: decoder.eof
+    if encoding == 'br' and codec:
+        decoder = codec.Decompressor()
+        return decoder.process, decoder.is_finished
+    raise ContentDecodingError(f"Unsupported Content-Encoding {encoding}")
+
+def read_body(response: http.client.HTTPResponse,
+              on_part: Optional[Callable[[bytes], None]] = None) -> Tuple[bytes, int]:
+    """Read a response body, decompressing it as it streams in; return it and its size on the wire
+
+    With on_part, each decoded part is handed to it as it arrives instead of
+    being collected, and the body returned is empty.
+    """
+    encoding = (response.getheader('Content-Encoding') or 'identity').strip().lower()
+    if encoding == 'identity' and on_part is None:
+        body = response.read()
+        return body, len(body)
+
+    identity = encoding == 'identity'
+    decompress, finished = (None, None) if identity else _decompressor(encoding)
+    ended = False
+    parts = []
+    wire_bytes = decoded_bytes = 0
+    while True:
+        chunk = response.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        wire_bytes += len(chunk)
+        if identity:
+            part = chunk
+        elif ended:
+            continue  # Data after the end of the compressed stream is ignored
+        else:
+            try:
+                part = decompress(chunk)
+            except Exception as e:
+                raise ContentDecodingError(f"Invalid {encoding} body: {e}") from e
+            decoded_bytes += len(part)
+            if decoded_bytes > MAX_DECODED_BYTES:
+                raise ContentDecodingError(f"{encoding} body expands beyond {MAX_DECODED_BYTES} bytes")
+            if finished():
+                # Free the decompressor and its window before the part is decoded
+                ended = True
+                decompress = finished = None
+        if on_part is None:
+            parts.append(part)
+        elif part:
+            on_part(part)
+    # An empty body (such as a 304's) carries no stream at all
+    if not identity and wire_bytes and not ended:
+        raise ContentDecodingError(f"Truncated {encoding} body")
+    return b''.join(parts), wire_bytes
+
+def _skip_whitespace(text: str, idx: int) -> int:
+    return _JSON_WHITESPACE.match(text, idx).end()
+
+def _expect(text: str, idx: int, chars: str, what: str) -> Tuple[str, int]:
+    """Return the delimiter at idx (one of chars) and the index after it and any whitespace"""
+    char = text[idx:idx + 1]
+    if not char or char not in chars:
+        raise json.JSONDecodeError(f"Expecting {what}", text, idx)
+    return char, _skip_whitespace(text, idx + 1)
+
+class StatusDecoder:
+    """Incremental decoder of a status document, fed its text as it arrives
+
+    The top-level values of an object are decoded as soon as they are
+    complete, and the array under stream_key (the incident list) element by
+    element, each element handed to on_element before the next is decoded, so
+    it can drop what it does not need, such as already published notes. Text
+    already decoded is dropped, so only the value being decoded is held, never
+    the whole text. Documents that are not objects are kept and decoded by
+    close().
+    """
+
+    def __init__(self, stream_key: Optional[str] = None, on_element: Optional[Callable[[Any], None]] = None):
+        self.stream_key = stream_key
+        self.on_element = on_element
+        self.document: Dict[str, Any] = {}
+        self._state = 'start'
+        self._key = None
+        self._array: Optional[List[Any]] = None
+        self._text = ''  # Text not decoded yet, from _idx on
+        self._idx = 0
+        self._pending: List[str] = []  # Text fed since _text was last joined
+        self._pending_chars = 0
+        # Characters to wait for before decoding again: twice what a cut-off
+        # value had, so a large value is re-parsed a bounded number of times
+        self._wanted = 0
+
+    def feed(self, text: str):
+        if not text:
+            return
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._state != 'raw' and len(self._text) - self._idx + self._pending_chars >= self._wanted:
+            self._decode(final=False)
+
+    def close(self) -> Any:
+        """Decode the rest of the text and return the document"""
+        self._decode(final=True)
+        if self._state == 'raw':
+            return json.loads(self._text[self._idx:])
+        if self._state != 'end':
+            raise json.JSONDecodeError("Unterminated document", self._text, len(self._text))
+        return self.document
+
+    def _value(self, text: str, idx: int, final: bool) -> Optional[Tuple[Any, int]]:
+        """Decode the value at idx, or return None when the text so far may end inside it"""
+        try:
+            value, end = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            self._wanted = 2 * (len(text) - idx)
+            return None
+        if not final and _JSON_NUMBER_TAIL.match(text, end).end() == len(text):
+            self._wanted = len(text) - idx + 1  # A number may go on in the next part
+            return None
+        self._wanted = 0
+        return value, end
+
+    def _decode(self, final: bool):
+        if self._pending:
+            # One copy of what is left, with the decoded text released first
+            self._pending.insert(0, self._text[self._idx:])
+            self._text = ''
+            self._text = ''.join(self._pending)
+            self._idx = 0
+            self._pending = []
+            self._pending_chars = 0
+        text = self._text
+        idx = self._idx
+        while self._state != 'raw':
+            idx = _skip_whitespace(text, idx)
+            if idx == len(text):
+                break
+            state = self._state
+            if state == 'start':
+                if text[idx] != '{':
+                    self._state = 'raw'
+                    break
+                self._state = 'first_key'
+                idx += 1
+            elif state in ('first_key', 'key'):
+                if state == 'first_key' and text[idx] == '}':
+                    self._state = 'end'
+                    idx += 1
+                    continue
+                if text[idx] != '"':
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+                decoded = self._value(text, idx, final)
+                if decoded is None:
+                    break
+                self._key, idx = decoded
+                self._state = 'colon'
+            elif state == 'colon':
+                _, idx = _expect(text, idx, ':', "':' delimiter")
+                self._state = 'value'
+            elif state == 'value':
+                if self._key == self.stream_key and self.on_element is not None and text[idx] == '[':
+                    self._array = self.document[self._key] = []
+                    self._state = 'first_element'
+                    idx += 1
+                    continue
+                decoded = self._value(text, idx, final)
+                if decoded is None:
+                    break
+                self.document[self._key], idx = decoded
+                self._state = 'after_value'
+            elif state == 'after_value':
+                delimiter, idx = _expect(text, idx, ',}', "',' delimiter")
+                self._state = 'key' if delimiter == ',' else 'end'
+            elif state == 'first_element' and text[idx] == ']':
+                self._state = 'after_value'
+                idx += 1
+            elif state in ('first_element', 'element'):
+                decoded = self._value(text, idx, final)
+                if decoded is None:
+                    break
+                element, idx = decoded
+                self.on_element(element)
+                self._array.append(element)
+                self._state = 'after_element'
+            elif state == 'after_element':
+                delimiter, idx = _expect(text, idx, ',]', "',' delimiter")
+                self._state = 'element' if delimiter == ',' else 'after_value'
+            else:
+                raise json.JSONDecodeError("Extra data", text, idx)
+        self._idx = idx
+
+def decode_status_json(text: str, stream_key: Optional[str] = None,
+                       on_element: Optional[Callable[[Any], None]] = None) -> Any:
+    """Decode a whole status document with StatusDecoder"""
+    decoder = StatusDecoder(stream_key, on_element)
+    decoder.feed(text)
+    return decoder.close()
+
+class StatusBody:
+    """A 200 response body consumed as it streams in
+
+    Every part is hashed, counted, handed to the snapshot stager when there is
+    one and decoded with StatusDecoder, so the raw body and its text are never
+    held whole.
+    """
+
+    def __init__(self, stream_key: Optional[str] = None, on_element: Optional[Callable[[Any], None]] = None,
+                 snapshot: Any = None):
+        self.size = 0
+        self.seconds = 0.0  # Spent hashing and decoding
+        self.snapshot = snapshot
+        self._hash = hashlib.sha256()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = StatusDecoder(stream_key, on_element)
+
+    def feed(self, part: bytes):
+        if self.snapshot is not None:
+            self.snapshot.feed(part)
+        stage_start = time.time()
+        self.size += len(part)
+        self._hash.update(part)
+        view = memoryview(part)
+        for start in range(0, len(part), DECODE_SLICE_BYTES):
+            self._decoder.feed(self._utf8.decode(view[start:start + DECODE_SLICE_BYTES]))
+        self.seconds += time.time() - stage_start
+
+    def close(self) -> Tuple[Any, str]:
+        """Return the decoded document and the SHA-256 hex digest of the body"""
+        stage_start = time.time()
+        try:
+            self._decoder.feed(self._utf8.decode(b'', final=True))
+            return self._decoder.close(), self._hash.hexdigest()
+        finally:
+            self.seconds += time.time() - stage_start
+
+def request_status(api_url: str, headers: Dict[str, str], connect_timeout: float, read_timeout: float,
+                   new_body: Callable[[], StatusBody]) -> Tuple[http.client.HTTPResponse, Optional[StatusBody], int, bool]:
+    """Send one GET on a pooled connection
+
+    Returns the response, a new_body() fed with its body when the status is
+    200 (None otherwise), the body's size on the wire and whether the
+    connection was reused.
+    """
+    # A reused keep-alive connection may have been closed by the server while the
+    # container was frozen, so retry once on a fresh connection in that case
+    for attempt in range(2):
+        conn, path, reused = get_http_connection(api_url, timeout=connect_timeout)
+        body = None
+        try:
+            if conn.sock is None:
+                conn.connect()
+            conn.sock.settimeout(read_timeout)
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            if response.status == 200:
+                body = new_body()
+                _, wire_bytes = read_body(response, body.feed)
+            else:
+                _, wire_bytes = read_body(response)
+            break
+        except (http.client.HTTPException, OSError) as e:
+            invalidate_http_connection(conn)
+            # A timeout means a slow server, not a stale connection
+            if not reused or attempt > 0 or isinstance(e, TimeoutError):
+                raise
+            log_json("DEBUG", "Stale keep-alive connection, reconnecting", error=str(e))
+        except Exception:
+            invalidate_http_connection(conn)  # A document that cannot be decoded, read halfway
+            raise
+
+    # A non-200 answer may leave the connection in an unknown state
+    if response.status in (200, 304):
+        release_http_connection(api_url, conn)
+    else:
+        invalidate_http_connection(conn)
+    return response, body, wire_bytes, reused
+
+def fetch_status_json(api_url: str, user_agent: str, label: str, stream_key: Optional[str] = None,
+                      on_element: Optional[Callable[[Any], None]] = None,
+                      new_snapshot: Optional[Callable[[], Any]] = None) -> Optional[Dict[str, Any]]:
+    """Fetch a status API document, or None when it is unchanged since the last published one
+
+    Connection errors, timeouts, 429 and 5xx answers are retried with jittered
+    exponential backoff within the budget of get_fetch_config(). Repeated
+    failures open a circuit for the URL, after which calls raise
+    CircuitOpenError without touching the network until the cooldown is over.
+    The document is decoded while it streams in (see StatusBody), with
+    stream_key and on_element passed to StatusDecoder. new_snapshot, when
+    given, makes a stager per 200 response: it is fed the raw parts too, and
+    staged with their SHA-256 hex digest when the document changed.
+    """
+    try:
+        trial = check_circuit(api_url)
+        log_json("INFO", f"Fetching {label}", api_url=api_url)
+
+        headers = {
+            'User-Agent': user_agent,
+            'Accept': 'application/json'
+        }
+        encodings = accept_encoding()
+        if encodings:
+            headers['Accept-Encoding'] = encodings
+
+        # Send validators from the last published payload so the API can answer 304
+        cached = _CONDITIONAL_CACHE.get(api_url)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        retries, connect_timeout, read_timeout, budget = get_fetch_config()
+        if trial:
+            retries = 0  # Half-open: a single probe decides whether to close the circuit
+        deadline = time.time() + budget
+
+        def new_body() -> StatusBody:
+            return StatusBody(stream_key, on_element, new_snapshot() if new_snapshot is not None else None)
+
+        # Decoding and archiving happen while the body streams in; they are timed
+        # apart and taken out of the Fetch stage
+        attempt = 0
+        body = None
+        stage_start = time.time()
+        try:
+            while True:
+                retry_after = None
+                try:
+                    response, body, wire_bytes, reused = request_status(api_url, headers, connect_timeout,
+                                                                        read_timeout, new_body)
+                    if response.status in RETRYABLE_STATUSES:
+                        retry_after = response.getheader('Retry-After')
+                        raise RetryableStatusError(f"API returned status {response.status}")
+                    break
+                except (http.client.HTTPException, OSError, RetryableStatusError) as e:
+                    delay = backoff_delay(attempt, retry_after)
+                    # Give up when out of retries or when another attempt cannot finish in time
+                    if attempt >= retries or time.time() + delay + connect_timeout + read_timeout > deadline:
+                        raise
+                    log_json("WARN", f"Retrying {label} fetch",
+                            attempt=attempt + 1,
+                            delay_seconds=round(delay, 2),
+                            error=str(e))
+                    time.sleep(delay)
+                    attempt += 1
+        finally:
+            fetch_seconds = time.time() - stage_start
+            if body is not None:
+                fetch_seconds -= body.seconds
+                if body.snapshot is not None:
+                    fetch_seconds -= body.snapshot.seconds
+                    record_duration('Archive', body.snapshot.seconds)
+            record_duration('Fetch', fetch_seconds)
+
+        if response.status == 304 and cached:
+            record_fetch_result(api_url, True)
+            log_json("INFO", f"{label} not modified", connection_reused=reused)
+            return None
+
+        if response.status != 200:
+            raise Exception(f"API returned status {response.status}")
+
+        count('BytesOnWire', wire_bytes)
+        count('BytesDecoded', body.size)
+
+        try:
+            data, body_hash = body.close()
+        finally:
+            record_duration('Decode', body.seconds)
+
+        # Servers without validator support still let us skip identical payloads
+        if cached and cached.get('body_hash') == body_hash:
+            record_fetch_result(api_url, True)
+            log_json("INFO", f"{label} unchanged", connection_reused=reused)
+            return None
+
+        with staging():
+            _PENDING_VALIDATORS[api_url] = {
+                'etag': response.getheader('ETag'),
+                'last_modified': response.getheader('Last-Modified'),
+                'body_hash': body_hash
+            }
+            if body.snapshot is not None:
+                body.snapshot.stage(body_hash)
+
+        record_fetch_result(api_url, True)
+        log_json("INFO", f"Successfully fetched {label}",
+                connection_reused=reused,
+                attempts=attempt + 1,
+                content_encoding=response.getheader('Content-Encoding') or 'identity')
+        return data
+
+    except CircuitOpenError as e:
+        log_json("WARN", f"Skipping {label} fetch", api_url=api_url, error=str(e))
+        raise
+    except FetchCancelled:
+        # The API answered; only the pass gave up, so the circuit is left alone
+        log_json("WARN", f"Discarding {label} fetched after the deadline", api_url=api_url)
+        raise
+    except Exception as e:
+        record_fetch_result(api_url, False)
+        log_json("ERROR", f"Failed to fetch {label}", error=str(e))
+        raise
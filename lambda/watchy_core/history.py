@@ -0,0 +1,289 @@
+"""Incident history index: a SQLite file per provider, kept locally or synced to S3
+
+Every run that sees a changed payload records the provider's incidents:
+when each started, when it was resolved (reported by the API, or when it
+dropped out of the payload) and which services or components it affected.
+Outage durations, MTTR and incident counts for any window then come from
+an indexed query instead of a Logs Insights scan of the incident logs.
+
+The S3 backend downloads the file once per container and uploads it after
+each run that changed it, so one writer per provider is assumed; that holds
+for the scheduled monitoring functions.
+"""
+import os
+import sqlite3
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from .clients import get_boto3_client
+from .log import log_json
+from .model import Incident
+from .timing import record_duration
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    provider TEXT NOT NULL,
+    incident_id TEXT NOT NULL,
+    title TEXT,
+    severity TEXT,
+    status TEXT,
+    started_ms INTEGER NOT NULL,
+    resolved_ms INTEGER,
+    PRIMARY KEY (provider, incident_id)
+);
+CREATE INDEX IF NOT EXISTS incidents_started ON incidents (provider, started_ms);
+CREATE INDEX IF NOT EXISTS incidents_resolved ON incidents (provider, resolved_ms);
+CREATE TABLE IF NOT EXISTS incident_services (
+    provider TEXT NOT NULL,
+    service TEXT NOT NULL,
+    incident_id TEXT NOT NULL,
+    PRIMARY KEY (provider, service, incident_id)
+) WITHOUT ROWID;
+"""
+
+# Open histories by local path, kept across warm invocations
+_HISTORIES: Dict[str, 'IncidentHistory'] = {}
+
+def merged_duration_ms(intervals: Iterable[Tuple[int, int]]) -> int:
+    """Total time covered by possibly overlapping [start, end) intervals"""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+class IncidentHistory:
+    """Incident history in one SQLite database"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, provider_name: str, incidents: List[Incident], now_ms: Optional[int] = None) -> int:
+        """Upsert the incidents of one payload and resolve open ones it no longer lists
+
+        Returns the number of rows changed, so callers only sync when something
+        happened.
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        changes_before = self.conn.total_changes
+        current = set()
+
+        with self.conn:
+            for incident in incidents:
+                incident_id = incident.key
+                current.add(incident_id)
+                started_ms = incident.started_ms or now_ms
+
+                self.conn.execute(
+                    """INSERT INTO incidents (provider, incident_id, title, severity, status, started_ms, resolved_ms)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (provider, incident_id) DO UPDATE SET
+                           title = excluded.title,
+                           severity = excluded.severity,
+                           status = excluded.status,
+                           started_ms = MIN(started_ms, excluded.started_ms),
+                           resolved_ms = excluded.resolved_ms
+                       WHERE title IS NOT excluded.title OR severity IS NOT excluded.severity
+                          OR status IS NOT excluded.status OR started_ms > excluded.started_ms
+                          OR resolved_ms IS NOT excluded.resolved_ms""",
+                    (provider_name, incident_id, incident.title, incident.severity,
+                     incident.status, started_ms, incident.resolved_ms))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO incident_services (provider, service, incident_id) VALUES (?, ?, ?)",
+                    [(provider_name, service, incident_id) for service in incident.services])
+
+            # The payloads only list open incidents, so one that disappeared was
+            # resolved since the last changed payload
+            open_ids = [row[0] for row in self.conn.execute(
+                "SELECT incident_id FROM incidents WHERE provider = ? AND resolved_ms IS NULL", (provider_name,))]
+            self.conn.executemany(
+                "UPDATE incidents SET resolved_ms = ? WHERE provider = ? AND incident_id = ?",
+                [(now_ms, provider_name, incident_id) for incident_id in open_ids if incident_id not in current])
+
+        return self.conn.total_changes - changes_before
+
+    def incidents(self, provider: Optional[str] = None, service: Optional[str] = None,
+                  since_ms: Optional[int] = None, until_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the incidents overlapping [since_ms, until_ms), oldest first"""
+        clauses, params = [], []
+        if provider:
+            clauses.append("i.provider = ?")
+            params.append(provider)
+        if service:
+            clauses.append("EXISTS (SELECT 1 FROM incident_services s WHERE s.provider = i.provider "
+                           "AND s.incident_id = i.incident_id AND s.service = ?)")
+            params.append(service)
+        if until_ms is not None:
+            clauses.append("i.started_ms < ?")
+            params.append(until_ms)
+        if since_ms is not None:
+            clauses.append("(i.resolved_ms IS NULL OR i.resolved_ms > ?)")
+            params.append(since_ms)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        rows = self.conn.execute(
+            f"""SELECT i.provider, i.incident_id, i.title, i.severity, i.status, i.started_ms, i.resolved_ms,
+                       (SELECT group_concat(s.service, '\n') FROM incident_services s
+                        WHERE s.provider = i.provider AND s.incident_id = i.incident_id)
+                FROM incidents i {where} ORDER BY i.started_ms""", params)
+        return [{
+            'provider': row[0],
+            'incident_id': row[1],
+            'title': row[2],
+            'severity': row[3],
+            'status': row[4],
+            'started_ms': row[5],
+            'resolved_ms': row[6],
+            'services': row[7].split('\n') if row[7] else []
+        } for row in rows]
+
+    def summary(self, provider: Optional[str] = None, service: Optional[str] = None,
+                since_ms: Optional[int] = None, until_ms: Optional[int] = None,
+                now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Incident count, impacted time and MTTR for the incidents overlapping a window
+
+        impacted_ms is the time at least one matching incident was open, clipped
+        to the window; mttr_ms is the mean full duration of the matching
+        incidents that are resolved.
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        incidents = self.incidents(provider, service, since_ms, until_ms)
+        window_start = since_ms if since_ms is not None else 0
+        window_end = min(until_ms, now_ms) if until_ms is not None else now_ms
+
+        resolved = [incident['resolved_ms'] - incident['started_ms']
+                    for incident in incidents if incident['resolved_ms'] is not None]
+        clipped = [(max(incident['started_ms'], window_start),
+                    min(incident['resolved_ms'] if incident['resolved_ms'] is not None else now_ms, window_end))
+                   for incident in incidents]
+        return {
+            'provider': provider,
+            'service': service,
+            'since_ms': since_ms,
+            'until_ms': until_ms,
+            'incident_count': len(incidents),
+            'open_count': len(incidents) - len(resolved),
+            'impacted_ms': merged_duration_ms((start, end) for start, end in clipped if end > start),
+            'mttr_ms': round(sum(resolved) / len(resolved)) if resolved else None,
+            'longest_ms': max(resolved) if resolved else None
+        }
+
+    def providers(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT provider FROM incidents ORDER BY provider")]
+
+    def services(self, provider: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Return the (provider, service) pairs that have had incidents"""
+        if provider:
+            rows = self.conn.execute("SELECT DISTINCT provider, service FROM incident_services "
+                                     "WHERE provider = ? ORDER BY service", (provider,))
+        else:
+            rows = self.conn.execute("SELECT DISTINCT provider, service FROM incident_services "
+                                     "ORDER BY provider, service")
+        return [(row[0], row[1]) for row in rows]
+
+class HistoryStore:
+    """Where a provider's history database lives"""
+
+    def open(self) -> IncidentHistory:
+        raise NotImplementedError
+
+    def sync(self, history: IncidentHistory):
+        """Persist a changed database; nothing to do for local files"""
+
+class FileHistoryStore(HistoryStore):
+    """History databases kept as files in a local directory"""
+
+    def __init__(self, directory: str, name: str):
+        self.path = os.path.join(directory, f"{name}.sqlite")
+
+    def open(self) -> IncidentHistory:
+        if self.path not in _HISTORIES:
+            _HISTORIES[self.path] = IncidentHistory(self.path)
+        return _HISTORIES[self.path]
+
+class S3HistoryStore(HistoryStore):
+    """History databases stored as S3 objects, worked on in a /tmp copy"""
+
+    def __init__(self, bucket: str, prefix: str, name: str, local_directory: str = '/tmp/watchy-history'):
+        self.bucket = bucket
+        self.key = f"{prefix}{name}.sqlite"
+        self.path = os.path.join(local_directory, f"{name}.sqlite")
+
+    def open(self) -> IncidentHistory:
+        history = _HISTORIES.get(self.path)
+        if history is not None:
+            return history
+
+        # First use in this container: start from the stored copy, if there is one
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        s3 = get_boto3_client('s3')
+        try:
+            response = s3.get_object(Bucket=self.bucket, Key=self.key)
+            tmp_path = f"{self.path}.download"
+            with open(tmp_path, 'wb') as f:
+                for chunk in iter(lambda: response['Body'].read(1024 * 1024), b''):
+                    f.write(chunk)
+            os.replace(tmp_path, self.path)
+        except s3.exceptions.ClientError as e:
+            # Without s3:ListBucket a missing object is reported as AccessDenied
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', 'AccessDenied'):
+                raise
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+        history = _HISTORIES[self.path] = IncidentHistory(self.path)
+        return history
+
+    def sync(self, history: IncidentHistory):
+        with open(history.path, 'rb') as f:
+            get_boto3_client('s3').put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=f,
+                ContentType='application/vnd.sqlite3'
+            )
+
+def get_history_store(name: str) -> Optional[HistoryStore]:
+    """Build the history store selected by WATCHY_HISTORY_BACKEND / WATCHY_HISTORY_LOCATION, if any"""
+    backend = os.getenv('WATCHY_HISTORY_BACKEND', 'none').lower()
+    location = os.getenv('WATCHY_HISTORY_LOCATION', '')
+
+    if backend == 's3':
+        bucket, _, prefix = location.partition('/')
+        return S3HistoryStore(bucket, f"{prefix.strip('/')}/" if prefix else 'watchy-history/', name)
+    if backend == 'file':
+        return FileHistoryStore(location or '/tmp/watchy-history', name)
+    return None
+
+def update_history(provider, incidents: List[Incident]) -> int:
+    """Record a provider's incidents in its history, syncing the database when it changed"""
+    store = get_history_store(provider.name)
+    if store is None:
+        return 0
+    stage_start = time.time()
+    try:
+        history = store.open()
+        changes = history.record(provider.name, incidents)
+        if changes:
+            store.sync(history)
+        log_json("DEBUG", "Updated incident history", provider=provider.name, changes=changes)
+        return changes
+    except Exception as e:
+        log_json("ERROR", "Failed to update incident history", provider=provider.name, error=str(e))
+        return 0
+    finally:
+        record_duration('History', time.time() - stage_start)
@@ -0,0 +1,55 @@
+"""Structured JSON logging"""
+import json
+import os
+import random
+import sys
+from datetime import datetime, timezone
+
+# Numeric severities; WARNING is accepted as an alias because the stacks offer it
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARN': 30, 'WARNING': 30, 'ERROR': 40}
+
+_THRESHOLD = LOG_LEVELS['INFO']
+_SAMPLED = False
+
+def configure_logging():
+    """Apply WATCHY_LOG_LEVEL and WATCHY_LOG_DEBUG_SAMPLE; handlers call this once per invocation
+
+    WATCHY_LOG_DEBUG_SAMPLE is the fraction (0-1) of invocations that log at
+    DEBUG regardless of the configured level, so a busy function still yields
+    occasional full traces without paying for them on every run.
+    """
+    global _THRESHOLD, _SAMPLED
+    threshold = LOG_LEVELS.get(os.getenv('WATCHY_LOG_LEVEL', 'INFO').upper(), LOG_LEVELS['INFO'])
+    sample_rate = float(os.getenv('WATCHY_LOG_DEBUG_SAMPLE', '0') or 0)
+
+    _SAMPLED = threshold > LOG_LEVELS['DEBUG'] and random.random() < sample_rate
+    _THRESHOLD = LOG_LEVELS['DEBUG'] if _SAMPLED else threshold
+
+def is_enabled(level: str) -> bool:
+    """Return whether messages at this level are currently emitted"""
+    return LOG_LEVELS.get(level, LOG_LEVELS['ERROR']) >= _THRESHOLD
+
+def log_json(level: str, message: str, **kwargs):
+    """Log structured JSON messages to reduce visual clutter
+
+    Messages below the configured level return before any work is done. Field
+    values may be zero-argument callables, which are only called when the
+    message is emitted, so expensive fields cost nothing when filtered out.
+    """
+    if LOG_LEVELS.get(level, LOG_LEVELS['ERROR']) < _THRESHOLD:
+        return
+
+    log_data = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'level': level,
+        'message': message
+    }
+    for key, value in kwargs.items():
+        log_data[key] = value() if callable(value) else value
+    if _SAMPLED:
+        log_data['debug_sampled'] = True
+    # One write per line: print() writes the newline separately, so lines from
+    # concurrent publish threads could interleave
+    sys.stdout.write(json.dumps(log_data, default=str) + '\n')
+
+configure_logging()
@@ -0,0 +1,316 @@
+"""Incident log publishing to CloudWatch Logs"""
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from . import VERSION
+from .clients import get_boto3_client, invalidate_boto3_client
+from .log import log_json
+from .model import Incident
+from .state import is_after_cursor, advance_cursor
+from .text import strip_html_tags, format_timestamp_ms, is_within_polling_interval
+from .timing import count, record_duration
+
+# PutLogEvents limits: batch size counts each message's UTF-8 bytes plus 26 bytes
+# of per-event overhead, and one batch may not span more than 24 hours
+LOG_BATCH_MAX_BYTES = 1048576
+LOG_BATCH_MAX_EVENTS = 10000
+LOG_EVENT_OVERHEAD_BYTES = 26
+LOG_BATCH_MAX_SPAN_MS = 24 * 60 * 60 * 1000
+LOG_PUT_ATTEMPTS = 3
+
+# Log groups and streams known to exist, so warm invocations skip the create calls
+_KNOWN_LOG_GROUPS: Set[str] = set()
+_KNOWN_LOG_STREAMS: Set[Tuple[str, str]] = set()
+
+def pack_log_batches(events: List[Dict[str, Any]], sizes: List[int]) -> List[Tuple[int, int]]:
+    """Split time-ordered events into [start, end) ranges that fit one PutLogEvents call each"""
+    batches = []
+    start = 0
+    batch_bytes = 0
+    for i, (event, size) in enumerate(zip(events, sizes)):
+        if i > start and (batch_bytes + size > LOG_BATCH_MAX_BYTES
+                          or i - start >= LOG_BATCH_MAX_EVENTS
+                          or event['timestamp'] - events[start]['timestamp'] > LOG_BATCH_MAX_SPAN_MS):
+            batches.append((start, i))
+            start = i
+            batch_bytes = 0
+        batch_bytes += size
+    if start < len(events):
+        batches.append((start, len(events)))
+    return batches
+
+def ensure_log_stream(logs_client, log_group: str, log_stream: str):
+    """Create the log group and stream unless this container already knows they exist"""
+    if log_group not in _KNOWN_LOG_GROUPS:
+        try:
+            logs_client.create_log_group(logGroupName=log_group)
+            log_json("DEBUG", "Created CloudWatch log group", log_group=log_group)
+        except logs_client.exceptions.ResourceAlreadyExistsException:
+            pass  # Log group already exists
+        _KNOWN_LOG_GROUPS.add(log_group)
+
+    if (log_group, log_stream) not in _KNOWN_LOG_STREAMS:
+        try:
+            logs_client.create_log_stream(logGroupName=log_group, logStreamName=log_stream)
+            log_json("DEBUG", "Created CloudWatch log stream",
+                    log_group=log_group,
+                    log_stream=log_stream)
+        except logs_client.exceptions.ResourceAlreadyExistsException:
+            pass  # Log stream already exists
+        _KNOWN_LOG_STREAMS.add((log_group, log_stream))
+
+def put_log_batch(logs_client, log_group: str, log_stream: str, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Send one batch, recreating a vanished stream and retrying transient errors with backoff"""
+    for attempt in range(LOG_PUT_ATTEMPTS):
+        try:
+            return logs_client.put_log_events(
+                logGroupName=log_group,
+                logStreamName=log_stream,
+                logEvents=batch
+            )
+        except logs_client.exceptions.InvalidParameterException:
+            raise  # Retrying a malformed batch cannot succeed
+        except logs_client.exceptions.ResourceNotFoundException:
+            if attempt == LOG_PUT_ATTEMPTS - 1:
+                raise
+            # Group or stream deleted behind our back: forget and recreate it
+            _KNOWN_LOG_GROUPS.discard(log_group)
+            _KNOWN_LOG_STREAMS.discard((log_group, log_stream))
+            ensure_log_stream(logs_client, log_group, log_stream)
+        except Exception as e:
+            if attempt == LOG_PUT_ATTEMPTS - 1:
+                raise
+            log_json("WARN", "Retrying log events batch",
+                    log_group=log_group,
+                    attempt=attempt + 1,
+                    error=str(e))
+            time.sleep(0.2 * (2 ** attempt))
+
+def publish_incident_logs(provider, incidents: List[Incident], polling_interval: float = 5,
+                          cursor_state: Optional[Dict[str, Any]] = None, ignore_cursor: bool = False):
+    """Publish the new log items of a provider's incidents to CloudWatch Logs
+
+    With a cursor_state, an item is new when it sorts after its incident's persisted
+    high-water mark, and cursors only advance for batches CloudWatch accepted, so
+    every item is published exactly once however irregular the schedule is. Without
+    one (or on the very first run, before any cursor exists) the wall-clock polling
+    window is used instead.
+
+    Returns the number of events CloudWatch accepted and whether every new item was accepted
+    or dropped for good, i.e. whether nothing is left for a later run to retry.
+    """
+    log_group = provider.log_group
+    item_label = provider.item_label
+
+    try:
+        count('IncidentsProcessed', len(incidents))
+        count('TimestampParseErrors', 0)
+        if not incidents:
+            log_json("INFO", f"No {provider.incident_state} incidents to log")
+            return 0, True
+
+        # Reuse the CloudWatch Logs client across warm invocations
+        logs_client = get_boto3_client('logs')
+
+        events_published = 0
+        prepared_events = []
+
+        cursors = cursor_state.setdefault('incidents', {}) if cursor_state is not None else None
+        # An empty index means nothing is known about earlier runs (first deployment or
+        # lost local state), so bootstrap from the polling window instead of
+        # republishing every incident's full history
+        bootstrap = cursor_state is not None and 'last_poll' not in cursor_state
+
+        stage_start = time.time()
+        for incident in incidents:
+            incident_id = incident.id
+            incident_key = incident.key
+            incident_fields = incident.fields
+
+            log_json("INFO", "Processing incident", **incident_fields)
+
+            items = incident.items
+            count('ItemsProcessed', len(items))
+            log_json("DEBUG", f"Found incident {item_label}s",
+                    incident_id=incident_id,
+                    items_count=len(items))
+
+            for item_idx, item in enumerate(items):
+                item_body = item.body
+                item_date_str = item.created
+
+                log_json("DEBUG", f"Processing {item_label}",
+                        incident_id=incident_id,
+                        item_index=item_idx,
+                        item_date_str=item_date_str,
+                        item_body_length=lambda: len(item_body) if item_body else 0)
+
+                if not item_body or not item_date_str:
+                    log_json("WARN", f"Skipping {item_label} with missing data",
+                            incident_id=incident_id,
+                            item_index=item_idx,
+                            has_body=bool(item_body),
+                            has_date=bool(item_date_str))
+                    continue
+
+                # CloudWatch expects milliseconds, parsed during normalization. An
+                # unparseable timestamp is skipped and counted rather than published
+                # as "now" on every run
+                item_time_ms = item.created_ms
+                if item_time_ms is None:
+                    count('TimestampParseErrors')
+                    log_json("WARN", f"Skipping {item_label} with unparseable timestamp",
+                            incident_id=incident_id,
+                            item_index=item_idx,
+                            item_date_str=item_date_str,
+                            error=item.parse_error)
+                    continue
+                # Items without a stable id are identified by their body
+                item_id = item.id or hashlib.sha1(item_body.encode('utf-8')).hexdigest()[:16]
+
+                if cursors is None or bootstrap:
+                    # Check if item is within polling interval (smart deduplication)
+                    is_new = ignore_cursor or is_within_polling_interval(item_time_ms, polling_interval)
+                    if not is_new and cursors is not None:
+                        # Already covered by the window of an earlier run: seed the cursor
+                        advance_cursor(cursors, incident_key, item_time_ms, item_id)
+                elif incident_key in cursors:
+                    is_new = ignore_cursor or is_after_cursor(cursors[incident_key], item_time_ms, item_id)
+                else:
+                    # Incident first seen since the index was initialised: all of it is new
+                    is_new = True
+
+                if not is_new:
+                    log_json("DEBUG", f"Skipping old {item_label} (already logged in previous poll)",
+                            item_time=lambda: format_timestamp_ms(item_time_ms),
+                            polling_interval_min=polling_interval)
+                    continue
+
+                # Create log entry - use item timestamp as the log timestamp
+                log_entry = {
+                    'timestamp': format_timestamp_ms(item_time_ms),
+                    **incident_fields
+                }
+                log_entry.update(item.fields)
+                log_entry[provider.body_field] = strip_html_tags(item_body)
+                log_entry['source'] = provider.source
+                log_entry['version'] = VERSION
+
+                # Serialise once; the byte size drives batching. Remember which cursor
+                # each event advances
+                message = json.dumps(log_entry)
+                prepared_events.append(({
+                    'timestamp': item_time_ms,
+                    'message': message
+                }, len(message.encode('utf-8')) + LOG_EVENT_OVERHEAD_BYTES, (incident_key, item_time_ms, item_id)))
+
+                log_json("DEBUG", "Prepared incident log for CloudWatch",
+                        incident_id=incident_id,
+                        item_time=lambda: format_timestamp_ms(item_time_ms))
+
+        record_duration('ProcessItems', time.time() - stage_start)
+
+        # Only touch the log stream if we have events to publish
+        if prepared_events:
+            # Sort events by timestamp (CloudWatch requirement)
+            prepared_events.sort(key=lambda x: x[0]['timestamp'])
+
+            # A single oversized event can never be accepted; drop it but let its
+            # cursor advance so it does not block every later run
+            accepted_events = []
+            for entry in prepared_events:
+                if entry[1] > LOG_BATCH_MAX_BYTES:
+                    log_json("WARN", "Dropping incident log event larger than the PutLogEvents limit",
+                            event_bytes=entry[1])
+                    if cursors is not None:
+                        advance_cursor(cursors, *entry[2])
+                    continue
+                accepted_events.append(entry)
+
+            log_events = [event for event, _, _ in accepted_events]
+            sizes = [size for _, size, _ in accepted_events]
+
+            # One stable stream per provider per UTC day, reused across runs
+            now = datetime.now(timezone.utc)
+            log_stream = f"{provider.name}-incidents-{now.strftime('%Y-%m-%d')}"
+
+            stage_start = time.time()
+            try:
+                ensure_log_stream(logs_client, log_group, log_stream)
+            except Exception as e:
+                log_json("ERROR", "Failed to create log stream", error=str(e))
+
+            complete = True
+
+            for start, end in pack_log_batches(log_events, sizes):
+                batch = log_events[start:end]
+                cursor_entries = [entry for _, _, entry in accepted_events[start:end]]
+
+                try:
+                    response = put_log_batch(logs_client, log_group, log_stream, batch)
+                except Exception as e:
+                    invalidate_boto3_client('logs')
+                    log_json("ERROR", "Failed to publish log events batch",
+                            log_group=log_group,
+                            log_stream=log_stream,
+                            batch_size=len(batch),
+                            error=str(e))
+                    complete = False
+                    if cursors is not None:
+                        # Stop here so the cursors never move past an unpublished event;
+                        # the remaining events are retried on the next run
+                        break
+                    continue  # Continue with next batch
+
+                # Too-old and expired events are rejected for good, so their cursors may
+                # advance; too-new events (clock skew) are retried on a later run
+                rejected = response.get('rejectedLogEventsInfo') or {}
+                too_new_index = rejected.get('tooNewLogEventStartIndex')
+                accepted_count = len(batch) if too_new_index is None else too_new_index
+                if rejected:
+                    log_json("WARN", "CloudWatch rejected part of a log events batch",
+                            log_group=log_group,
+                            log_stream=log_stream,
+                            batch_size=len(batch),
+                            rejected=rejected)
+
+                events_published += accepted_count
+                if cursors is not None:
+                    for cursor_entry in cursor_entries[:accepted_count]:
+                        advance_cursor(cursors, *cursor_entry)
+
+                log_json("DEBUG", "Published log events batch to CloudWatch",
+                        log_group=log_group,
+                        log_stream=log_stream,
+                        batch_size=len(batch),
+                        batch_bytes=lambda: sum(sizes[start:end]))
+
+                if too_new_index is not None:
+                    # Everything after this batch is newer still
+                    complete = False
+                    break
+
+            record_duration('PutLogEvents', time.time() - stage_start)
+            count('ItemsPublished', events_published)
+
+            log_json("INFO", "Successfully published incident logs to CloudWatch",
+                    log_group=log_group,
+                    log_stream=log_stream,
+                    events_published=events_published,
+                    incidents_processed=len(incidents))
+        else:
+            log_json("INFO", f"No new incident {item_label}s to publish")
+            complete = True
+
+        return events_published, complete
+
+    except Exception as e:
+        invalidate_boto3_client('logs')
+        log_json("ERROR", "Failed to publish incident logs",
+                error=str(e),
+                log_group=log_group,
+                incidents_count=len(incidents))
+        return 0, False
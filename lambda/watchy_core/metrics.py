@@ -0,0 +1,233 @@
+"""CloudWatch metric sinks: PutMetricData and Embedded Metric Format"""
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
+
+from .clients import get_boto3_client, invalidate_boto3_client
+from .log import log_json
+
+# CloudWatch extracts at most 100 metrics from a single EMF document
+EMF_MAX_METRICS = 100
+
+# Metrics that are not plain counts or status levels
+METRIC_UNITS = {
+    'InitDuration': 'Milliseconds',
+    'FetchDuration': 'Milliseconds',
+    'DecodeDuration': 'Milliseconds',
+    'ParseDuration': 'Milliseconds',
+    'StateDuration': 'Milliseconds',
+    'ProcessItemsDuration': 'Milliseconds',
+    'PutLogEventsDuration': 'Milliseconds',
+    'PublishMetricsDuration': 'Milliseconds',
+    'HistoryDuration': 'Milliseconds',
+    'RollupDuration': 'Milliseconds',
+    'ArchiveDuration': 'Milliseconds',
+    'BytesOnWire': 'Bytes',
+    'BytesDecoded': 'Bytes',
+    'DetectionLatency': 'Seconds'
+}
+
+def metric_unit(name: str) -> str:
+    """CloudWatch unit of a metric; daily <Service>Availability rollups are percentages"""
+    if name.endswith('Availability'):
+        return 'Percent'
+    return METRIC_UNITS.get(name, 'Count')
+
+# Metrics published on every run in delta mode: APIResponse backs the
+# TreatMissingData: breaching alarms, so it must never go missing
+ALWAYS_PUBLISH_METRICS = frozenset(['APIResponse'])
+
+# Last published values per namespace (or delta key), kept in the warm container;
+# a cold start always begins with a full publish. 'timings' holds the largest
+# value of each stage timing since they were last published
+_LAST_PUBLISHED: Dict[str, Dict[str, Any]] = {}
+
+def get_metrics_config() -> Tuple[str, Optional[int]]:
+    """Return the metrics sink and, in delta mode, the full-refresh interval in seconds"""
+    mode = os.getenv('WATCHY_METRICS_MODE', 'api').lower()
+    if os.getenv('WATCHY_METRICS_DELTA', 'false').lower() != 'true':
+        return mode, None
+    return mode, int(os.getenv('WATCHY_METRICS_FULL_REFRESH_MINUTES', '60')) * 60
+
+def get_timing_interval() -> int:
+    """Seconds between publishes of the stage timings in delta mode"""
+    return int(os.getenv('WATCHY_METRICS_TIMING_MINUTES', '15')) * 60
+
+def is_timing_metric(name: str) -> bool:
+    return name.endswith('Duration')
+
+def select_delta_metrics(metrics: Dict[str, int], namespace: str, full_refresh_seconds: int) -> Tuple[Dict[str, int], bool]:
+    """Pick the metrics worth publishing this run and whether this is a full refresh
+
+    Non-zero values are always published because the threshold alarms evaluate
+    them every period, and missing data is treated as not breaching. A zero
+    value is only published when it changed, so recoveries still show up, or on
+    the full-refresh heartbeat. Stage timings (*Duration) differ on nearly every
+    run, so they are published every get_timing_interval() instead, as the
+    largest value seen since the last time.
+    """
+    last = _LAST_PUBLISHED.get(namespace)
+    if last is None or time.time() - last['full_at'] >= full_refresh_seconds:
+        return dict(metrics), True
+
+    previous = last['metrics']
+    timings_due = time.time() - last['timings_at'] >= get_timing_interval()
+    selected = {}
+    for name, value in metrics.items():
+        if is_timing_metric(name):
+            if timings_due:
+                selected[name] = max(value, last['timings'].get(name, value))
+        elif name in ALWAYS_PUBLISH_METRICS or value != 0 or previous.get(name) != value:
+            selected[name] = value
+    return selected, False
+
+def record_published_metrics(metrics: Dict[str, int], namespace: str, full: bool, timings: bool = False):
+    """Remember what was published so the next delta run can compare against it
+
+    timings tells whether the stage timings went out with it; when they did
+    not, the largest of each is kept for the next time they do.
+    """
+    now = time.time()
+    last = _LAST_PUBLISHED.setdefault(namespace, {'metrics': {}, 'full_at': 0.0, 'timings_at': 0.0, 'timings': {}})
+    last['metrics'] = dict(metrics)
+    if full:
+        last['full_at'] = now
+    if full or timings:
+        last['timings_at'] = now
+        last['timings'] = {}
+        return
+    timings = last['timings']
+    for name, value in metrics.items():
+        if is_timing_metric(name):
+            timings[name] = max(value, timings.get(name, value))
+
+def emit_emf_metrics(metrics: Dict[str, int], namespace: str):
+    """Write metrics to stdout in CloudWatch Embedded Metric Format
+
+    The Lambda log group ingests stdout and CloudWatch extracts the metrics
+    asynchronously, so publication costs no API call. Metrics are emitted
+    without dimensions, exactly like PutMetricData, so existing alarms match.
+    """
+    try:
+        timestamp_ms = int(time.time() * 1000)
+        metric_names = list(metrics)
+
+        for i in range(0, len(metric_names), EMF_MAX_METRICS):
+            batch = metric_names[i:i + EMF_MAX_METRICS]
+            document = {
+                '_aws': {
+                    'Timestamp': timestamp_ms,
+                    'CloudWatchMetrics': [{
+                        'Namespace': namespace,
+                        'Dimensions': [[]],
+                        'Metrics': [{'Name': name, 'Unit': metric_unit(name)} for name in batch]
+                    }]
+                }
+            }
+            for name in batch:
+                document[name] = metrics[name]
+            sys.stdout.write(json.dumps(document) + '\n')  # One write, see log_json
+
+        log_json("INFO", "Successfully emitted metrics in Embedded Metric Format",
+                namespace=namespace,
+                metrics_count=len(metric_names))
+
+        return True
+
+    except Exception as e:
+        log_json("ERROR", "Failed to emit EMF metrics",
+                error=str(e),
+                namespace=namespace,
+                metrics_count=len(metrics))
+        return False
+
+def publish_cloudwatch_metrics(metrics: Dict[str, int], namespace: str, mode: str = 'api',
+                               full_refresh_seconds: Optional[int] = None, delta_key: Optional[str] = None):
+    """Publish metrics to CloudWatch via PutMetricData ('api') or Embedded Metric Format ('emf')
+
+    With full_refresh_seconds set, only changed or non-zero values are sent
+    (see select_delta_metrics), plus everything once per refresh interval.
+    Sets of metrics sent to one namespace by separate calls each need their
+    own delta_key (the namespace by default) to be compared against.
+    """
+    if full_refresh_seconds is None:
+        return _publish_metrics(metrics, namespace, mode)
+
+    delta_key = delta_key or namespace
+    selected, full = select_delta_metrics(metrics, delta_key, full_refresh_seconds)
+    log_json("DEBUG", "Selected metrics to publish",
+            namespace=namespace,
+            full_refresh=full,
+            metrics_count=len(selected),
+            metrics_skipped=len(metrics) - len(selected))
+
+    published = _publish_metrics(selected, namespace, mode)
+    if published:
+        record_published_metrics(metrics, delta_key, full, any(is_timing_metric(name) for name in selected))
+    return published
+
+def _publish_metrics(metrics: Dict[str, int], namespace: str, mode: str):
+    """Send metrics to the configured sink"""
+    if mode == 'emf':
+        return emit_emf_metrics(metrics, namespace)
+
+    try:
+        # Reuse the CloudWatch client across warm invocations
+        cloudwatch = get_boto3_client('cloudwatch')
+
+        # Prepare metric data for batch publishing; one timestamp for the whole run
+        metric_data = []
+        timestamp = datetime.now(timezone.utc)
+
+        for metric_name, value in metrics.items():
+            metric_data.append({
+                'MetricName': metric_name,
+                'Value': value,
+                'Unit': metric_unit(metric_name),
+                'Timestamp': timestamp
+            })
+
+        # Publish metrics in batches (CloudWatch limit is 20 metrics per call)
+        batch_size = 20
+        metrics_published = 0
+
+        for i in range(0, len(metric_data), batch_size):
+            batch = metric_data[i:i + batch_size]
+
+            cloudwatch.put_metric_data(
+                Namespace=namespace,
+                MetricData=batch
+            )
+
+            metrics_published += len(batch)
+            log_json("DEBUG", f"Published batch of {len(batch)} metrics to CloudWatch",
+                    namespace=namespace, batch_size=len(batch))
+
+        log_json("INFO", "Successfully published metrics to CloudWatch",
+                namespace=namespace,
+                metrics_count=metrics_published)
+
+        return True
+
+    except Exception as e:
+        invalidate_boto3_client('cloudwatch')
+        log_json("ERROR", "Failed to publish CloudWatch metrics",
+                error=str(e),
+                namespace=namespace,
+                metrics_count=len(metrics))
+        return False
+
+def publish_metric_sets(metric_sets: Dict[str, Dict[str, int]], mode: str = 'api',
+                        full_refresh_seconds: Optional[int] = None, delta_suffix: str = '') -> Dict[str, bool]:
+    """Publish metrics for several namespaces, returning whether each namespace succeeded
+
+    PutMetricData takes a single namespace per call, so this is one sink call
+    (or batch of calls) per namespace over the shared client. delta_suffix is
+    appended to each namespace to form its delta_key.
+    """
+    return {namespace: publish_cloudwatch_metrics(metrics, namespace, mode, full_refresh_seconds,
+                                                  namespace + delta_suffix)
+            for namespace, metrics in metric_sets.items()}
@@ -0,0 +1,69 @@
+"""Normalized incident model shared by parsing, log publishing, metrics and history
+
+Each raw incident of a payload is turned into an Incident once, right after
+decoding. Ids, log entry fields, epoch millisecond timestamps and the metric
+names and levels of the affected services are resolved there, so the later
+stages read attributes in a single pass instead of re-walking the API dicts.
+"""
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .text import parse_timestamp_ms, TimestampParseError
+
+def parse_optional_ms(value: Any) -> Optional[int]:
+    """Epoch milliseconds of an optional timestamp, or None when it is missing or unparseable"""
+    try:
+        return parse_timestamp_ms(value) if value else None
+    except (TimestampParseError, TypeError):
+        return None
+
+class LogItem:
+    """One note or update of an incident, as published to CloudWatch Logs
+
+    created_ms is None when created is missing or unparseable; parse_error
+    then tells which, so the log stage can count and report it.
+    """
+    __slots__ = ('id', 'created', 'created_ms', 'parse_error', 'body', 'fields')
+
+    def __init__(self, item_id: Optional[str], created: Any, body: Any,
+                 fields: Tuple[Tuple[str, Any], ...] = ()):
+        self.id = item_id        # None when the API has no stable item id
+        self.created = created
+        self.body = body
+        self.fields = fields     # (name, value) pairs of item-level log entry fields placed before the body
+        self.created_ms = None
+        self.parse_error = None
+        if created:
+            try:
+                self.created_ms = parse_timestamp_ms(created)
+            except (TimestampParseError, TypeError) as e:  # TypeError: not even a string
+                self.parse_error = str(e)
+
+class Incident:
+    """One incident of a status payload
+
+    active and level drive the provider's incident metrics; service_levels
+    are the (metric name, 0-3 level) pairs the incident sets on the per-service
+    or per-component metrics.
+    """
+    __slots__ = ('id', 'key', 'title', 'severity', 'status', 'active', 'level', 'started', 'started_ms',
+                 'resolved', 'resolved_ms', 'services', 'service_levels', 'fields', 'items')
+
+    def __init__(self, incident_id: Any, title: str, severity: str, status: str, started: Any,
+                 resolved: Any, services: Sequence[str], fields: Dict[str, Any], items: List[LogItem],
+                 active: bool = True, level: Optional[int] = None,
+                 service_levels: Tuple[Tuple[str, int], ...] = ()):
+        self.id = incident_id
+        self.key = str(incident_id)  # Cursor, cutoff and history key
+        self.title = title
+        self.severity = severity
+        self.status = status
+        self.active = active
+        self.level = level
+        self.started = started
+        self.started_ms = parse_optional_ms(started)
+        self.resolved = resolved  # Empty while the incident is open
+        self.resolved_ms = parse_optional_ms(resolved)
+        self.services = services
+        self.service_levels = service_levels
+        self.fields = fields     # Incident-level fields of every log entry, in output order
+        self.items = items
@@ -0,0 +1,680 @@
+"""Provider-agnostic monitoring flow shared by every Watchy Lambda"""
+import functools
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from . import VERSION
+from .archive import archive_snapshot, discard_snapshot
+from .cadence import poll_due, poll_window_minutes, record_poll, fast_polls, record_detections
+from .fetch import (get_conditional_cache, commit_conditional_validators, discard_conditional_validators,
+                    staging, FetchToken)
+from .history import update_history
+from .log import configure_logging, is_enabled, log_json
+from .logs import publish_incident_logs
+from .metrics import get_metrics_config, publish_cloudwatch_metrics, publish_metric_sets
+from .model import Incident
+from .rollups import update_rollups, save_rollups
+from .startup import init_duration_ms
+from .state import get_state_store, prune_cursors, claim_cursor_state, release_cursor_state, StateConflictError
+from .timing import StageTimer, span, record_duration, run_with_timer
+
+# Module-level state survives between warm invocations of the same container
+_COLD_START = True
+_EXECUTOR = None  # concurrent.futures.ThreadPoolExecutor, imported on the first fan-out run
+_EXECUTOR_WORKERS = 0
+_PUBLISH_EXECUTOR = None  # Sends status metrics while the handler thread publishes logs
+# A publish cannot report its own duration, so each run sends the previous one's
+_LAST_PUBLISH_MS: Optional[float] = None
+# Cursor timestamps per state key and incident after the last run: log items older
+# than these are published, so the next fetch need not keep them
+_ITEM_CUTOFFS: Dict[str, Dict[str, int]] = {}
+
+# Time kept back from the Lambda deadline for publishing after a fan-out fetch
+PUBLISH_RESERVE_SECONDS = 30
+
+# Namespace of the fan-out function's own metrics
+PLATFORM_NAMESPACE = 'Watchy/Platform'
+
+# Delta state suffix of the run metrics (see run_metrics), which concurrent
+# publishing sends apart from the status metrics of the same namespace
+RUN_METRICS_DELTA_SUFFIX = '#run'
+
+# Timer counters that report data problems, published even with stage metrics off
+ERROR_COUNTERS = frozenset(['TimestampParseErrors'])
+
+# Timer metrics that measure the monitoring itself, also published with stage metrics off
+SLI_METRICS = frozenset(['DetectionLatency'])
+
+def get_polling_config() -> Tuple[int, bool]:
+    """Return the polling interval in minutes and whether time filtering is disabled"""
+    polling_interval = int(os.getenv('POLLING_INTERVAL_MINUTES', '5'))
+
+    # Debug mode: disable time filtering if DEBUG_DISABLE_TIME_FILTER is set
+    disable_time_filter = os.getenv('DEBUG_DISABLE_TIME_FILTER', 'false').lower() == 'true'
+    if disable_time_filter:
+        polling_interval = 60 * 24 * 7  # 1 week - effectively disable filtering
+    return polling_interval, disable_time_filter
+
+def cold_start_metrics(cold_start: bool) -> Dict[str, int]:
+    """Return the InitDuration metric on a cold start, to track start-up latency per release"""
+    init_ms = init_duration_ms() if cold_start else None
+    return {} if init_ms is None else {'InitDuration': init_ms}
+
+def item_cutoffs(cursor_state: Dict[str, Any]) -> Dict[str, int]:
+    """Cursor timestamp per incident: its log items older than that are published"""
+    return {incident_key: cursor['ts'] for incident_key, cursor in cursor_state.get('incidents', {}).items()}
+
+def get_item_cutoffs(provider, state_store, disable_time_filter: bool) -> Optional[Dict[str, int]]:
+    """Return the item cutoffs the next fetch may prune with, or None to keep every item
+
+    A container that has not published the provider yet (a cold start) reads
+    them from the persisted cursors once.
+    """
+    if disable_time_filter or os.getenv('WATCHY_STREAM_DECODE', 'true').lower() != 'true':
+        return None
+    if provider.state_key not in _ITEM_CUTOFFS:
+        stage_start = time.time()
+        try:
+            _ITEM_CUTOFFS[provider.state_key] = item_cutoffs(state_store.load(provider.state_key))
+        except Exception as e:
+            log_json("WARN", "Failed to load incident cursors for pruning", provider=provider.name, error=str(e))
+            return None
+        finally:
+            record_duration('State', time.time() - stage_start)
+    return _ITEM_CUTOFFS[provider.state_key]
+
+def stage_metrics_enabled() -> bool:
+    return os.getenv('WATCHY_STAGE_METRICS', 'true').lower() == 'true'
+
+def timer_metrics(timer: StageTimer) -> Dict[str, Any]:
+    """Return the timer metrics to publish: all of them, or just ERROR_COUNTERS and SLI_METRICS with stage metrics off"""
+    metrics = timer.metrics()
+    if stage_metrics_enabled():
+        return metrics
+    return {name: value for name, value in metrics.items() if name in ERROR_COUNTERS or name in SLI_METRICS}
+
+def run_metrics(cold_start: bool, timer: Optional[StageTimer] = None) -> Dict[str, Any]:
+    """Return the invocation's own metrics: InitDuration and, unless disabled, the stage breakdown
+
+    The stage breakdown is the timer's <Stage>Duration and counter metrics, the
+    ColdStart flag and the previous run's PublishMetricsDuration. ERROR_COUNTERS
+    and SLI_METRICS are included either way.
+    """
+    metrics = cold_start_metrics(cold_start)
+    if stage_metrics_enabled():
+        metrics['ColdStart'] = int(cold_start)
+        if _LAST_PUBLISH_MS is not None:
+            metrics['PublishMetricsDuration'] = _LAST_PUBLISH_MS
+    if timer is not None:
+        metrics.update(timer_metrics(timer))
+    return metrics
+
+def concurrent_publish_enabled() -> bool:
+    return os.getenv('WATCHY_CONCURRENT_PUBLISH', 'true').lower() == 'true'
+
+def get_publish_executor():
+    """Return the single-worker pool status metrics are sent from, apart from the fan-out fetch pool"""
+    global _PUBLISH_EXECUTOR
+    if _PUBLISH_EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _PUBLISH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='watchy-publish')
+    return _PUBLISH_EXECUTOR
+
+def timed_call(func, *args) -> Tuple[Any, float]:
+    """Call func and return its result with the seconds it took, e.g. from a pool thread"""
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+def collect_provider(provider, item_cutoffs: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Fetch and parse one provider's status; touches no AWS API, so it is safe to run in a worker thread"""
+    stage_start = time.time()
+    poll_window = poll_window_minutes(provider)
+    cached = get_conditional_cache(provider.api_url)
+    polled = cached is None or poll_due(provider)
+    try:
+        payload = provider.fetch(item_cutoffs) if polled else None
+    except Exception:
+        record_poll(provider, {'APIResponse': 500}, polled=False)
+        raise
+    fetch_time = time.time() - stage_start
+
+    if payload is None:
+        # Payload unchanged since the last successful run, or a healthy provider on
+        # the relaxed cadence: skip parsing and log publishing, and re-emit the last
+        # metrics as a heartbeat
+        if polled:
+            log_json("INFO", f"{provider.fetch_label} unchanged since last run - publishing heartbeat metrics only",
+                    provider=provider.name)
+        else:
+            log_json("INFO", "Provider healthy - skipping poll on the relaxed cadence, publishing heartbeat metrics only",
+                    provider=provider.name)
+        cached = get_conditional_cache(provider.api_url)
+        with staging():
+            record_poll(provider, cached['metrics'], polled)
+        return {
+            'unchanged': True,
+            'polled': polled,
+            'incidents': [],
+            'incident_count': cached['active_incidents'],
+            'metrics': dict(cached['metrics']),
+            'poll_window': poll_window,
+            'fetch_time': fetch_time
+        }
+
+    # Parse incidents and metrics
+    with span('Parse'):
+        incidents = provider.incidents(payload)
+        metrics = provider.metrics(payload, incidents)
+
+    # Describing every incident and item is only worth it when DEBUG is on
+    if is_enabled("DEBUG"):
+        log_json("DEBUG", f"Found {len(incidents)} {provider.incident_state} incidents", provider=provider.name)
+        for i, incident in enumerate(incidents):
+            description, *item_lines = provider.describe_incident(incident)
+            log_json("DEBUG", f"Incident {i+1}: {description}",
+                    provider=provider.name,
+                    items=item_lines)
+
+    with staging():
+        record_poll(provider, metrics, polled)
+    return {
+        'unchanged': False,
+        'polled': polled,
+        'incidents': incidents,
+        'incident_count': len(incidents),
+        'metrics': metrics,
+        'poll_window': poll_window,
+        'fetch_time': fetch_time
+    }
+
+def fetch_provider(provider, state_store, disable_time_filter: bool,
+                   token: Optional[FetchToken] = None) -> Dict[str, Any]:
+    """Load the provider's item cutoffs, then fetch and parse its status
+
+    Runs as one unit in a fetch worker, so a cold start's cursor load counts
+    against the fetch deadline rather than holding up the handler thread.
+    With a token, nothing is staged once the pass has cancelled it.
+    """
+    if token is None:
+        return collect_provider(provider, get_item_cutoffs(provider, state_store, disable_time_filter))
+    with token.active():
+        return collect_provider(provider, get_item_cutoffs(provider, state_store, disable_time_filter))
+
+def publish_provider_logs(provider, incidents: List[Incident], state_store, polling_interval: int,
+                          disable_time_filter: bool, poll_window: Optional[float] = None) -> Tuple[int, bool]:
+    """Publish a provider's new incident log items and persist its cursors, incident history and snapshot
+
+    Without cursors, the items published are those of the poll_window minutes
+    since the previous poll (the polling interval when unknown). Incidents the
+    cursors did not know yet are reported in DetectionLatency. The cursors are
+    claimed first (see claim_cursor_state); when another run holds them,
+    nothing is published. Returns the number of items published and whether
+    the payload was published completely, cursors saved included.
+    """
+    # Load and claim the incident cursor index; without it fall back to the polling window
+    stage_start = time.time()
+    version = None
+    try:
+        cursor_state, version = claim_cursor_state(state_store, provider.state_key)
+    except StateConflictError as e:
+        record_duration('State', time.time() - stage_start)
+        log_json("WARN", "Incident cursors are claimed by another run, skipping log publishing",
+                provider=provider.name,
+                error=str(e))
+        return 0, False
+    except Exception as e:
+        log_json("ERROR", "Failed to load incident cursors, using polling window", error=str(e))
+        cursor_state = None
+    record_duration('State', time.time() - stage_start)
+
+    window = polling_interval if disable_time_filter or poll_window is None else poll_window
+    # Incidents are only new once the cursors have been bootstrapped by a first run
+    known_incidents = (set(cursor_state.get('incidents', {}))
+                       if cursor_state is not None and 'last_poll' in cursor_state else None)
+    logs_published, complete = publish_incident_logs(provider, incidents, window,
+                                                     cursor_state, ignore_cursor=disable_time_filter)
+
+    if cursor_state is not None:
+        record_detections(provider, incidents, cursor_state, known_incidents)
+        prune_cursors(cursor_state, [incident.key for incident in incidents])
+        stage_start = time.time()
+        try:
+            release_cursor_state(state_store, provider.state_key, cursor_state, version)
+        except StateConflictError as e:
+            log_json("ERROR", "Incident cursor claim expired while publishing, another run may republish",
+                    provider=provider.name,
+                    error=str(e))
+            complete = False
+            # The next fetch prunes by the cursors another run saved, reloaded from the store
+            _ITEM_CUTOFFS.pop(provider.state_key, None)
+        except Exception as e:
+            log_json("ERROR", "Failed to save incident cursors", error=str(e))
+            complete = False
+            _ITEM_CUTOFFS.pop(provider.state_key, None)
+        else:
+            _ITEM_CUTOFFS[provider.state_key] = item_cutoffs(cursor_state)
+        record_duration('State', time.time() - stage_start)
+
+    update_history(provider, incidents)
+    archive_snapshot(provider)
+
+    return logs_published, complete
+
+def with_poll_count(response: Dict[str, Any], polls: int, providers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Add the number of passes of a fast-polling invocation, and the providers they polled, to its response"""
+    if polls == 1:
+        return response
+    body = json.loads(response['body'])
+    body['polls'] = polls
+    if providers is not None:
+        body['providers'] = providers
+    return {**response, 'body': json.dumps(body)}
+
+def run_monitor(provider, context=None):
+    """Run a monitoring pass, then keep re-polling while the provider has open incidents
+
+    The fast polls (WATCHY_FAST_POLL_SECONDS apart) stop before the next
+    scheduled run and the Lambda deadline; the response is the last pass's.
+    """
+    start_time = time.time()
+    response = run_monitor_pass(provider)
+    polls = 1
+    for _ in fast_polls([provider], context, start_time, get_polling_config()[0]):
+        response = run_monitor_pass(provider)
+        polls += 1
+    return with_poll_count(response, polls)
+
+def run_monitor_pass(provider):
+    """Fetch a provider's status, publish its incident logs and metrics, and build the Lambda response"""
+    global _COLD_START
+    start_time = time.time()
+    cold_start = _COLD_START
+    _COLD_START = False
+    timings = {}
+    timer = StageTimer()
+    display_name = provider.display_name
+    configure_logging()
+
+    try:
+        log_json("INFO", f"Watchy {display_name} Monitor v{VERSION} starting", runtime="Python Lambda")
+
+        # Get configuration from environment variables with defaults
+        namespace = provider.namespace
+        log_group = provider.log_group
+        polling_interval, disable_time_filter = get_polling_config()
+        metrics_mode, full_refresh_seconds = get_metrics_config()
+        if disable_time_filter:
+            log_json("INFO", f"Time filtering disabled - will log ALL incident {provider.item_label}s")
+
+        state_store = get_state_store()
+
+        log_json("INFO", "Configuration",
+                namespace=namespace,
+                log_group=log_group,
+                polling_interval_min=polling_interval,
+                metrics_mode=metrics_mode,
+                metrics_delta=full_refresh_seconds is not None)
+
+        # Fetch and parse the provider's status document. A failed fetch (including
+        # an open circuit) still reports APIResponse=500 so the alarms see the outage
+        stage_start = time.time()
+        try:
+            collected = run_with_timer(timer, fetch_provider, provider, state_store, disable_time_filter)
+        except Exception:
+            timings['fetch'] = time.time() - stage_start
+            publish_cloudwatch_metrics({'APIResponse': 500, **run_metrics(cold_start, timer)}, namespace,
+                                       metrics_mode, full_refresh_seconds)
+            raise
+        timings['fetch'] = collected['fetch_time']
+        unchanged = collected['unchanged']
+        incident_count = collected['incident_count']
+        metrics = collected['metrics']
+
+        # Fold this run's service levels into the availability rollups
+        availability_metrics = run_with_timer(timer, update_rollups, provider, metrics, state_store,
+                                              polling_interval, save=False)
+
+        # Persist the state, publish the logs and send the metrics
+        result = {'provider': provider, 'error': None, 'logs_published': 0, 'logs_complete': True, **collected}
+        _, published = publish_run(
+            {namespace: {**metrics, **availability_metrics}},
+            functools.partial(run_with_timer, timer, publish_provider_state, result, state_store,
+                              polling_interval, disable_time_filter),
+            lambda: {namespace: run_metrics(cold_start, timer)},
+            metrics_mode, full_refresh_seconds, timings)
+        logs_published = result['logs_published']
+
+        # Only remember the validators once this payload has been fully published, so
+        # a run that left log items to retry fetches it again
+        if not unchanged and published[namespace] and result['logs_complete']:
+            commit_conditional_validators(provider.api_url, metrics, incident_count)
+
+        summary = provider.summary(metrics, incident_count)
+
+        # Execution summary
+        execution_time = time.time() - start_time
+
+        log_json("INFO", "Monitoring completed",
+                execution_time=round(execution_time, 3),
+                cold_start=cold_start,
+                metrics_published=len(metrics),
+                logs_published=logs_published,
+                **summary,
+                api_response=metrics.get('APIResponse', 'unknown'))
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'message': f'{display_name} monitoring completed successfully',
+                'saas_app': display_name,
+                'version': VERSION,
+                'execution_time': execution_time,
+                'cold_start': cold_start,
+                'timings': timings,
+                'stages': timer.metrics(),
+                'metrics_published': len(metrics),
+                'logs_published': logs_published,
+                **summary,
+                'unchanged': unchanged,
+                'api_response': metrics.get('APIResponse', 'unknown'),
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            })
+        }
+
+    except Exception as e:
+        execution_time = time.time() - start_time
+        error_msg = f"{display_name} monitoring failed: {str(e)}"
+        log_json("ERROR", error_msg)
+
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'error': error_msg,
+                'saas_app': display_name,
+                'version': VERSION,
+                'execution_time': execution_time,
+                'cold_start': cold_start,
+                'timings': timings,
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            })
+        }
+
+def publish_provider_state(result: Dict[str, Any], state_store, polling_interval: int, disable_time_filter: bool):
+    """Persist a provider's rollups and, when its payload changed, publish its logs"""
+    save_rollups(result['provider'], state_store)
+    if result['error'] is None and not result['unchanged']:
+        result['logs_published'], result['logs_complete'] = publish_provider_logs(
+            result['provider'], result['incidents'], state_store, polling_interval, disable_time_filter,
+            result['poll_window'])
+
+def build_status_sets(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Group the fan-out run's status and availability metrics by namespace"""
+    metric_sets: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        namespace_metrics = metric_sets.setdefault(result['provider'].namespace, {})
+        namespace_metrics.update(result['metrics'])
+        namespace_metrics.update(result['availability_metrics'])
+    return metric_sets
+
+def build_run_sets(results: List[Dict[str, Any]], cold_start: bool) -> Dict[str, Dict[str, Any]]:
+    """Group the fan-out run's timer metrics by namespace, its run metrics under PLATFORM_NAMESPACE"""
+    metric_sets: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        stage_metrics = timer_metrics(result['timer'])
+        if stage_metrics:
+            metric_sets.setdefault(result['provider'].namespace, {}).update(stage_metrics)
+    platform_metrics = run_metrics(cold_start)
+    if platform_metrics:
+        metric_sets.setdefault(PLATFORM_NAMESPACE, {}).update(platform_metrics)
+    return metric_sets
+
+def merge_metric_sets(*metric_sets: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Combine metric sets namespace by namespace"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for sets in metric_sets:
+        for namespace, metrics in sets.items():
+            merged.setdefault(namespace, {}).update(metrics)
+    return merged
+
+def publish_results_state(results: List[Dict[str, Any]], state_store, polling_interval: int,
+                          disable_time_filter: bool):
+    """Run publish_provider_state for every fan-out provider in turn; a failure only affects its provider"""
+    for result in results:
+        try:
+            run_with_timer(result['timer'], publish_provider_state, result, state_store, polling_interval,
+                           disable_time_filter)
+        except Exception as e:
+            result['logs_error'] = str(e)
+            log_json("ERROR", "Provider log publishing failed", provider=result['provider'].name, error=str(e))
+
+def publish_run(status_sets: Dict[str, Dict[str, Any]], persist: Callable[[], None],
+                run_sets: Callable[[], Dict[str, Dict[str, Any]]], metrics_mode: str,
+                full_refresh_seconds: Optional[int],
+                timings: Dict[str, float]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, bool]]:
+    """Call persist() for the run's state, log and history work, and publish its metrics
+
+    persist() runs on the calling (handler) thread, which keeps the state
+    stores and history databases on a single thread. status_sets, the status
+    and availability metrics per namespace, depend on neither: with
+    WATCHY_CONCURRENT_PUBLISH they are sent from the publish thread meanwhile.
+    run_sets() is called once persist() is done, so the timer metrics it
+    returns include the work persist() recorded; they go out in a call of their
+    own, or in one call per namespace with the status metrics when publishing
+    serially. Fills timings and returns the metric sets and whether each
+    namespace was published.
+    """
+    global _LAST_PUBLISH_MS
+    status_future = None
+    if concurrent_publish_enabled():
+        status_future = get_publish_executor().submit(timed_call, publish_metric_sets, status_sets,
+                                                      metrics_mode, full_refresh_seconds)
+    stage_start = time.time()
+    try:
+        persist()
+    finally:
+        timings['publish_logs'] = time.time() - stage_start
+        run_metric_sets = {namespace: metrics for namespace, metrics in run_sets().items() if metrics}
+        if status_future is None:
+            published, timings['publish_metrics'] = timed_call(
+                publish_metric_sets, merge_metric_sets(status_sets, run_metric_sets), metrics_mode,
+                full_refresh_seconds)
+        else:
+            published, status_seconds = status_future.result()
+            run_published, run_seconds = timed_call(publish_metric_sets, run_metric_sets, metrics_mode,
+                                                    full_refresh_seconds, RUN_METRICS_DELTA_SUFFIX)
+            for namespace, ok in run_published.items():
+                published[namespace] = published.get(namespace, True) and ok
+            timings['publish_metrics'] = status_seconds + run_seconds
+        _LAST_PUBLISH_MS = round(timings['publish_metrics'] * 1000, 3)
+    return merge_metric_sets(status_sets, run_metric_sets), published
+
+def get_executor(max_workers: int):
+    """Return the fan-out thread pool, kept across warm invocations"""
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    if _EXECUTOR is None or _EXECUTOR_WORKERS != max_workers:
+        from concurrent.futures import ThreadPoolExecutor  # Only the fan-out function needs it
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=False)
+        _EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='watchy-fetch')
+        _EXECUTOR_WORKERS = max_workers
+    return _EXECUTOR
+
+def run_multi_monitor(providers: List[Any], context=None):
+    """Run a fan-out pass, then keep re-polling the providers that have open incidents
+
+    The response is the first pass's, with each provider's summary replaced
+    by that of the last pass that polled it.
+    """
+    start_time = time.time()
+    response = run_multi_monitor_pass(providers, context)
+    polls = 1
+    provider_summaries = None
+    for active in fast_polls(providers, context, start_time, get_polling_config()[0]):
+        if provider_summaries is None:
+            provider_summaries = json.loads(response['body']).get('providers', {})
+        provider_summaries.update(json.loads(run_multi_monitor_pass(active, context)['body']).get('providers', {}))
+        polls += 1
+    return with_poll_count(response, polls, provider_summaries)
+
+def run_multi_monitor_pass(providers: List[Any], context=None):
+    """Poll many providers concurrently and publish their logs and metrics in one pass
+
+    Fetching and parsing run on a bounded thread pool (WATCHY_MAX_WORKERS). A
+    provider that fails, or is still fetching when the deadline (the Lambda's
+    remaining time minus PUBLISH_RESERVE_SECONDS) is reached, gets
+    APIResponse=500 and does not hold up the others. Each provider's state and
+    logs are then published in turn from the handler thread (see publish_run).
+    """
+    global _COLD_START
+    start_time = time.time()
+    cold_start = _COLD_START
+    _COLD_START = False
+    timings = {}
+    configure_logging()
+
+    try:
+        log_json("INFO", f"Watchy Multi-Provider Monitor v{VERSION} starting", runtime="Python Lambda")
+
+        polling_interval, disable_time_filter = get_polling_config()
+        metrics_mode, full_refresh_seconds = get_metrics_config()
+        max_workers = max(1, int(os.getenv('WATCHY_MAX_WORKERS', '8')))
+        if disable_time_filter:
+            log_json("INFO", "Time filtering disabled - will log ALL incident items")
+
+        state_store = get_state_store()
+
+        log_json("INFO", "Configuration",
+                providers=[provider.name for provider in providers],
+                max_workers=max_workers,
+                polling_interval_min=polling_interval,
+                metrics_mode=metrics_mode,
+                metrics_delta=full_refresh_seconds is not None)
+
+        # Fetch and parse every provider concurrently
+        deadline = None
+        if context is not None:
+            deadline = max(1, context.get_remaining_time_in_millis() / 1000 - PUBLISH_RESERVE_SECONDS)
+
+        from concurrent.futures import wait  # Deferred with the executor
+
+        stage_start = time.time()
+        executor = get_executor(max_workers)
+        timers = [StageTimer() for _ in providers]
+        tokens = [FetchToken() for _ in providers]
+        futures = [executor.submit(run_with_timer, timer, fetch_provider, provider, state_store, disable_time_filter,
+                                   token)
+                   for provider, timer, token in zip(providers, timers, tokens)]
+        wait(futures, timeout=deadline)
+        timings['fetch'] = time.time() - stage_start
+
+        results = []
+        for provider, timer, token, future in zip(providers, timers, tokens, futures):
+            result = {'provider': provider, 'timer': timer, 'error': None}
+            if not future.done():
+                if not future.cancel():
+                    # Already running: stop it staging anything from here on, and drop
+                    # what it staged before the deadline
+                    token.cancel()
+                    discard_conditional_validators(provider.api_url)
+                    discard_snapshot(provider)
+                result['error'] = 'Timed out waiting for status API'
+            elif future.exception() is not None:
+                result['error'] = str(future.exception())
+            else:
+                result.update(future.result())
+
+            if result['error'] is not None:
+                log_json("ERROR", "Provider poll failed", provider=provider.name, error=result['error'])
+                record_poll(provider, {'APIResponse': 500}, polled=False)
+                result.update(unchanged=False, incidents=[], incident_count=0, metrics={'APIResponse': 500})
+            results.append(result)
+
+        # Fold every provider's service levels into its availability rollups
+        for result in results:
+            result['logs_published'] = 0
+            result['logs_complete'] = False
+            result['availability_metrics'] = run_with_timer(result['timer'], update_rollups, result['provider'],
+                                                            result['metrics'], state_store, polling_interval,
+                                                            save=False)
+
+        # Persist each provider's state, publish its logs and send every namespace's metrics
+        metric_sets, published = publish_run(
+            build_status_sets(results),
+            functools.partial(publish_results_state, results, state_store, polling_interval, disable_time_filter),
+            functools.partial(build_run_sets, results, cold_start),
+            metrics_mode, full_refresh_seconds, timings)
+
+        provider_summaries = {}
+        for result in results:
+            provider = result['provider']
+            metrics = result['metrics']
+
+            # Only remember the validators once this payload has been fully published
+            if (result['error'] is None and not result['unchanged'] and result['logs_complete']
+                    and published.get(provider.namespace)):
+                commit_conditional_validators(provider.api_url, metrics, result['incident_count'])
+
+            summary = {
+                'status': 'error' if result['error'] else 'ok',
+                'metrics_published': len(metrics),
+                'logs_published': result['logs_published'],
+                **provider.summary(metrics, result['incident_count']),
+                'unchanged': result['unchanged'],
+                'api_response': metrics.get('APIResponse', 'unknown'),
+                'stages': result['timer'].metrics()
+            }
+            if result['error']:
+                summary['error'] = result['error']
+            if result.get('logs_error'):
+                summary['logs_error'] = result['logs_error']
+            provider_summaries[provider.name] = summary
+
+        failed_providers = [name for name, summary in provider_summaries.items() if summary['status'] == 'error']
+
+        # Execution summary
+        execution_time = time.time() - start_time
+
+        log_json("INFO", "Monitoring completed",
+                execution_time=round(execution_time, 3),
+                cold_start=cold_start,
+                providers_polled=len(providers),
+                failed_providers=failed_providers,
+                metrics_published=sum(len(metrics) for metrics in metric_sets.values()),
+                logs_published=sum(result['logs_published'] for result in results))
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'message': 'Multi-provider monitoring completed successfully',
+                'version': VERSION,
+                'execution_time': execution_time,
+                'cold_start': cold_start,
+                'timings': timings,
+                'providers': provider_summaries,
+                'failed_providers': failed_providers,
+                'metrics_published': sum(len(metrics) for metrics in metric_sets.values()),
+                'logs_published': sum(result['logs_published'] for result in results),
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            })
+        }
+
+    except Exception as e:
+        execution_time = time.time() - start_time
+        error_msg = f"Multi-provider monitoring failed: {str(e)}"
+        log_json("ERROR", error_msg)
+
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'error': error_msg,
+                'version': VERSION,
+                'execution_time': execution_time,
+                'cold_start': cold_start,
+                'timings': timings,
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            })
+        }
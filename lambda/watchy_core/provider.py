@@ -0,0 +1,129 @@
+"""Provider adapter interface"""
+import os
+from functools import partial
+from typing import Dict, Any, List, Optional
+
+from . import VERSION
+from .archive import snapshot_hook
+from .fetch import fetch_status_json
+from .model import Incident
+from .text import parse_timestamp_ms, TimestampParseError
+from .timing import count
+
+class Provider:
+    """Describes one SaaS status API to the shared monitoring pipeline
+
+    Subclasses set the class attributes below and implement normalize() and
+    metrics(); everything else has a default.
+    """
+    name = ''                # Short identifier used in log streams and state keys
+    display_name = ''        # Human readable name used in messages
+    default_api_url = ''
+    default_namespace = ''
+    default_log_group = ''
+    fetch_label = 'status'   # What the fetched document is called in logs
+    incident_state = 'active'  # Adjective for the incidents a payload lists
+    item_label = 'update'    # What an incident's log items are called
+    body_field = 'update_body'  # Log entry field holding the cleaned item body
+    incidents_key = 'incidents'  # Payload key of the incident list, streamed while decoding
+    items_key = ''           # Incident key of its log items; empty disables pruning
+    item_time_key = ''       # Log item key of its creation timestamp
+    active_incidents_metric = ''  # Metric counting open incidents, which triggers fast polling
+
+    def __init__(self, api_url: Optional[str] = None, namespace: Optional[str] = None,
+                 log_group: Optional[str] = None):
+        self.api_url = api_url or self.default_api_url
+        self.namespace = namespace or self.default_namespace
+        self.log_group = log_group or self.default_log_group
+
+    @classmethod
+    def from_env(cls) -> 'Provider':
+        """Build the provider from the standard Lambda environment variables"""
+        return cls(api_url=os.getenv('API_URL'),
+                   namespace=os.getenv('CLOUDWATCH_NAMESPACE'),
+                   log_group=os.getenv('CLOUDWATCH_LOG_GROUP'))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'Provider':
+        """Build the provider from a fan-out provider config entry"""
+        return cls(api_url=config.get('api_url'),
+                   namespace=config.get('namespace'),
+                   log_group=config.get('log_group'))
+
+    @property
+    def source(self) -> str:
+        return f"watchy-{self.name}-monitor"
+
+    @property
+    def user_agent(self) -> str:
+        return f"Watchy-{self.display_name}Monitor/{VERSION}"
+
+    @property
+    def state_key(self) -> str:
+        return f"{self.name}-incidents"
+
+    def fetch(self, item_cutoffs: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch the status document, or None when it is unchanged since the last published one
+
+        item_cutoffs maps incident ids to the epoch milliseconds before which
+        their log items are known to be published; those items are dropped while
+        the incident list is decoded, so they are never all held in memory. The
+        raw document is staged for the snapshot archive first, when one is set up.
+        """
+        on_element = None
+        if item_cutoffs and self.items_key:
+            on_element = partial(self.drop_items_before, item_cutoffs=item_cutoffs)
+        return fetch_status_json(self.api_url, self.user_agent, self.fetch_label, self.incidents_key, on_element,
+                                 snapshot_hook(self))
+
+    def drop_items_before(self, incident: Any, item_cutoffs: Dict[str, int]):
+        """Remove an incident's log items older than its cutoff"""
+        if not isinstance(incident, dict):
+            return
+        cutoff_ms = item_cutoffs.get(str(self.incident_id(incident)))
+        items = incident.get(self.items_key)
+        if cutoff_ms is None or not isinstance(items, list):
+            return
+        kept = [item for item in items if not self._item_is_before(item, cutoff_ms)]
+        if len(kept) < len(items):
+            count('ItemsPruned', len(items) - len(kept))
+            incident[self.items_key] = kept
+
+    def _item_is_before(self, item: Any, cutoff_ms: int) -> bool:
+        try:
+            return parse_timestamp_ms(item[self.item_time_key]) < cutoff_ms
+        except (KeyError, TypeError, TimestampParseError):
+            return False  # Kept, so publishing reports the problem
+
+    def incidents(self, payload: Dict[str, Any]) -> List[Incident]:
+        """Return the payload's incidents, normalized once for every later stage"""
+        return [self.normalize(incident) for incident in payload.get(self.incidents_key, [])]
+
+    def incident_id(self, incident: Dict[str, Any]) -> Any:
+        """Return a raw incident's id, also used while decoding, before normalization"""
+        return incident.get('id', 'unknown')
+
+    def normalize(self, incident: Dict[str, Any]) -> Incident:
+        """Convert one raw incident of the payload to the shared model"""
+        raise NotImplementedError
+
+    def describe_incident(self, incident: Incident) -> List[str]:
+        """Return debug lines: an incident description followed by one line per item"""
+        label = self.item_label.capitalize()
+        lines = [f"ID={incident.id}, Title='{incident.title}', Severity={incident.severity}, "
+                 f"Status={incident.status}, {label}s={len(incident.items)}"]
+        for j, item in enumerate(incident.items):
+            lines.append(f"{label} {j+1}: {item.created or 'unknown'}")
+        return lines
+
+    def metrics(self, payload: Dict[str, Any], incidents: List[Incident]) -> Dict[str, int]:
+        """Convert the status document and its normalized incidents to numeric CloudWatch metrics"""
+        raise NotImplementedError
+
+    def rollup_levels(self, metrics: Dict[str, int]) -> Dict[str, int]:
+        """Return the severity level (0 = healthy) of each service tracked by the availability rollups"""
+        return {}
+
+    def summary(self, metrics: Dict[str, int], incident_count: int) -> Dict[str, Any]:
+        """Return the provider-specific fields of the execution summary"""
+        return {f"{self.incident_state}_incidents": incident_count}
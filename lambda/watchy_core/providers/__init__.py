@@ -0,0 +1,67 @@
+"""Provider adapters for the status APIs Watchy monitors"""
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from ..log import log_json
+from ..provider import Provider
+from .slack import SlackProvider
+from .github import GitHubProvider
+from .statuspage import StatuspageProvider
+
+# Registry of provider adapters by name
+PROVIDERS = {
+    SlackProvider.name: SlackProvider,
+    GitHubProvider.name: GitHubProvider,
+    # Generic adapter for any Statuspage-hosted vendor; needs name and base_url
+    'statuspage': StatuspageProvider
+}
+
+# Registry adapters that need no config, polled when WATCHY_PROVIDERS cannot be read
+DEFAULT_PROVIDERS = [SlackProvider.name, GitHubProvider.name]
+
+def build_provider(config: Any) -> Provider:
+    """Build a provider from a config entry: a registry name or a dict with a 'type' key"""
+    if isinstance(config, str):
+        config = {'type': config}
+    provider_type = str(config.get('type', '')).lower()
+    if provider_type not in PROVIDERS:
+        raise ValueError(f"Unknown provider type: {provider_type or '(missing)'}")
+    return PROVIDERS[provider_type].from_config(config)
+
+def load_providers(event: Optional[Dict[str, Any]] = None) -> List[Provider]:
+    """Build the providers listed in event['providers'] or the WATCHY_PROVIDERS JSON list
+
+    Invalid and duplicate entries are logged and skipped so one bad config
+    entry does not stop the other providers from being polled. A
+    WATCHY_PROVIDERS value that is not a JSON list is logged too, and the
+    DEFAULT_PROVIDERS are polled instead.
+    """
+    configs = (event or {}).get('providers')
+    if configs is None:
+        try:
+            configs = json.loads(os.getenv('WATCHY_PROVIDERS', '[]'))
+            if not isinstance(configs, list):
+                raise ValueError(f"expected a JSON list, got {type(configs).__name__}")
+        except ValueError as e:  # json.JSONDecodeError included
+            log_json("ERROR", "Invalid WATCHY_PROVIDERS, polling the default providers",
+                    error=str(e),
+                    providers=DEFAULT_PROVIDERS)
+            configs = DEFAULT_PROVIDERS
+
+    providers = []
+    seen = set()
+    for config in configs:
+        try:
+            provider = build_provider(config)
+        except Exception as e:
+            log_json("ERROR", "Skipping invalid provider config", config=config, error=str(e))
+            continue
+        if provider.name in seen:
+            log_json("ERROR", "Skipping duplicate provider", provider=provider.name)
+            continue
+        seen.add(provider.name)
+        providers.append(provider)
+    return providers
+
+__all__ = ['PROVIDERS', 'DEFAULT_PROVIDERS', 'SlackProvider', 'GitHubProvider', 'StatuspageProvider', 'build_provider', 'load_providers']
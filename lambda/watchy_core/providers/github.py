@@ -0,0 +1,35 @@
+"""GitHub status API adapter"""
+from typing import Dict, Any
+
+from .statuspage import StatuspageProvider, build_component_index, parse_statuspage_summary
+
+# GitHub services that get their own status metric (and alarm, generated by
+# tools/generate_component_alarms.py from this same list)
+GITHUB_COMPONENTS = [
+    "Git Operations",
+    "Webhooks",
+    "API Requests",
+    "Issues",
+    "Pull Requests",
+    "Actions",
+    "Packages",
+    "Pages",
+    "Codespaces",
+    "Copilot"
+]
+
+GITHUB_COMPONENT_INDEX = build_component_index(GITHUB_COMPONENTS)
+
+def parse_github_incidents(incidents_data: Dict[str, Any]) -> Dict[str, int]:
+    """Parse GitHub incidents and convert to numeric values for CloudWatch"""
+    return parse_statuspage_summary(incidents_data, 'GitHub', GITHUB_COMPONENT_INDEX)
+
+class GitHubProvider(StatuspageProvider):
+    """GitHub Statuspage API (https://www.githubstatus.com/api/v2/summary.json)"""
+    name = 'github'
+    display_name = 'GitHub'
+    default_api_url = 'https://www.githubstatus.com/api/v2/summary.json'
+    default_namespace = 'Watchy/GitHub'
+    default_log_group = '/watchy/services/github'
+    fetch_label = 'GitHub incidents'
+    component_index = GITHUB_COMPONENT_INDEX
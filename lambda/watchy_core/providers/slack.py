@@ -0,0 +1,136 @@
+"""Slack status API adapter"""
+from typing import Dict, Any, List, Optional
+
+from ..log import log_json
+from ..model import Incident, LogItem
+from ..provider import Provider
+
+# All 11 Slack services
+SLACK_SERVICES = [
+    "Login/SSO",
+    "Messaging",
+    "Notifications",
+    "Search",
+    "Workspace/Org Administration",
+    "Canvases",
+    "Connectivity",
+    "Files",
+    "Huddles",
+    "Apps/Integrations/APIs",
+    "Workflows"
+]
+
+# CloudWatch-friendly metric name of each service: slashes, underscores and
+# spaces removed to match the alarm names
+SLACK_SERVICE_METRICS = {service: service.replace('/', '').replace(' ', '').replace('_', '')
+                         for service in SLACK_SERVICES}
+
+# Type mapping: notice=1, incident=2, outage=3
+SLACK_TYPE_LEVELS = {
+    'notice': 1,
+    'incident': 2,
+    'outage': 3
+}
+
+def normalize_slack_incident(incident: Dict[str, Any]) -> Incident:
+    """Convert one Slack active incident to the shared model"""
+    incident_type = incident.get('type', 'incident')
+    status = incident.get('status', 'active')
+    services = incident.get('services') or []
+    level = SLACK_TYPE_LEVELS.get(incident_type, 2)  # Default to incident (2)
+    active = status == 'active'
+    incident_id = incident.get('id', 'unknown')
+    return Incident(
+        incident_id=incident_id,
+        title=incident.get('title', 'Unknown Incident'),
+        severity=incident_type,
+        status=status,
+        started=incident.get('date_created', ''),
+        resolved=incident.get('date_updated', '') if status in ('resolved', 'completed') else '',
+        services=services,
+        fields={
+            'incident_id': incident_id,
+            'incident_title': incident.get('title', 'Unknown Incident'),
+            'incident_type': incident_type,
+            'incident_status': incident.get('status', 'unknown'),
+            'incident_url': incident.get('url', ''),
+            'affected_services': incident.get('services', [])
+        },
+        # Slack notes carry no id, so they are identified by their body
+        items=[LogItem(note.get('id'), note.get('date_created', ''), note.get('body', ''))
+               for note in incident.get('notes') or []],
+        active=active,
+        level=level,
+        # Only active incidents degrade their services
+        service_levels=tuple((SLACK_SERVICE_METRICS[service], level) for service in services
+                             if service in SLACK_SERVICE_METRICS) if active else ()
+    )
+
+def parse_slack_services(status_data: Dict[str, Any], incidents: Optional[List[Incident]] = None) -> Dict[str, int]:
+    """Parse Slack service statuses and convert to numeric values for CloudWatch
+
+    incidents are the payload's normalized incidents, when the caller has them.
+    """
+    try:
+        if incidents is None:
+            incidents = [normalize_slack_incident(incident) for incident in status_data.get('active_incidents', [])]
+
+        # Initialize all services to 0 (healthy)
+        metrics = dict.fromkeys(SLACK_SERVICE_METRICS.values(), 0)
+
+        # Use the highest severity if multiple incidents affect same service
+        for incident in incidents:
+            for metric_name, severity in incident.service_levels:
+                metrics[metric_name] = max(metrics[metric_name], severity)
+                log_json("DEBUG", "Service affected by incident",
+                        service=metric_name,
+                        incident_type=incident.severity,
+                        severity=severity)
+
+        # Count active incidents
+        metrics['ActiveIncidents'] = len(incidents)
+        log_json("INFO", "Slack incidents summary", active_incidents=len(incidents))
+
+        # Add overall API response metric
+        metrics['APIResponse'] = 200 if status_data else 500
+
+        return metrics
+
+    except Exception as e:
+        log_json("ERROR", "Failed to parse Slack services", error=str(e))
+        return {'APIResponse': 500}
+
+class SlackProvider(Provider):
+    """Slack status API (https://status.slack.com/api/v2.0.0/current)"""
+    name = 'slack'
+    display_name = 'Slack'
+    default_api_url = 'https://status.slack.com/api/v2.0.0/current'
+    default_namespace = 'Watchy/Slack'
+    default_log_group = '/watchy/services/slack'
+    fetch_label = 'Slack status'
+    incident_state = 'active'
+    item_label = 'note'
+    body_field = 'note_body'
+    incidents_key = 'active_incidents'
+    items_key = 'notes'
+    item_time_key = 'date_created'
+    active_incidents_metric = 'ActiveIncidents'
+
+    def normalize(self, incident: Dict[str, Any]) -> Incident:
+        return normalize_slack_incident(incident)
+
+    def metrics(self, payload: Dict[str, Any], incidents: List[Incident]) -> Dict[str, int]:
+        return parse_slack_services(payload, incidents)
+
+    def rollup_levels(self, metrics: Dict[str, int]) -> Dict[str, int]:
+        # Every metric but the two aggregates is a 0-3 service severity
+        return {name: value for name, value in metrics.items() if name not in ('ActiveIncidents', 'APIResponse')}
+
+    def summary(self, metrics: Dict[str, int], incident_count: int) -> Dict[str, Any]:
+        # Determine if any services are down (exclude APIResponse and ActiveIncidents)
+        service_incidents = sum(1 for key, value in metrics.items()
+                               if key not in ['APIResponse', 'ActiveIncidents'] and value >= 2)
+        return {
+            'active_incidents': incident_count,
+            'service_incidents': service_incidents
+        }
@@ -0,0 +1,261 @@
+"""Atlassian Statuspage (statuspage.io) API adapter
+
+Any vendor hosting its status page on Statuspage exposes the same v2 API, so a
+single adapter covers them all; only the base URL differs. summary.json returns
+page status, components, unresolved incidents and scheduled maintenances in one
+request.
+"""
+import re
+from typing import Dict, Any, Iterable, List, Optional
+
+from ..log import log_json
+from ..model import Incident, LogItem
+from ..provider import Provider
+
+# Non-operational component statuses and the metrics counting them
+COMPONENT_STATUS_METRICS = {
+    'degraded_performance': 'ComponentsDegraded',
+    'partial_outage': 'ComponentsPartialOutage',
+    'major_outage': 'ComponentsMajorOutage',
+    'under_maintenance': 'ComponentsUnderMaintenance'
+}
+
+# Per-component status levels, on the same 0-3 scale as the Slack service metrics
+COMPONENT_STATUS_LEVELS = {
+    'operational': 0,
+    'under_maintenance': 1,
+    'degraded_performance': 1,
+    'partial_outage': 2,
+    'major_outage': 3
+}
+
+# Impact mapping: none=0, minor=1, major=2, critical=3
+IMPACT_LEVELS = {
+    'none': 0,
+    'minor': 1,
+    'major': 2,
+    'critical': 3
+}
+
+# Incident statuses counted as unresolved
+UNRESOLVED_STATUSES = frozenset(['investigating', 'identified', 'monitoring'])
+
+def component_metric_name(component_name: str) -> str:
+    """Convert a component name to a CloudWatch-friendly metric name ("Git Operations" -> "GitOperations")"""
+    return re.sub(r'[^A-Za-z0-9]', '', component_name)
+
+def build_component_index(component_names: Iterable[str]) -> Dict[str, str]:
+    """Precompute the case-insensitive component name -> metric name lookup used while parsing"""
+    return {name.casefold(): component_metric_name(name) for name in component_names}
+
+def statuspage_summary_url(base_url: str) -> str:
+    """Return the summary.json endpoint of a Statuspage-hosted status page"""
+    return f"{base_url.rstrip('/')}/api/v2/summary.json"
+
+def normalize_statuspage_incident(incident: Dict[str, Any],
+                                  component_index: Optional[Dict[str, str]] = None) -> Incident:
+    """Convert one Statuspage incident to the shared model
+
+    Its level is the impact level, or None for an impact outside IMPACT_LEVELS;
+    its service_levels are the 0-3 statuses of the components in component_index.
+    """
+    incident_id = incident.get('id', 'unknown')
+    components = incident.get('components') or []
+    component_names = [component.get('name', 'Unknown') for component in components]
+    component_levels = []
+    if component_index:
+        for component in components:
+            metric_name = component_index.get(component.get('name', '').casefold())
+            if metric_name:
+                component_levels.append(
+                    (metric_name, COMPONENT_STATUS_LEVELS.get(component.get('status', 'operational'), 0)))
+    return Incident(
+        incident_id=incident_id,
+        title=incident.get('name', 'Unknown Incident'),
+        severity=incident.get('impact', 'unknown'),
+        status=incident.get('status', 'unknown'),
+        started=incident.get('created_at', ''),
+        resolved=incident.get('resolved_at') or '',
+        services=component_names,
+        fields={
+            'incident_id': incident_id,
+            'incident_name': incident.get('name', 'Unknown Incident'),
+            'incident_status': incident.get('status', 'unknown'),
+            'incident_impact': incident.get('impact', 'unknown'),
+            'incident_shortlink': incident.get('shortlink', ''),
+            'incident_created_at': incident.get('created_at', ''),
+            'incident_updated_at': incident.get('updated_at', ''),
+            'affected_components': component_names
+        },
+        # Statuspage updates have stable ids
+        items=[LogItem(str(update['id']) if update.get('id') else None, update.get('created_at', ''),
+                       update.get('body', ''), (('update_status', update.get('status', '')),))
+               for update in incident.get('incident_updates') or []],
+        active=str(incident.get('status') or 'unknown').lower() in UNRESOLVED_STATUSES,
+        level=IMPACT_LEVELS.get(str(incident.get('impact') or 'none').lower()),
+        service_levels=tuple(component_levels)
+    )
+
+def parse_statuspage_summary(page_data: Dict[str, Any], page_name: str = 'Statuspage',
+                             component_index: Optional[Dict[str, str]] = None,
+                             incidents: Optional[List[Incident]] = None) -> Dict[str, int]:
+    """Parse a Statuspage summary.json (or incidents/unresolved.json) document into CloudWatch metrics
+
+    Incident metrics are always produced. Page status, component and scheduled
+    maintenance metrics are only added when the document carries those
+    sections, so the older incidents-only endpoints keep working. With a
+    component_index, every indexed component also gets its own 0-3 status
+    metric, taken from the page components and the components of each incident.
+    incidents are the document's normalized incidents, when the caller has them.
+    """
+    try:
+        if incidents is None:
+            incidents = [normalize_statuspage_incident(incident, component_index)
+                         for incident in page_data.get('incidents', [])]
+
+        metrics = {}
+
+        # Count unresolved incidents (investigating, identified, monitoring) by impact level
+        impact_counts = dict.fromkeys(IMPACT_LEVELS, 0)
+        impact_names = list(IMPACT_LEVELS)
+
+        # Track highest impact level
+        max_impact_level = 0
+
+        for incident in incidents:
+            if incident.active and incident.level is not None:
+                impact_counts[impact_names[incident.level]] += 1
+                max_impact_level = max(max_impact_level, incident.level)
+
+                log_json("DEBUG", "Processing unresolved incident",
+                        incident_name=incident.title,
+                        incident_impact=impact_names[incident.level],
+                        incident_status=incident.status,
+                        impact_level=incident.level)
+
+        # Set metrics for each impact level
+        metrics['IncidentsNone'] = impact_counts['none']
+        metrics['IncidentsMinor'] = impact_counts['minor']
+        metrics['IncidentsMajor'] = impact_counts['major']
+        metrics['IncidentsCritical'] = impact_counts['critical']
+        
+        # Total unresolved incidents
+        total_incidents = sum(impact_counts.values())
+        metrics['TotalUnresolvedIncidents'] = total_incidents
+        
+        # Highest impact level (for alerting)
+        metrics['HighestImpactLevel'] = max_impact_level
+        
+        # Overall page status indicator
+        if 'status' in page_data:
+            indicator = page_data['status'].get('indicator', 'none')
+            metrics['StatusIndicator'] = IMPACT_LEVELS.get(indicator, 0)
+
+        # Components that are not operational, by status (group containers excluded)
+        if 'components' in page_data:
+            component_counts = {status: 0 for status in COMPONENT_STATUS_METRICS}
+            for component in page_data['components']:
+                if component.get('group'):
+                    continue
+                component_status = component.get('status', 'operational')
+                if component_status in component_counts:
+                    component_counts[component_status] += 1
+            for status, metric_name in COMPONENT_STATUS_METRICS.items():
+                metrics[metric_name] = component_counts[status]
+
+        # Per-component status for the indexed components (0=operational ... 3=major outage)
+        if component_index:
+            component_levels = {metric_name: 0 for metric_name in component_index.values()}
+            for component in page_data.get('components', []):
+                metric_name = component_index.get(component.get('name', '').casefold())
+                if metric_name:
+                    level = COMPONENT_STATUS_LEVELS.get(component.get('status', 'operational'), 0)
+                    component_levels[metric_name] = max(component_levels[metric_name], level)
+            for incident in incidents:
+                for metric_name, level in incident.service_levels:
+                    component_levels[metric_name] = max(component_levels[metric_name], level)
+            metrics.update(component_levels)
+
+        # Scheduled maintenances currently under way
+        if 'scheduled_maintenances' in page_data:
+            metrics['MaintenancesInProgress'] = sum(
+                1 for maintenance in page_data['scheduled_maintenances']
+                if maintenance.get('status') in ['in_progress', 'verifying'])
+
+        # Add overall API response metric
+        metrics['APIResponse'] = 200 if page_data else 500
+
+        log_json("INFO", f"{page_name} incidents summary",
+                total_incidents=total_incidents,
+                impact_counts=impact_counts,
+                highest_impact_level=max_impact_level)
+
+        return metrics
+
+    except Exception as e:
+        log_json("ERROR", f"Failed to parse {page_name} incidents", error=str(e))
+        return {'APIResponse': 500}
+
+class StatuspageProvider(Provider):
+    """Any Statuspage-hosted status page, configured by name and base URL"""
+    fetch_label = ''
+    component_index: Dict[str, str] = {}  # Components that get their own status metric
+    incident_state = 'unresolved'
+    item_label = 'update'
+    body_field = 'update_body'
+    items_key = 'incident_updates'
+    item_time_key = 'created_at'
+    active_incidents_metric = 'TotalUnresolvedIncidents'
+
+    def __init__(self, api_url: Optional[str] = None, namespace: Optional[str] = None,
+                 log_group: Optional[str] = None, name: Optional[str] = None,
+                 display_name: Optional[str] = None, base_url: Optional[str] = None,
+                 components: Optional[List[str]] = None):
+        if name:
+            self.name = name.lower()
+            self.display_name = display_name or name
+        elif display_name:
+            self.display_name = display_name
+        if not self.name:
+            raise ValueError("Statuspage provider requires a name")
+        if base_url:
+            self.default_api_url = statuspage_summary_url(base_url)
+        self.default_namespace = self.default_namespace or f"Watchy/{self.display_name}"
+        self.default_log_group = self.default_log_group or f"/watchy/services/{self.name}"
+        self.fetch_label = self.fetch_label or f"{self.display_name} status"
+        if components:
+            self.component_index = build_component_index(components)
+        super().__init__(api_url, namespace, log_group)
+        if not self.api_url:
+            raise ValueError(f"Statuspage provider {self.name} requires base_url or api_url")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'Provider':
+        return cls(api_url=config.get('api_url'),
+                   namespace=config.get('namespace'),
+                   log_group=config.get('log_group'),
+                   name=config.get('name'),
+                   display_name=config.get('display_name'),
+                   base_url=config.get('base_url'),
+                   components=config.get('components'))
+
+    def normalize(self, incident: Dict[str, Any]) -> Incident:
+        return normalize_statuspage_incident(incident, self.component_index)
+
+    def metrics(self, payload: Dict[str, Any], incidents: List[Incident]) -> Dict[str, int]:
+        return parse_statuspage_summary(payload, self.display_name, self.component_index, incidents)
+
+    def rollup_levels(self, metrics: Dict[str, int]) -> Dict[str, int]:
+        # The page is degraded at the highest impact of its unresolved incidents
+        levels = {'Page': metrics.get('HighestImpactLevel', 0)}
+        for metric_name in self.component_index.values():
+            levels[metric_name] = metrics.get(metric_name, 0)
+        return levels
+
+    def summary(self, metrics: Dict[str, int], incident_count: int) -> Dict[str, Any]:
+        # Determine if there are any major/critical incidents
+        return {
+            'unresolved_incidents': incident_count,
+            'major_critical_incidents': metrics.get('IncidentsMajor', 0) + metrics.get('IncidentsCritical', 0),
+            'highest_impact_level': metrics.get('HighestImpactLevel', 0)
+        }
@@ -0,0 +1,213 @@
+"""Incremental availability rollups per vendor service
+
+Each run adds the time since the previous run to the severity level every
+service had then (0 = healthy, as in the service and component metrics),
+split into hour, day and month buckets, and counts the level transitions.
+Availability over any span is then a sum over its buckets instead of over
+5-minute metric samples. Time the provider could not be polled for (failed
+fetches, or gaps longer than ROLLUP_GAP_INTERVALS polling intervals) is
+kept apart as unknown and left out of availability.
+
+The rollups are one compact JSON document per provider in the state store:
+
+    {"last": {"ts": <ms>, "levels": {"Messaging": 0, ...} | null},
+     "hour": {"2026-10-17T06": {"ms": {"Messaging": [<ms at 0>, <ms at 1>, ...]},
+                                "transitions": {"Messaging": 1}, "unknown": <ms>}},
+     "day": {"2026-10-17": {...}}, "month": {"2026-10": {...}}}
+"""
+import os
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from .log import log_json
+from .timing import record_duration
+
+# Bucket key format and number of buckets kept, per period
+PERIODS = {
+    'hour': ('%Y-%m-%dT%H', 48),
+    'day': ('%Y-%m-%d', 62),
+    'month': ('%Y-%m', 36)
+}
+
+HOUR_MS = 60 * 60 * 1000
+
+# A gap between samples longer than this many polling intervals counts as unknown
+ROLLUP_GAP_INTERVALS = 3
+
+# Rollup documents per state key, kept across warm invocations
+_ROLLUPS: Dict[str, Dict[str, Any]] = {}
+
+def rollups_enabled() -> bool:
+    return os.getenv('WATCHY_ROLLUPS', 'true').lower() == 'true'
+
+def rollup_state_key(provider) -> str:
+    return f"{provider.name}-rollups"
+
+def bucket_key(period: str, ts_ms: int) -> str:
+    return time.strftime(PERIODS[period][0], time.gmtime(ts_ms // 1000))
+
+def _bucket(rollups: Dict[str, Any], period: str, ts_ms: int) -> Dict[str, Any]:
+    return rollups.setdefault(period, {}).setdefault(
+        bucket_key(period, ts_ms), {'ms': {}, 'transitions': {}, 'unknown': 0})
+
+def accrue(rollups: Dict[str, Any], start_ms: int, end_ms: int, levels: Optional[Dict[str, int]]):
+    """Add [start_ms, end_ms) at the given levels (None: unknown) to every bucket it overlaps
+
+    Hours align with days and months in UTC, so the span is cut at hour
+    boundaries and each piece goes to one bucket per period.
+    """
+    while start_ms < end_ms:
+        piece_end = min(end_ms, (start_ms // HOUR_MS + 1) * HOUR_MS)
+        duration = piece_end - start_ms
+        for period in PERIODS:
+            bucket = _bucket(rollups, period, start_ms)
+            if levels is None:
+                bucket['unknown'] += duration
+                continue
+            for name, level in levels.items():
+                level_ms = bucket['ms'].setdefault(name, [])
+                if len(level_ms) <= level:
+                    level_ms.extend([0] * (level + 1 - len(level_ms)))
+                level_ms[level] += duration
+        start_ms = piece_end
+
+def count_transitions(rollups: Dict[str, Any], ts_ms: int, previous: Dict[str, int], levels: Dict[str, int]):
+    """Count the services whose level changed since the previous sample"""
+    for name, level in levels.items():
+        if name in previous and previous[name] != level:
+            for period in PERIODS:
+                transitions = _bucket(rollups, period, ts_ms)['transitions']
+                transitions[name] = transitions.get(name, 0) + 1
+
+def prune_buckets(rollups: Dict[str, Any]):
+    """Drop the oldest buckets beyond each period's retention"""
+    for period, (_, retention) in PERIODS.items():
+        buckets = rollups.get(period, {})
+        for key in sorted(buckets)[:-retention]:
+            del buckets[key]
+
+def availability(bucket: Dict[str, Any], name: str) -> Optional[float]:
+    """Percentage of a bucket's known time that a service spent at level 0"""
+    level_ms = bucket['ms'].get(name)
+    if not level_ms or not sum(level_ms):
+        return None
+    return 100.0 * level_ms[0] / sum(level_ms)
+
+def record_sample(rollups: Dict[str, Any], now_ms: int, levels: Optional[Dict[str, int]],
+                  max_gap_ms: int) -> List[str]:
+    """Fold one run's levels (None when the poll failed) into the rollups
+
+    Returns the keys of the days completed by this sample.
+    """
+    last = rollups.get('last')
+    closed_days = []
+    if last is not None and now_ms > last['ts']:
+        known = last['levels'] is not None and now_ms - last['ts'] <= max_gap_ms
+        accrue(rollups, last['ts'], now_ms, last['levels'] if known else None)
+        if known and levels is not None:
+            count_transitions(rollups, now_ms, last['levels'], levels)
+        day_ms = last['ts']
+        while bucket_key('day', day_ms) != bucket_key('day', now_ms):
+            closed_days.append(bucket_key('day', day_ms))
+            day_ms = (day_ms // (24 * HOUR_MS) + 1) * 24 * HOUR_MS
+        prune_buckets(rollups)
+    rollups['last'] = {'ts': now_ms, 'levels': levels}
+    return closed_days
+
+def daily_metrics(rollups: Dict[str, Any], day: str) -> Dict[str, float]:
+    """<Service>Availability metrics of a completed day"""
+    bucket = rollups.get('day', {}).get(day)
+    if bucket is None:
+        return {}
+    metrics = {}
+    for name in bucket['ms']:
+        value = availability(bucket, name)
+        if value is not None:
+            metrics[f"{name}Availability"] = round(value, 4)
+    return metrics
+
+def summarize(rollups: Dict[str, Any], period: str = 'month', since: Optional[str] = None,
+              until: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Availability, time per level and transitions per service, for each bucket of a period
+
+    since and until are bucket keys (inclusive), e.g. '2026-01' and '2026-12'
+    for a year of monthly SLOs.
+    """
+    rows = []
+    for key, bucket in sorted(rollups.get(period, {}).items()):
+        if (since and key < since) or (until and key > until):
+            continue
+        for name, level_ms in sorted(bucket['ms'].items()):
+            rows.append({
+                'period': period,
+                'bucket': key,
+                'service': name,
+                'availability': availability(bucket, name),
+                'level_ms': level_ms,
+                'transitions': bucket['transitions'].get(name, 0),
+                'unknown_ms': bucket['unknown']
+            })
+    return rows
+
+def total_availability(rollups: Dict[str, Any], name: str, period: str = 'month', since: Optional[str] = None,
+                       until: Optional[str] = None) -> Tuple[Optional[float], int]:
+    """Availability of one service over a range of buckets, and its transition count"""
+    healthy = known = transitions = 0
+    for key, bucket in rollups.get(period, {}).items():
+        if (since and key < since) or (until and key > until):
+            continue
+        level_ms = bucket['ms'].get(name, [])
+        healthy += level_ms[0] if level_ms else 0
+        known += sum(level_ms)
+        transitions += bucket['transitions'].get(name, 0)
+    return (100.0 * healthy / known if known else None), transitions
+
+def update_rollups(provider, metrics: Dict[str, Any], state_store, polling_interval: int,
+                   now_ms: Optional[int] = None, save: bool = True) -> Dict[str, float]:
+    """Record a run's service levels in the provider's rollups and persist them
+
+    Returns the daily availability metrics of any day this run completed.
+    The document is loaded from the state store on a cold start only. With
+    save=False the caller persists it later with save_rollups().
+    """
+    if not rollups_enabled():
+        return {}
+    stage_start = time.time()
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    key = rollup_state_key(provider)
+    try:
+        rollups = _ROLLUPS.get(key)
+        if rollups is None:
+            rollups = _ROLLUPS[key] = state_store.load(key) or {}
+
+        levels = provider.rollup_levels(metrics) if metrics.get('APIResponse') == 200 else None
+        closed_days = record_sample(rollups, now_ms, levels, ROLLUP_GAP_INTERVALS * polling_interval * 60 * 1000)
+        if save:
+            state_store.save(key, rollups)
+
+        if not closed_days:
+            return {}
+        # After a long gap several days close at once; the metrics carry the latest
+        log_json("INFO", "Completed daily availability rollups", provider=provider.name, days=closed_days)
+        return daily_metrics(rollups, closed_days[-1])
+    except Exception as e:
+        _ROLLUPS.pop(key, None)
+        log_json("ERROR", "Failed to update availability rollups", provider=provider.name, error=str(e))
+        return {}
+    finally:
+        record_duration('Rollup', time.time() - stage_start)
+
+def save_rollups(provider, state_store):
+    """Persist the rollups recorded by update_rollups(save=False)"""
+    key = rollup_state_key(provider)
+    rollups = _ROLLUPS.get(key)
+    if rollups is None:
+        return
+    stage_start = time.time()
+    try:
+        state_store.save(key, rollups)
+    except Exception as e:
+        _ROLLUPS.pop(key, None)
+        log_json("ERROR", "Failed to save availability rollups", provider=provider.name, error=str(e))
+    finally:
+        record_duration('Rollup', time.time() - stage_start)
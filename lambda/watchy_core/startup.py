@@ -0,0 +1,36 @@
+"""Cold start timing"""
+import os
+import time
+from typing import Optional
+
+# Set when the package starts importing; the entry point imports it first
+IMPORT_STARTED = time.time()
+_INIT_COMPLETED: Optional[float] = None
+
+def process_start_time() -> Optional[float]:
+    """Wall-clock start of this process, or None where /proc is unavailable
+
+    On Lambda the runtime process starts with the execution environment, so
+    this covers interpreter and runtime start-up as well as our imports.
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def mark_init_complete():
+    """Record the end of module initialisation"""
+    global _INIT_COMPLETED
+    _INIT_COMPLETED = time.time()
+
+def init_duration_ms() -> Optional[int]:
+    """Milliseconds from process start (or package import) to the end of initialisation"""
+    if _INIT_COMPLETED is None:
+        return None
+    started = process_start_time() or IMPORT_STARTED
+    return max(0, int((_INIT_COMPLETED - min(started, IMPORT_STARTED)) * 1000))
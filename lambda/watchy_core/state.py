@@ -0,0 +1,247 @@
+"""Persisted state stores and incident cursors
+
+Incident cursors are kept in a small JSON document per provider. The backend is
+selected per stack: a local file (warm container only), a DynamoDB table or an
+S3 object, so the index survives cold starts when a durable backend is used.
+
+Every backend can also save conditionally on the version a document was loaded
+with (a DynamoDB version attribute, the S3 ETag, the file's digest), which is
+how a run claims a provider's cursors before publishing its logs.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from .clients import get_boto3_client
+
+class StateConflictError(Exception):
+    """A state document was saved by someone else since it was loaded"""
+
+class StateStore:
+    """Load and save JSON state documents by key"""
+
+    def load(self, key: str) -> Dict[str, Any]:
+        return self.load_versioned(key)[0]
+
+    def load_versioned(self, key: str) -> Tuple[Dict[str, Any], Any]:
+        """Load a document and its version for save_if_unchanged(); a missing document's version is None"""
+        raise NotImplementedError
+
+    def save(self, key: str, state: Dict[str, Any]):
+        raise NotImplementedError
+
+    def save_if_unchanged(self, key: str, state: Dict[str, Any], version: Any) -> Any:
+        """Save a document unless it changed since it was loaded at version; return the new version
+
+        Raises StateConflictError when another writer saved it in between.
+        """
+        raise NotImplementedError
+
+class FileStateStore(StateStore):
+    """State documents stored as JSON files in a local directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def load_versioned(self, key: str) -> Tuple[Dict[str, Any], Any]:
+        data = self._read(key)
+        if data is None:
+            return {}, None
+        return json.loads(data.decode('utf-8')), hashlib.sha256(data).hexdigest()
+
+    def save(self, key: str, state: Dict[str, Any]):
+        self._write(key, state)
+
+    def save_if_unchanged(self, key: str, state: Dict[str, Any], version: Any) -> Any:
+        # Check-then-replace is not atomic, but a container runs one invocation at
+        # a time and this directory is its own
+        data = self._read(key)
+        if (None if data is None else hashlib.sha256(data).hexdigest()) != version:
+            raise StateConflictError(f"{key} changed since it was loaded")
+        return hashlib.sha256(self._write(key, state)).hexdigest()
+
+    def _write(self, key: str, state: Dict[str, Any]) -> bytes:
+        data = json.dumps(state, separators=(',', ':')).encode('utf-8')
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        return data
+
+class DynamoDBStateStore(StateStore):
+    """State documents stored as items in a DynamoDB table keyed by state_key
+
+    Conditional saves count up a numeric version attribute; items written
+    without one (plain saves, older releases) are at version 0.
+    """
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+
+    def load_versioned(self, key: str) -> Tuple[Dict[str, Any], Any]:
+        response = get_boto3_client('dynamodb').get_item(
+            TableName=self.table_name,
+            Key={'state_key': {'S': key}},
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        if not item:
+            return {}, None
+        return json.loads(item['state']['S']), int(item.get('version', {}).get('N', '0'))
+
+    def _item(self, key: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'state_key': {'S': key},
+            'state': {'S': json.dumps(state, separators=(',', ':'))},
+            'updated_at': {'S': datetime.now(timezone.utc).isoformat()}
+        }
+
+    def save(self, key: str, state: Dict[str, Any]):
+        get_boto3_client('dynamodb').put_item(TableName=self.table_name, Item=self._item(key, state))
+
+    def save_if_unchanged(self, key: str, state: Dict[str, Any], version: Any) -> Any:
+        new_version = (version or 0) + 1
+        if version is None:
+            condition, values = 'attribute_not_exists(state_key)', {}
+        elif version == 0:
+            condition, values = 'attribute_not_exists(#version)', {}
+        else:
+            condition, values = '#version = :version', {':version': {'N': str(version)}}
+        params = {
+            'TableName': self.table_name,
+            'Item': {**self._item(key, state), 'version': {'N': str(new_version)}},
+            'ConditionExpression': condition
+        }
+        if version is not None:
+            params['ExpressionAttributeNames'] = {'#version': 'version'}  # A reserved word
+        if values:
+            params['ExpressionAttributeValues'] = values
+
+        dynamodb = get_boto3_client('dynamodb')
+        try:
+            dynamodb.put_item(**params)
+        except dynamodb.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                raise StateConflictError(f"{key} changed since version {version}") from e
+            raise
+        return new_version
+
+class S3StateStore(StateStore):
+    """State documents stored as JSON objects under an S3 prefix"""
+
+    def __init__(self, bucket: str, prefix: str = 'watchy-state/'):
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def load_versioned(self, key: str) -> Tuple[Dict[str, Any], Any]:
+        s3 = get_boto3_client('s3')
+        try:
+            response = s3.get_object(Bucket=self.bucket, Key=f"{self.prefix}{key}.json")
+        except s3.exceptions.ClientError as e:
+            # Without s3:ListBucket a missing object is reported as AccessDenied
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', 'AccessDenied'):
+                return {}, None
+            raise
+        return json.loads(response['Body'].read().decode('utf-8')), response.get('ETag')
+
+    def _put(self, key: str, state: Dict[str, Any], **conditions) -> Dict[str, Any]:
+        return get_boto3_client('s3').put_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{key}.json",
+            Body=json.dumps(state, separators=(',', ':')).encode('utf-8'),
+            ContentType='application/json',
+            **conditions
+        )
+
+    def save(self, key: str, state: Dict[str, Any]):
+        self._put(key, state)
+
+    def save_if_unchanged(self, key: str, state: Dict[str, Any], version: Any) -> Any:
+        # S3 conditional writes: If-None-Match creates only, If-Match replaces only
+        # the object with that ETag
+        s3 = get_boto3_client('s3')
+        try:
+            response = self._put(key, state, **({'IfNoneMatch': '*'} if version is None else {'IfMatch': version}))
+        except s3.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise StateConflictError(f"{key} changed since it was loaded") from e
+            raise
+        return response.get('ETag')
+
+def get_state_store() -> StateStore:
+    """Build the state store selected by WATCHY_STATE_BACKEND / WATCHY_STATE_LOCATION"""
+    backend = os.getenv('WATCHY_STATE_BACKEND', 'file').lower()
+    location = os.getenv('WATCHY_STATE_LOCATION', '')
+
+    if backend == 'dynamodb':
+        return DynamoDBStateStore(location or 'watchy-state')
+    if backend == 's3':
+        bucket, _, prefix = location.partition('/')
+        return S3StateStore(bucket, f"{prefix.strip('/')}/" if prefix else 'watchy-state/')
+    return FileStateStore(location or '/tmp/watchy-state')
+
+# Cursors of incidents that dropped out of the payload are kept for a while so a
+# briefly missing incident is not republished when it comes back
+CURSOR_RETENTION_MS = 7 * 24 * 60 * 60 * 1000
+
+def claim_cursor_state(state_store: StateStore, key: str) -> Tuple[Dict[str, Any], Any]:
+    """Load a provider's cursors and claim them until this run has published its logs
+
+    The claim is a conditional save of the document with a claimed_until time
+    (the function timeout ahead, so a run that died holds it for at most one
+    invocation). Of two overlapping runs only one gets it; the other, and any
+    run while an unexpired claim is held, gets StateConflictError. Returns the
+    cursors and the version release_cursor_state() saves them over.
+    """
+    cursor_state, version = state_store.load_versioned(key)
+    now_ms = int(time.time() * 1000)
+    claimed_until = cursor_state.get('claimed_until', 0)
+    if claimed_until > now_ms:
+        raise StateConflictError(f"{key} is claimed by another run for {claimed_until - now_ms} ms")
+    cursor_state['claimed_until'] = now_ms + int(os.getenv('WATCHY_TIMEOUT_SECONDS', '240')) * 1000
+    return cursor_state, state_store.save_if_unchanged(key, cursor_state, version)
+
+def release_cursor_state(state_store: StateStore, key: str, cursor_state: Dict[str, Any], version: Any):
+    """Save the advanced cursors and drop the claim; StateConflictError if the claim was lost meanwhile"""
+    cursor_state.pop('claimed_until', None)
+    state_store.save_if_unchanged(key, cursor_state, version)
+
+def is_after_cursor(cursor: Dict[str, Any], item_ms: int, item_id: str) -> bool:
+    """Check if an item sorts after an incident's high-water mark"""
+    if item_ms != cursor['ts']:
+        return item_ms > cursor['ts']
+    return item_id not in cursor['ids']
+
+def advance_cursor(cursors: Dict[str, Dict[str, Any]], incident_key: str, item_ms: int, item_id: str):
+    """Move an incident's high-water mark forward to include an item"""
+    cursor = cursors.get(incident_key)
+    if cursor is None or item_ms > cursor['ts']:
+        cursors[incident_key] = {'ts': item_ms, 'ids': [item_id], 'seen': int(time.time() * 1000)}
+    elif item_ms == cursor['ts'] and item_id not in cursor['ids']:
+        cursor['ids'].append(item_id)
+
+def prune_cursors(cursor_state: Dict[str, Any], incident_ids: List[Any]):
+    """Mark incidents in the current payload as seen and drop long-gone ones"""
+    now_ms = int(time.time() * 1000)
+    cursors = cursor_state.setdefault('incidents', {})
+    for incident_id in incident_ids:
+        cursor = cursors.get(str(incident_id))
+        if cursor is not None:
+            cursor['seen'] = now_ms
+    for incident_key in [k for k, c in cursors.items() if now_ms - c.get('seen', 0) > CURSOR_RETENTION_MS]:
+        del cursors[incident_key]
+    cursor_state['last_poll'] = now_ms
@@ -0,0 +1,117 @@
+"""Text and timestamp helpers shared by all providers"""
+import html
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from .log import log_json
+
+# Tags that end a line of text; every other tag is dropped
+_LINE_BREAK_TAGS = frozenset(['br'] + [prefix + name for prefix in ('', '/')
+                                       for name in ('p', 'div', 'li', 'ul', 'ol', 'tr', 'table',
+                                                    'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')])
+_NBSP = r'&(?:nbsp|#0*160|#[xX]0*[aA]0);?'
+_ENTITY = r'&(?:[^\s<&#;]{1,32}|#[0-9]+|#[xX][0-9a-fA-F]+);?'
+# Every space but ' ' itself, which starts a run only when more follows, so the
+# single spaces between words are never matched
+_RUN_START_SPACES = '|'.join(re.escape(c) for c in map(chr, range(0x3001)) if c.isspace() and c != ' ')
+# One run of markup: a tag, entity or whitespace followed by any further tags,
+# whitespace and &nbsp;. Each alternative starts with a literal character so
+# the scan can skip plain text without entering the pattern
+_HTML_RUN_RE = re.compile(r'((?:<[^>]+>|' + _ENTITY + r'| (?=[\s<&])|' + _RUN_START_SPACES + r')'
+                          r'(?:<[^>]+>|\s|' + _NBSP + r')*+)')
+_HTML_RUN_PART_RE = re.compile(r'<(/?[a-zA-Z]\w*)?[^>]*>|(' + _NBSP + r'|\s+)|(' + _ENTITY + r')')
+
+# Runs longer than this are cleaned on every call instead of being kept
+HTML_RUN_CACHE_MAX_CHARS = 256
+HTML_RUN_CACHE_SIZE = 4096
+
+class _HtmlRuns(dict):
+    """What each markup run becomes in the plain text, keyed by the run
+
+    Status pages render every note from the same templates, so a body is made
+    of a few dozen distinct runs ('</b> ', '&amp; ', '</p>\n<ul><li>') repeated
+    through it and through the next body. Emptied when it reaches
+    HTML_RUN_CACHE_SIZE, so runs unique to one note cannot fill it for good.
+    """
+    def __missing__(self, run: str) -> str:
+        text = ''
+        separator = ''
+        for tag, space, entity in _HTML_RUN_PART_RE.findall(run):
+            if entity:
+                text = html.unescape(entity)
+            elif space:
+                separator = separator or ' '
+            elif tag and tag.lower() in _LINE_BREAK_TAGS:
+                separator = '\n'
+        if len(run) <= HTML_RUN_CACHE_MAX_CHARS:
+            if len(self) >= HTML_RUN_CACHE_SIZE:
+                self.clear()
+            self[run] = text + separator
+        return text + separator
+
+_HTML_RUNS = _HtmlRuns()
+
+def strip_html_tags(html_string: str) -> str:
+    """Convert an HTML incident body to plain text
+
+    Tags are removed, <br> and block-level tags become line breaks, named and
+    numeric entities are decoded and whitespace is collapsed, in one scan of
+    the body: it is split into plain text and markup runs, and each run is
+    replaced by its entity text followed by a line break, a space or nothing.
+    """
+    if not html_string:
+        return ""
+
+    parts = _HTML_RUN_RE.split(html_string)
+    parts[1::2] = map(_HTML_RUNS.__getitem__, parts[1::2])
+    return ''.join(parts).strip()
+
+class TimestampParseError(ValueError):
+    """A status API timestamp that is not a full ISO 8601 date and time"""
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MILLISECOND = timedelta(milliseconds=1)
+
+@lru_cache(maxsize=4096)
+def parse_timestamp_ms(date_string: str) -> int:
+    """Parse a status API ISO 8601 timestamp to epoch milliseconds
+
+    Values without an offset are taken as UTC. Anything that is not a full
+    date and time raises TimestampParseError rather than being guessed at.
+    Results are cached, because open incidents present the same note dates
+    on every poll.
+    """
+    # Date-only values parse as midnight, which would misplace the item in time
+    if not isinstance(date_string, str) or len(date_string) <= 10:
+        raise TimestampParseError(f"Not an ISO 8601 date and time: {date_string!r}")
+    try:
+        parsed = datetime.fromisoformat(date_string)
+    except ValueError as e:
+        raise TimestampParseError(str(e)) from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - EPOCH) // _MILLISECOND
+
+def format_timestamp_ms(timestamp_ms: int) -> str:
+    """Format epoch milliseconds as a UTC ISO 8601 string"""
+    return (EPOCH + timedelta(milliseconds=timestamp_ms)).isoformat()
+
+def is_within_polling_interval(item_time_ms: int, polling_interval_minutes: float = 5) -> bool:
+    """Check if an incident item timestamp (epoch milliseconds) is within the last polling interval"""
+    now_ms = int(time.time() * 1000)
+    cutoff_ms = now_ms - polling_interval_minutes * 60 * 1000
+    within_interval = item_time_ms >= cutoff_ms
+
+    # Debug logging to help diagnose time filtering issues; fields are built lazily
+    # because this runs once per incident item
+    log_json("DEBUG", "Time interval check",
+            item_time_utc=lambda: format_timestamp_ms(item_time_ms),
+            now_utc=lambda: format_timestamp_ms(now_ms),
+            cutoff_time=lambda: format_timestamp_ms(cutoff_ms),
+            time_diff_minutes=lambda: round((now_ms - item_time_ms) / 60000, 2),
+            polling_interval_minutes=polling_interval_minutes,
+            within_interval=within_interval)
+
+    return within_interval
@@ -0,0 +1,90 @@
+"""Per-stage timing and counters for one provider run, published as metrics"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# The timer of the provider run executing on each thread; fan-out workers and
+# the handler thread each activate the timer of the provider they work on
+_ACTIVE = threading.local()
+
+class StageTimer:
+    """Collects stage durations and counters for one provider run
+
+    Stages are named in metric form (Fetch, Decode, ...) and published as
+    <Stage>Duration in milliseconds; counters are published under their own
+    name. Repeated spans of the same stage accumulate.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage: str, seconds: float):
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def maximum(self, name: str, value: int):
+        """Keep the largest value reported under a counter name this run"""
+        self.counters[name] = max(self.counters.get(name, value), value)
+
+    @contextmanager
+    def active(self) -> Iterator['StageTimer']:
+        """Make this the timer that span() and count() report to on the current thread"""
+        previous = getattr(_ACTIVE, 'timer', None)
+        _ACTIVE.timer = self
+        try:
+            yield self
+        finally:
+            _ACTIVE.timer = previous
+
+    def metrics(self) -> Dict[str, float]:
+        metrics = {f"{stage}Duration": round(seconds * 1000, 3) for stage, seconds in self.durations.items()}
+        metrics.update(self.counters)
+        return metrics
+
+def current_timer() -> Optional[StageTimer]:
+    return getattr(_ACTIVE, 'timer', None)
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a stage against the active timer; a no-op when no timer is active"""
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    with timer.span(stage):
+        yield
+
+def record_duration(stage: str, seconds: float):
+    """Add a stage duration measured by the caller to the active timer, if any"""
+    timer = current_timer()
+    if timer is not None:
+        timer.record(stage, seconds)
+
+def count(name: str, value: int = 1):
+    """Add to a counter of the active timer, if any"""
+    timer = current_timer()
+    if timer is not None:
+        timer.count(name, value)
+
+def maximum(name: str, value: int):
+    """Report a value to the active timer, keeping the run's largest, if any"""
+    timer = current_timer()
+    if timer is not None:
+        timer.maximum(name, value)
+
+def run_with_timer(timer: StageTimer, func, *args, **kwargs):
+    """Call func with the timer active, e.g. as the target of a thread pool task"""
+    with timer.active():
+        return func(*args, **kwargs)
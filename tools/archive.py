@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Browse and replay the raw status snapshots the monitoring functions archive
+
+The functions archive every changed payload when WATCHY_ARCHIVE_BACKEND is
+file or s3 (see watchy_core/archive.py). --archive is the directory or an
+s3://bucket/prefix URL (S3 needs boto3 and AWS credentials with
+s3:ListBucket and s3:GetObject). A range holds the snapshots in effect
+during it: those fetched in the range plus the one before it.
+
+Usage:
+    python tools/archive.py list --archive s3://my-state-bucket/watchy-archive --provider slack --since 2026-10-01
+    python tools/archive.py show --archive archive/ --provider github --at 2026-10-12T14:05
+    python tools/archive.py metrics --archive archive/ --provider slack --since 2026-10-01 --changes
+    python tools/archive.py replay --archive archive/ --provider github --since 2026-10-01 --loops 5
+    python tools/archive.py scenario --archive archive/ --provider slack --since 2026-10-12 -o incident.json
+
+metrics runs every snapshot through the provider's parsing only and prints
+the metric values an alarm would have seen; replay serves the snapshots
+one after the other to the full handler (tools/standin.py) with fake AWS
+clients, as fast as it runs. Times are ISO dates or timestamps (naive
+values are UTC).
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'lambda'))
+
+from watchy_core.archive import SnapshotArchive, parse_archive_location  # noqa: E402
+from watchy_core.text import format_timestamp_ms  # noqa: E402
+
+from history import parse_time_ms  # noqa: E402
+from standin import provider_for, run_replays  # noqa: E402
+
+def open_archive(location: str) -> SnapshotArchive:
+    """Archive at a directory or s3://bucket/prefix URL"""
+    if location.startswith('s3://'):
+        return parse_archive_location('s3', location[len('s3://'):])
+    return parse_archive_location('file', location)
+
+def snapshot_range(archive: SnapshotArchive, provider_name: str, since: Optional[str],
+                   until: Optional[str]) -> List[Tuple[int, str]]:
+    return archive.snapshots(provider_name, parse_time_ms(since), parse_time_ms(until))
+
+def load_payloads(archive: SnapshotArchive, entries: List[Tuple[int, str]]):
+    """Yield (fetch time, digest, decoded payload), reading each blob once"""
+    cache: Dict[str, Any] = {}
+    for fetched_ms, digest in entries:
+        if digest not in cache:
+            cache.clear()  # Only consecutive repeats are worth keeping
+            cache[digest] = json.loads(archive.load(digest).decode('utf-8'))
+        yield fetched_ms, digest, cache[digest]
+
+def build_scenario(archive: SnapshotArchive, provider_name: str, since: Optional[str],
+                   until: Optional[str]) -> Dict[str, Any]:
+    """A tools/standin.py scenario with one step per distinct consecutive snapshot"""
+    steps = []
+    last_digest = None
+    for fetched_ms, digest, payload in load_payloads(archive, snapshot_range(archive, provider_name, since, until)):
+        if digest != last_digest:
+            steps.append({'note': f"archived {format_timestamp_ms(fetched_ms)} {digest[:12]}", 'payload': payload})
+            last_digest = digest
+    return {
+        'name': f"archive-{provider_name}",
+        'provider': provider_name,
+        'description': f"Archived snapshots from {archive.location}",
+        'steps': steps
+    }
+
+def metric_timeline(archive: SnapshotArchive, provider_name: str, since: Optional[str], until: Optional[str],
+                    changes: bool) -> Dict[str, Any]:
+    """Parse every snapshot of a range and return its metrics, or only the values that changed"""
+    provider = provider_for(provider_name, '')
+    entries = snapshot_range(archive, provider_name, since, until)
+    rows = []
+    last: Dict[str, Any] = {}
+    parse_seconds = 0.0
+    for fetched_ms, digest, payload in load_payloads(archive, entries):
+        start = time.perf_counter()
+        incidents = provider.incidents(payload)
+        metrics = provider.metrics(payload, incidents)
+        parse_seconds += time.perf_counter() - start
+        shown = {name: value for name, value in metrics.items() if last.get(name) != value} if changes else metrics
+        last = metrics
+        if shown or not changes:
+            rows.append({
+                'time': format_timestamp_ms(fetched_ms),
+                'digest': digest,
+                'incidents': len(incidents),
+                'metrics': shown
+            })
+    return {
+        'provider': provider_name,
+        'snapshots': len(entries),
+        'snapshots_per_second': round(len(entries) / parse_seconds, 1) if parse_seconds else None,
+        'timeline': rows
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Browse and replay archived status snapshots')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for command, help_text in (('list', 'List the snapshots of a range'),
+                               ('show', 'Print the payload in effect at a time, or with a digest'),
+                               ('metrics', 'Metric values of every snapshot of a range, parsing only'),
+                               ('replay', 'Run the handler once per snapshot of a range'),
+                               ('scenario', 'Write a range as a tools/standin.py scenario')):
+        command_parser = subparsers.add_parser(command, help=help_text)
+        command_parser.add_argument('--archive', required=True, help='Directory or s3://bucket/prefix')
+        command_parser.add_argument('--provider', required=True, help='Provider name, e.g. slack or github')
+        if command == 'show':
+            command_parser.add_argument('--at', help='Time (default: latest snapshot)')
+            command_parser.add_argument('--digest', help='Snapshot digest, as listed')
+            continue
+        command_parser.add_argument('--since', help='Range start (default: everything)')
+        command_parser.add_argument('--until', help='Range end (default: now)')
+        if command == 'metrics':
+            command_parser.add_argument('--changes', action='store_true', help='Only metrics whose value changed')
+        if command == 'replay':
+            command_parser.add_argument('--loops', type=int, default=1, help='Replay this many times for throughput')
+        if command == 'scenario':
+            command_parser.add_argument('-o', '--output')
+
+    args = parser.parse_args(argv)
+    archive = open_archive(args.archive)
+
+    if args.command == 'list':
+        entries = snapshot_range(archive, args.provider, args.since, args.until)
+        print(json.dumps([{'time': format_timestamp_ms(fetched_ms), 'digest': digest}
+                          for fetched_ms, digest in entries], indent=2))
+        return 0
+
+    if args.command == 'show':
+        digest = args.digest
+        if not digest:
+            at_ms = parse_time_ms(args.at) if args.at else int(time.time() * 1000)
+            entries = archive.snapshots(args.provider, at_ms, at_ms + 1)
+            if not entries or entries[0][0] > at_ms:
+                parser.error(f"no {args.provider} snapshot at {args.at or 'present'}")
+            digest = entries[0][1]
+        sys.stdout.write(archive.load(digest).decode('utf-8'))
+        return 0
+
+    if args.command == 'scenario':
+        output = json.dumps(build_scenario(archive, args.provider, args.since, args.until), indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output + '\n')
+        else:
+            print(output)
+        return 0
+
+    os.environ.setdefault('WATCHY_LOG_LEVEL', 'ERROR')
+    if args.command == 'metrics':
+        # The parsers log to stdout; keep it for the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            report = metric_timeline(archive, args.provider, args.since, args.until, args.changes)
+        print(json.dumps(report, indent=2))
+        return 0
+
+    scenario = build_scenario(archive, args.provider, args.since, args.until)
+    if not scenario['steps']:
+        parser.error(f"no {args.provider} snapshots in range")
+    os.environ.setdefault('WATCHY_METRICS_MODE', 'api')
+    os.environ['WATCHY_STATE_BACKEND'] = 'file'
+    os.environ['WATCHY_ARCHIVE_BACKEND'] = 'none'  # Replays must not archive into the archive they read
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_replays(scenario, args.provider, max(1, args.loops), 0)
+    print(json.dumps(report, indent=2))
+    return 0 if report['ok'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
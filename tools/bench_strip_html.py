@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Microbenchmark of strip_html_tags against the previous multi-pass cleaner
+
+Cleans large HTML status-page bodies (the HTML snippet of tools/benchmark.py
+repeated up to ~100 KB) with:
+
+    legacy    the regex + six str.replace + whitespace regex cleaner it replaced
+    cold      strip_html_tags on a fresh copy of the body every call, as each
+              poll decodes one, with the markup runs of earlier bodies known
+    first     strip_html_tags with its table of markup runs emptied before
+              every call, as for the first body of a new container
+
+Usage:
+    python tools/bench_strip_html.py
+    python tools/bench_strip_html.py --sizes 1,10,100 --repeat 200
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TOOLS_DIR), 'lambda'))
+sys.path.insert(0, TOOLS_DIR)
+
+from benchmark import html_body  # noqa: E402
+from watchy_core import text  # noqa: E402
+from watchy_core.text import strip_html_tags  # noqa: E402
+
+def legacy_strip_html_tags(html_string: str) -> str:
+    """The cleaner strip_html_tags replaced, kept for comparison"""
+    if not html_string:
+        return ""
+    clean = re.sub(r'<[^>]+>', '', html_string)
+    clean = clean.replace('&nbsp;', ' ')
+    clean = clean.replace('&amp;', '&')
+    clean = clean.replace('&lt;', '<')
+    clean = clean.replace('&gt;', '>')
+    clean = clean.replace('&quot;', '"')
+    clean = clean.replace('&#39;', "'")
+    clean = re.sub(r'\s+', ' ', clean.strip())
+    return clean
+
+def large_body(size_kb: int) -> str:
+    """A status-page body of roughly size_kb KiB"""
+    unit = html_body(0, 'Messaging')
+    return unit * max(1, size_kb * 1024 // len(unit))
+
+def time_us(func: Callable[[], Any], repeat: int) -> float:
+    """Median microseconds per call"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+def run(sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for size_kb in sizes:
+        body = large_body(size_kb)
+        # Each poll decodes a fresh copy of the body, whose hash is not computed yet
+        copies = iter([body.encode('utf-8').decode('utf-8') for _ in range(2 * repeat)])
+
+        def first():
+            text._HTML_RUNS.clear()
+            strip_html_tags(next(copies))
+
+        strip_html_tags(body)
+        legacy_us = time_us(lambda: legacy_strip_html_tags(body), repeat)
+        cold_us = time_us(lambda: strip_html_tags(next(copies)), repeat)
+        first_us = time_us(first, repeat)
+        results.append({
+            'body_kb': round(len(body) / 1024, 1),
+            'legacy_us': round(legacy_us, 1),
+            'cold_us': round(cold_us, 1),
+            'first_us': round(first_us, 1),
+            'cold_speedup': round(legacy_us / cold_us, 2),
+            'first_speedup': round(legacy_us / first_us, 2)
+        })
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Microbenchmark strip_html_tags against the legacy cleaner')
+    parser.add_argument('--sizes', default='1,10,100', help='Comma-separated body sizes in KiB')
+    parser.add_argument('--repeat', type=int, default=100, help='Timed calls per case (median is reported)')
+    args = parser.parse_args(argv)
+
+    results = run([int(size) for size in args.sizes.split(',') if size], max(1, args.repeat))
+    for result in results:
+        print(f"{result['body_kb']:>7.1f} KB  legacy {result['legacy_us']:>9.1f} us  "
+              f"cold {result['cold_us']:>9.1f} us ({result['cold_speedup']}x)  "
+              f"first {result['first_us']:>9.1f} us ({result['first_speedup']}x)", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Offline benchmarks of the parse-and-publish pipeline
+
+Builds synthetic Slack and GitHub status payloads (up to 1,000 incidents with
+up to 500 HTML-heavy notes or updates each) and measures each stage against
+the local stand-ins in tools/standin.py:
+
+    parse         parse_slack_services / parse_github_incidents, incident normalization included
+    strip_html    strip_html_tags over every note or update body
+    publish_logs  publish_incident_logs of the normalized incidents with a fake CloudWatch Logs client
+    handler       run_monitor end to end against a local status server
+
+Every (provider, stage, size) case runs in its own interpreter, so its peak
+RSS is not inflated by earlier cases. Wall time is the median of --repeat
+runs; allocations are the tracemalloc peak and net retained bytes of one
+extra run.
+
+The --baseline gate is meant to work against a baseline saved on another
+machine: every case process also times a fixed calibration workload, and
+wall times are compared as wall_ratio, the fastest run of a case over the
+median calibration time of the whole run (a single case's calibration is
+too noisy on a shared machine). Allocation peaks are compared as they are, but only when
+the baseline was saved with the same Python minor version, since object
+sizes change between releases. Only allocation regressions fail the gate by
+default; wall ratio regressions are reported as warnings unless --gate-wall
+is given, because single cases still vary by half on noisy CI runners.
+
+When the strip_html stage runs, the report also carries the cold speedup of
+strip_html_tags over the cleaner it replaced (tools/bench_strip_html.py).
+Both are timed in the same process, so the ratio holds across machines, and
+the gate fails when it drops below STRIP_HTML_MIN_SPEEDUP.
+
+Usage:
+    python tools/benchmark.py                                 # quick profile, JSON to stdout
+    python tools/benchmark.py --profile full -o results.json
+    python tools/benchmark.py --baseline tools/benchmark_baseline.json  # exit 1 on regression
+    python tools/benchmark.py --baseline tools/benchmark_baseline.json --gate-wall
+    python tools/benchmark.py --save-baseline tools/benchmark_baseline.json
+"""
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'lambda'))
+sys.path.insert(0, TOOLS_DIR)
+
+PROVIDERS = ('slack', 'github')
+STAGES = ('parse', 'strip_html', 'publish_logs', 'handler')
+
+# (incidents, notes per incident) grids. The full grid skips cases above
+# --max-items notes in total, which would need several GB of memory
+PROFILES = {
+    'quick': [(0, 0), (10, 10), (100, 10), (10, 100)],
+    'full': [(incidents, notes) for incidents in (0, 1, 10, 100, 1000) for notes in (0, 1, 10, 100, 500)],
+}
+
+SLACK_SERVICES = ["Login/SSO", "Messaging", "Notifications", "Search", "Files", "Huddles", "Workflows"]
+SLACK_TYPES = ('notice', 'incident', 'outage')
+STATUSPAGE_IMPACTS = ('none', 'minor', 'major', 'critical')
+
+HTML_SNIPPET = (
+    '<p>We are <b>investigating</b> reports of degraded performance &amp; elevated error rates '
+    'for <a href="https://status.example.com/incidents/{i}">{service}</a>.&nbsp;Next update in '
+    '30&nbsp;minutes.</p>\n<ul><li>Region: <code>us-east-1</code></li>'
+    '<li>Impact: &lt;5% of requests&gt; &quot;timeouts&quot;</li></ul>\n'
+)
+
+# Number of calibration runs per case; the fastest is used
+CALIBRATION_REPEAT = 5
+
+# Body sizes (KiB) and timed calls per size of the strip_html speedup check
+STRIP_HTML_SIZES_KB = (1, 10, 100)
+STRIP_HTML_REPEAT = 50
+# strip_html_tags must stay at least this much faster than the cleaner it replaced
+STRIP_HTML_MIN_SPEEDUP = 1.0
+
+def calibration_workload():
+    """A fixed pure-Python workload like the pipeline's: JSON round trips, regex and dict building"""
+    document = {'items': [{'id': i, 'body': HTML_SNIPPET, 'tags': ['notice', 'update']} for i in range(200)]}
+    for _ in range(20):
+        decoded = json.loads(json.dumps(document))
+        re.sub(r'<[^>]+>', '', decoded['items'][0]['body'] * 50)
+        sorted((item['id'], len(item['body'])) for item in decoded['items'])
+
+def calibration_ms() -> float:
+    """The fastest of CALIBRATION_REPEAT timed runs of the calibration workload"""
+    calibration_workload()  # Warm up
+    runs = []
+    for _ in range(CALIBRATION_REPEAT):
+        start = time.perf_counter()
+        calibration_workload()
+        runs.append((time.perf_counter() - start) * 1000)
+    return min(runs)
+
+def html_body(i: int, service: str) -> str:
+    """An HTML-heavy note body of roughly 700 bytes"""
+    return HTML_SNIPPET.format(i=i, service=service) * 2
+
+def iso(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def slack_payload(incidents: int, notes: int) -> Dict[str, Any]:
+    """A Slack status API document with the given number of active incidents and notes"""
+    now = datetime.now(timezone.utc)
+    return {
+        'status': 'active' if incidents else 'ok',
+        'date_updated': iso(now),
+        'active_incidents': [{
+            'id': 1000 + i,
+            'date_created': iso(now - timedelta(hours=1)),
+            'date_updated': iso(now),
+            'title': f"Synthetic incident {i}",
+            'type': SLACK_TYPES[i % len(SLACK_TYPES)],
+            'status': 'active',
+            'url': f"https://status.slack.com/incidents/{1000 + i}",
+            'services': [SLACK_SERVICES[i % len(SLACK_SERVICES)], SLACK_SERVICES[(i + 3) % len(SLACK_SERVICES)]],
+            'notes': [{
+                'date_created': iso(now - timedelta(seconds=j)),
+                'body': html_body(j, SLACK_SERVICES[i % len(SLACK_SERVICES)])
+            } for j in range(notes)]
+        } for i in range(incidents)]
+    }
+
+def github_payload(incidents: int, updates: int) -> Dict[str, Any]:
+    """A GitHub Statuspage summary.json document with the given number of incidents and updates"""
+    from watchy_core.providers.github import GITHUB_COMPONENTS
+
+    now = datetime.now(timezone.utc)
+    return {
+        'page': {'id': 'synthetic', 'name': 'GitHub', 'updated_at': iso(now)},
+        'status': {'indicator': 'major' if incidents else 'none', 'description': 'Synthetic'},
+        'components': [{
+            'id': f"component-{c}",
+            'name': name,
+            'status': 'degraded_performance' if incidents and c % 3 == 0 else 'operational'
+        } for c, name in enumerate(GITHUB_COMPONENTS)],
+        'incidents': [{
+            'id': f"incident-{i}",
+            'name': f"Synthetic incident {i}",
+            'status': 'investigating',
+            'impact': STATUSPAGE_IMPACTS[i % len(STATUSPAGE_IMPACTS)],
+            'shortlink': f"https://stspg.io/{i}",
+            'created_at': iso(now - timedelta(hours=1)),
+            'updated_at': iso(now),
+            'components': [{'name': GITHUB_COMPONENTS[i % len(GITHUB_COMPONENTS)], 'status': 'partial_outage'}],
+            'incident_updates': [{
+                'id': f"update-{i}-{j}",
+                'status': 'investigating',
+                'body': html_body(j, GITHUB_COMPONENTS[i % len(GITHUB_COMPONENTS)]),
+                'created_at': iso(now - timedelta(seconds=j))
+            } for j in range(updates)]
+        } for i in range(incidents)],
+        'scheduled_maintenances': []
+    }
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def build_stage(provider_name: str, stage: str, payload: Dict[str, Any]):
+    """Return (setup, run) callables for one stage; setup's result is passed to run and not timed"""
+    from standin import StatusServer, install_fake_clients
+    from watchy_core import run_monitor
+    from watchy_core.logs import publish_incident_logs
+    from watchy_core.providers.github import GitHubProvider, parse_github_incidents
+    from watchy_core.providers.slack import SlackProvider, parse_slack_services
+    from watchy_core.text import strip_html_tags
+
+    provider_class = SlackProvider if provider_name == 'slack' else GitHubProvider
+    provider = provider_class()
+
+    if stage == 'parse':
+        parse = parse_slack_services if provider_name == 'slack' else parse_github_incidents
+        return (lambda: None), (lambda _: parse(payload))
+
+    if stage == 'strip_html':
+        bodies = [item.body for incident in provider.incidents(payload) for item in incident.items]
+        return (lambda: None), (lambda _: [strip_html_tags(body) for body in bodies])
+
+    if stage == 'publish_logs':
+        install_fake_clients(('logs',), record=False)
+        incidents = provider.incidents(payload)
+        return (lambda: None), (lambda _: publish_incident_logs(provider, incidents, ignore_cursor=True))
+
+    if stage == 'handler':
+        install_fake_clients(('logs', 'cloudwatch'), record=False)
+        server = StatusServer(payload).__enter__()
+        state_root = tempfile.mkdtemp(prefix='watchy-bench-')
+        atexit.register(shutil.rmtree, state_root, True)
+        runs = iter(range(1 << 30))
+
+        def setup():
+            # A fresh state directory and URL per run, so neither the cursors nor the
+            # conditional GET cache turn later runs into no-ops
+            run_id = next(runs)
+            os.environ['WATCHY_STATE_LOCATION'] = os.path.join(state_root, str(run_id))
+            return provider_class(api_url=f"{server.url}?run={run_id}")
+
+        def run(run_provider):
+            response = run_monitor(run_provider)
+            if response['statusCode'] != 200:
+                raise RuntimeError(response['body'])
+
+        return setup, run
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+def measure_case(provider_name: str, stage: str, incidents: int, notes: int, repeat: int) -> Dict[str, Any]:
+    """Run one case in this process and return its measurements"""
+    payload = (slack_payload if provider_name == 'slack' else github_payload)(incidents, notes)
+    setup, run = build_stage(provider_name, stage, payload)
+
+    gc.collect()
+    calibration = calibration_ms()
+    rss_before = peak_rss_kb()
+    wall_ms = []
+    for _ in range(repeat):
+        prepared = setup()
+        start = time.perf_counter()
+        run(prepared)
+        wall_ms.append((time.perf_counter() - start) * 1000)
+    rss_after = peak_rss_kb()
+
+    # Allocation tracing slows everything down, so it gets its own run
+    prepared = setup()
+    gc.collect()
+    tracemalloc.start()
+    baseline_bytes, _ = tracemalloc.get_traced_memory()
+    run(prepared)
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'provider': provider_name,
+        'stage': stage,
+        'incidents': incidents,
+        'notes': notes,
+        'repeat': repeat,
+        'wall_ms': round(statistics.median(wall_ms), 3),
+        'wall_ms_min': round(min(wall_ms), 3),
+        'calibration_ms': round(calibration, 3),
+        'alloc_peak_kb': round((peak_bytes - baseline_bytes) / 1024, 1),
+        'alloc_net_kb': round((current_bytes - baseline_bytes) / 1024, 1),
+        'rss_peak_kb': rss_after,
+        'rss_growth_kb': rss_after - rss_before
+    }
+
+def run_case(provider_name: str, stage: str, incidents: int, notes: int, repeat: int) -> Dict[str, Any]:
+    """Run one case in a child interpreter so its peak RSS is its own"""
+    env = dict(os.environ,
+               WATCHY_LOG_LEVEL='ERROR',
+               WATCHY_LOG_DEBUG_SAMPLE='0',
+               WATCHY_METRICS_MODE='api',
+               WATCHY_METRICS_DELTA='false',
+               WATCHY_STATE_BACKEND='file',
+               DEBUG_DISABLE_TIME_FILTER='true')
+    case = json.dumps([provider_name, stage, incidents, notes, repeat])
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', case],
+                               env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Case {case} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def case_key(result: Dict[str, Any]) -> Tuple[str, str, int, int]:
+    return result['provider'], result['stage'], result['incidents'], result['notes']
+
+def python_minor(version: str) -> str:
+    return '.'.join(version.split('.')[:2])
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float,
+                        alloc_tolerance: float, min_ms: float) -> List[Dict[str, Any]]:
+    """Return the cases whose wall ratio or allocation peak regressed beyond the tolerances
+
+    Wall times below min_ms in both runs are ignored as noise, and so are
+    allocation peaks when the baseline comes from another Python minor version.
+    """
+    previous = {case_key(result): result for result in baseline.get('results', [])}
+    same_python = python_minor(baseline.get('python', '')) == python_minor(platform.python_version())
+    regressions = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None:
+            continue
+        checks = []
+        if same_python:
+            checks.append(('alloc_peak_kb', alloc_tolerance, 1))
+        if 'wall_ratio' in before and max(result['wall_ms'], before['wall_ms']) >= min_ms:
+            checks.append(('wall_ratio', tolerance, 0))
+        for field, allowed, min_change in checks:
+            limit = before[field] * (1 + allowed)
+            if result[field] > limit and result[field] - before[field] > min_change:
+                regressions.append({
+                    'case': '/'.join(str(part) for part in case_key(result)),
+                    'field': field,
+                    'baseline': before[field],
+                    'current': result[field],
+                    'change': round(result[field] / before[field] - 1, 3) if before[field] else None
+                })
+    return regressions
+
+def compare_strip_html(speedups: List[Dict[str, Any]], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the body sizes where strip_html_tags is no longer faster than the legacy cleaner"""
+    previous = {result['body_kb']: result for result in baseline.get('strip_html_speedups', [])}
+    return [{
+        'case': f"strip_html/{result['body_kb']}KB",
+        'field': 'cold_speedup',
+        'baseline': previous.get(result['body_kb'], {}).get('cold_speedup'),
+        'current': result['cold_speedup'],
+        'change': None
+    } for result in speedups if result['cold_speedup'] < STRIP_HTML_MIN_SPEEDUP]
+
+def print_table(results: List[Dict[str, Any]]):
+    """Human readable summary on stderr, so stdout stays pure JSON"""
+    header = f"{'provider':<8} {'stage':<13} {'incidents':>9} {'notes':>6} {'wall ms':>10} {'alloc peak KB':>14} {'rss peak KB':>12}"
+    print(header, file=sys.stderr)
+    print('-' * len(header), file=sys.stderr)
+    for result in results:
+        print(f"{result['provider']:<8} {result['stage']:<13} {result['incidents']:>9} {result['notes']:>6} "
+              f"{result['wall_ms']:>10.2f} {result['alloc_peak_kb']:>14.1f} {result['rss_peak_kb']:>12}",
+              file=sys.stderr)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the Watchy parse-and-publish pipeline offline')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--providers', default=','.join(PROVIDERS), help='Comma-separated providers to run')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stages to run')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case (median is reported)')
+    parser.add_argument('--max-items', type=int, default=100000,
+                        help='Skip cases with more notes or updates in total than this')
+    parser.add_argument('-o', '--output', help='Write the JSON results here instead of stdout')
+    parser.add_argument('--baseline', help='Compare with this results file and exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed relative wall ratio increase over the baseline (default 0.5 = +50%%)')
+    parser.add_argument('--alloc-tolerance', type=float, default=0.1,
+                        help='Allowed relative allocation peak increase over the baseline (default 0.1)')
+    parser.add_argument('--gate-wall', action='store_true',
+                        help='Also exit 1 on wall ratio regressions, not only allocation ones')
+    parser.add_argument('--min-ms', type=float, default=2.0,
+                        help='Ignore wall time changes of cases faster than this')
+    parser.add_argument('--save-baseline', help='Also write the results to this baseline file')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        print(json.dumps(measure_case(*json.loads(args.case))))
+        return 0
+
+    providers = [name for name in args.providers.split(',') if name]
+    stages = [name for name in args.stages.split(',') if name]
+    cases = [(incidents, notes) for incidents, notes in PROFILES[args.profile]
+             if incidents * notes <= args.max_items]
+
+    results = []
+    for provider_name in providers:
+        for stage in stages:
+            for incidents, notes in cases:
+                results.append(run_case(provider_name, stage, incidents, notes, max(1, args.repeat)))
+    calibration = statistics.median(result['calibration_ms'] for result in results) if results else 0.0
+    for result in results:
+        result['wall_ratio'] = round(result['wall_ms_min'] / calibration, 5) if calibration else 0.0
+    print_table(results)
+
+    strip_html_speedups = []
+    if 'strip_html' in stages:
+        import bench_strip_html
+        strip_html_speedups = bench_strip_html.run(list(STRIP_HTML_SIZES_KB), STRIP_HTML_REPEAT)
+        for result in strip_html_speedups:
+            print(f"strip_html {result['body_kb']:>6.1f} KB cold speedup {result['cold_speedup']}x", file=sys.stderr)
+
+    report = {
+        'version': 2,
+        'profile': args.profile,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'calibration_ms': round(calibration, 3),
+        'results': results,
+        'strip_html_speedups': strip_html_speedups
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.alloc_tolerance, args.min_ms)
+        regressions += compare_strip_html(strip_html_speedups, baseline)
+        if python_minor(baseline.get('python', '')) != python_minor(platform.python_version()):
+            print(f"Baseline is from Python {baseline.get('python')}, allocation peaks not compared", file=sys.stderr)
+        report['baseline'] = args.baseline
+        report['regressions'] = regressions
+        gated = [regression for regression in regressions
+                 if args.gate_wall or regression['field'] != 'wall_ratio']
+        for regression in regressions:
+            label = 'REGRESSION' if regression in gated else 'WARNING'
+            print(f"{label} {regression['case']} {regression['field']}: "
+                  f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        if gated:
+            exit_code = 1
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(output + '\n')
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(main())
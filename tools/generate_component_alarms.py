@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Generate the per-component CloudWatch alarms of the GitHub monitoring stack
+
+The alarms are derived from GITHUB_COMPONENTS, the same index the Lambda uses
+to build its component metrics, and written between the BEGIN/END GENERATED
+markers of cloudformation/watchy-monitoring-github.yaml.
+
+Usage:
+    python tools/generate_component_alarms.py          # rewrite the template
+    python tools/generate_component_alarms.py --check  # exit 1 if it is stale
+"""
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'lambda'))
+
+from watchy_core.providers.github import GITHUB_COMPONENTS  # noqa: E402
+from watchy_core.providers.statuspage import component_metric_name  # noqa: E402
+
+TEMPLATE_PATH = os.path.join(REPO_ROOT, 'cloudformation', 'watchy-monitoring-github.yaml')
+BEGIN_MARKER = '  # BEGIN GENERATED COMPONENT ALARMS (tools/generate_component_alarms.py)\n'
+END_MARKER = '  # END GENERATED COMPONENT ALARMS\n'
+
+ALARM_TEMPLATE = """\
+  GitHub{metric}Alarm:
+    Type: AWS::CloudWatch::Alarm
+    Properties:
+      AlarmName: !Sub 'Watchy-GitHub-{metric}-${{AWS::Region}}'
+      AlarmDescription: >-
+        GitHub {name} component - alerts on partial (2) and major outage (3)
+      MetricName: {metric}
+      Namespace: Watchy/GitHub
+      Statistic: Average
+      Period: 300
+      EvaluationPeriods: 1
+      Threshold: 2
+      ComparisonOperator: GreaterThanOrEqualToThreshold
+      TreatMissingData: notBreaching
+      AlarmActions:
+        - !Ref NotificationTopicArn
+"""
+
+def render_alarms() -> str:
+    """Render one alarm resource per indexed GitHub component"""
+    return '\n'.join(ALARM_TEMPLATE.format(metric=component_metric_name(name), name=name)
+                     for name in GITHUB_COMPONENTS)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--check', action='store_true',
+                        help='only verify that the template is up to date')
+    args = parser.parse_args()
+
+    with open(TEMPLATE_PATH) as f:
+        template = f.read()
+
+    if BEGIN_MARKER not in template or END_MARKER not in template:
+        print(f"Generated section markers not found in {TEMPLATE_PATH}")
+        return 1
+
+    head, rest = template.split(BEGIN_MARKER, 1)
+    _, tail = rest.split(END_MARKER, 1)
+    updated = f"{head}{BEGIN_MARKER}{render_alarms()}{END_MARKER}{tail}"
+
+    if updated == template:
+        print("Component alarms are up to date")
+        return 0
+    if args.check:
+        print("Component alarms are stale - run python tools/generate_component_alarms.py")
+        return 1
+
+    with open(TEMPLATE_PATH, 'w') as f:
+        f.write(updated)
+    print(f"Wrote {len(GITHUB_COMPONENTS)} component alarms to {TEMPLATE_PATH}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Query the incident history and availability rollups the monitoring functions maintain
+
+Each provider has its own SQLite file (<provider>.sqlite), written by the
+Lambdas when WATCHY_HISTORY_BACKEND is file or s3. The S3 copies can be
+downloaded with the fetch command (needs boto3 and AWS credentials). The
+availability rollups are the <provider>-rollups.json documents of the state
+store (WATCHY_STATE_LOCATION).
+
+Usage:
+    python tools/history.py fetch my-state-bucket/watchy-history --provider slack github -o history/
+    python tools/history.py summary --db history/slack.sqlite --since 2026-07-01 --until 2026-10-01
+    python tools/history.py summary --db history/github.sqlite --by-service
+    python tools/history.py incidents --db history/slack.sqlite --service Messaging --since 2026-09-01
+    python tools/history.py slo --rollups slack-rollups.json --period month --since 2026-01 --until 2026-12
+
+Times are ISO dates or timestamps (naive values are UTC); durations in the
+output are milliseconds.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'lambda'))
+
+from watchy_core.history import IncidentHistory  # noqa: E402
+from watchy_core.rollups import PERIODS, summarize, total_availability  # noqa: E402
+from watchy_core.text import format_timestamp_ms  # noqa: E402
+
+def parse_time_ms(value: Optional[str]) -> Optional[int]:
+    """Epoch milliseconds of an ISO date or timestamp argument"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+def fetch(location: str, providers: List[str], output: str) -> List[str]:
+    """Download the providers' databases from bucket[/prefix] into output"""
+    import boto3
+
+    bucket, _, prefix = location.partition('/')
+    prefix = f"{prefix.strip('/')}/" if prefix else 'watchy-history/'
+    s3 = boto3.client('s3')
+    os.makedirs(output, exist_ok=True)
+    paths = []
+    for provider in providers:
+        path = os.path.join(output, f"{provider}.sqlite")
+        s3.download_file(bucket, f"{prefix}{provider}.sqlite", path)
+        paths.append(path)
+    return paths
+
+def with_times(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Add readable timestamps next to the millisecond fields"""
+    record = dict(record)
+    for key in ('started_ms', 'resolved_ms', 'since_ms', 'until_ms'):
+        if record.get(key) is not None:
+            record[key.replace('_ms', '')] = format_timestamp_ms(record[key])
+    return record
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Query the Watchy incident history')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = subparsers.add_parser('fetch', help='Download history databases from S3')
+    fetch_parser.add_argument('location', help='bucket[/prefix] (default prefix: watchy-history/)')
+    fetch_parser.add_argument('--provider', nargs='+', required=True, help='Provider names, e.g. slack github')
+    fetch_parser.add_argument('-o', '--output', default='.')
+
+    for command, help_text in (('summary', 'Incident count, impacted time and MTTR for a window'),
+                               ('incidents', 'List the incidents overlapping a window')):
+        query_parser = subparsers.add_parser(command, help=help_text)
+        query_parser.add_argument('--db', action='append', required=True, help='History database (repeatable)')
+        query_parser.add_argument('--provider', help='Only this provider')
+        query_parser.add_argument('--service', help='Only incidents affecting this service or component')
+        query_parser.add_argument('--since', help='Window start (default: everything)')
+        query_parser.add_argument('--until', help='Window end (default: now)')
+        if command == 'summary':
+            query_parser.add_argument('--by-service', action='store_true', help='One summary per service')
+
+    slo_parser = subparsers.add_parser('slo', help='Availability per service from the rollups')
+    slo_parser.add_argument('--rollups', required=True, help='A <provider>-rollups.json state document')
+    slo_parser.add_argument('--period', choices=list(PERIODS), default='month')
+    slo_parser.add_argument('--since', help='First bucket, e.g. 2026-01 for months or 2026-01-31 for days')
+    slo_parser.add_argument('--until', help='Last bucket (inclusive)')
+    slo_parser.add_argument('--buckets', action='store_true', help='One row per bucket instead of a total')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'fetch':
+        print(json.dumps(fetch(args.location, args.provider, args.output), indent=2))
+        return 0
+
+    if args.command == 'slo':
+        with open(args.rollups, 'r', encoding='utf-8') as f:
+            rollups = json.load(f)
+        rows = summarize(rollups, args.period, args.since, args.until)
+        if not args.buckets:
+            services = sorted({row['service'] for row in rows})
+            rows = []
+            for service in services:
+                value, transitions = total_availability(rollups, service, args.period, args.since, args.until)
+                rows.append({'service': service, 'availability': value, 'transitions': transitions})
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    since_ms, until_ms = parse_time_ms(args.since), parse_time_ms(args.until)
+    results = []
+    for path in args.db:
+        if not os.path.exists(path):
+            parser.error(f"no such database: {path}")
+        history = IncidentHistory(path)
+        try:
+            if args.command == 'incidents':
+                results.extend(history.incidents(args.provider, args.service, since_ms, until_ms))
+            elif args.by_service:
+                for provider, service in history.services(args.provider):
+                    if not args.service or service == args.service:
+                        results.append(history.summary(provider, service, since_ms, until_ms))
+            else:
+                for provider in [args.provider] if args.provider else history.providers():
+                    results.append(history.summary(provider, args.service, since_ms, until_ms))
+        finally:
+            history.close()
+
+    print(json.dumps([with_times(result) for result in results], indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""Local stand-ins for the status APIs and the AWS clients the Lambdas use
+
+StatusServer serves status documents over HTTP with ETag/304 support and
+optional latency and error injection. A scenario is a timeline of such
+documents (an incident opens, gets updates, escalates and resolves), either
+one of the built-in synthetic SCENARIOS or a JSON file, possibly recorded
+from a real status page. FakeAWSClient records the CloudWatch and CloudWatch
+Logs calls it receives instead of sending them.
+
+Usage:
+    python tools/standin.py list                                # built-in scenarios
+    python tools/standin.py replay slack-escalation             # run the handler once per step
+    python tools/standin.py replay github-outage --loops 20     # throughput over repeated replays
+    python tools/standin.py serve slack-escalation --advance-every 1
+    python tools/standin.py serve payload.json --latency-ms 2000
+    python tools/standin.py dump github-escalation -o scenario.json
+    python tools/standin.py record https://www.githubstatus.com/api/v2/summary.json \\
+        --provider github --polls 12 --interval 300 -o recorded.json
+
+A scenario file is JSON: {"name", "provider", "description", "steps": [...]},
+where each step has a "payload" and optionally "latency_ms", "error_status",
+"error_rate" (0-1, fraction of requests that fail) and "drop" (close the
+connection without answering).
+"""
+import argparse
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'lambda'))
+
+from watchy_core.clients import set_boto3_client  # noqa: E402
+
+# ===== STATUS API STAND-IN =====
+
+class StatusServer:
+    """Serve a status document on 127.0.0.1, answering 304 to a matching If-None-Match
+
+    The document is gzip-compressed for requests that accept it, unless
+    compress is turned off. latency_ms delays every answer, error_status is returned instead of the
+    document for an error_rate fraction of requests (all of them by default),
+    and drop closes the connection without answering. Use as a context
+    manager; the server runs on a daemon thread on a free port.
+    """
+
+    def __init__(self, payload: Any = None, seed: int = 0):
+        self.requests = 0
+        self.latency_ms = 0
+        self.error_status: Optional[int] = None
+        self.error_rate = 1.0
+        self.drop = False
+        self.compress = True
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.set_payload(payload if payload is not None else {})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+
+    def set_payload(self, payload: Any):
+        """Replace the served document; a dict or list is JSON-encoded"""
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self._body = body
+        self._gzip_body = gzip.compress(body)
+        self._etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def apply_step(self, step: Dict[str, Any]):
+        """Serve a scenario step: its payload and fault injection settings"""
+        self.set_payload(step.get('payload', {}))
+        self.latency_ms = step.get('latency_ms', 0)
+        self.error_status = step.get('error_status')
+        self.error_rate = step.get('error_rate', 1.0)
+        self.drop = step.get('drop', False)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/api"
+
+    def respond(self, handler: BaseHTTPRequestHandler):
+        """Answer one GET request"""
+        with self._lock:
+            self.requests += 1
+            failing = self._random.random() < self.error_rate
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        if self.drop and failing:
+            handler.close_connection = True
+            return
+        if self.error_status and failing:
+            handler.send_response(self.error_status)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+
+        if handler.headers.get('If-None-Match') == self._etag:
+            handler.send_response(304)
+            handler.send_header('ETag', self._etag)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+        body = self._body
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('ETag', self._etag)
+        if self.compress and 'gzip' in handler.headers.get('Accept-Encoding', ''):
+            body = self._gzip_body
+            handler.send_header('Content-Encoding', 'gzip')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle on, a small
+            # body waits for the client's delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.respond(self)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark and test output clean
+
+        return Handler
+
+    def __enter__(self) -> 'StatusServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+class ScenarioServer(StatusServer):
+    """Serve a scenario's steps in order, advancing on advance() or every advance_every requests"""
+
+    def __init__(self, scenario: Dict[str, Any], advance_every: int = 0, seed: int = 0):
+        self.steps = scenario['steps']
+        self.step_index = 0
+        self.advance_every = advance_every
+        super().__init__(seed=seed)
+        self.apply_step(self.steps[0])
+
+    def advance(self) -> bool:
+        """Move to the next step; return False once the last step is being served"""
+        if self.step_index + 1 >= len(self.steps):
+            return False
+        self.step_index += 1
+        self.apply_step(self.steps[self.step_index])
+        return True
+
+    def respond(self, handler: BaseHTTPRequestHandler):
+        super().respond(handler)
+        if self.advance_every and self.requests % self.advance_every == 0:
+            self.advance()
+
+# ===== AWS STAND-INS =====
+
+class FakeClientExceptions:
+    """Stand-in for a boto3 client's exceptions namespace: every name is an Exception subclass"""
+
+    def __getattr__(self, name: str):
+        exception = type(name, (Exception,), {})
+        setattr(self, name, exception)
+        return exception
+
+class FakeAWSClient:
+    """Record boto3 calls instead of sending them
+
+    Every operation succeeds with an empty response. With record=False only
+    per-operation counts are kept, so large benchmark runs do not hold every
+    payload in memory.
+    """
+
+    def __init__(self, service_name: str, record: bool = True):
+        self.service_name = service_name
+        self.record = record
+        self.exceptions = FakeClientExceptions()
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def handle(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the response of one operation"""
+        return {}
+
+    def __getattr__(self, operation: str):
+        if operation.startswith('_'):
+            raise AttributeError(operation)
+
+        def call(**params):
+            with self._lock:
+                self.counts[operation] += 1
+                if self.record:
+                    self.calls.append((operation, params))
+            return self.handle(operation, params)
+
+        return call
+
+def install_fake_clients(services=('logs', 'cloudwatch'), record: bool = True,
+                         client_class=FakeAWSClient) -> Dict[str, Any]:
+    """Replace the cached boto3 clients of the given services with fakes and return them"""
+    fakes = {}
+    for service_name in services:
+        fakes[service_name] = client_class(service_name, record=record)
+        set_boto3_client(service_name, fakes[service_name])
+    return fakes
+
+def published_log_entries(logs_client: FakeAWSClient) -> List[Dict[str, Any]]:
+    """Decode every log entry a fake CloudWatch Logs client received"""
+    return [json.loads(event['message'])
+            for operation, params in logs_client.calls if operation == 'put_log_events'
+            for event in params['logEvents']]
+
+def published_metrics(cloudwatch_client: FakeAWSClient) -> List[Tuple[str, str, float]]:
+    """Return (namespace, metric, value) for every datum a fake CloudWatch client received"""
+    return [(params['Namespace'], datum['MetricName'], datum['Value'])
+            for operation, params in cloudwatch_client.calls if operation == 'put_metric_data'
+            for datum in params['MetricData']]
+
+# ===== SCENARIOS =====
+
+def iso(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def slack_escalation(start: datetime) -> Dict[str, Any]:
+    """A Slack notice that gets an update, escalates to an outage and resolves"""
+    def note(minute: int, body: str) -> Dict[str, Any]:
+        return {'date_created': iso(start + timedelta(minutes=minute)), 'body': body}
+
+    def incident(incident_type: str, services: List[str], notes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'id': 4242,
+            'date_created': iso(start + timedelta(minutes=1)),
+            'date_updated': notes[-1]['date_created'],
+            'title': 'Messages are slow to send',
+            'type': incident_type,
+            'status': 'active',
+            'url': 'https://status.slack.com/2025-01/4242',
+            'services': services,
+            'notes': notes
+        }
+
+    notes = [
+        note(1, '<p>We are <b>investigating</b> reports of slow message delivery.</p>'),
+        note(2, '<p>Delivery delays affect some workspaces &amp; Huddles.</p>'),
+        note(3, '<p>Messages are failing to send for most users.&nbsp;We are working on a fix.</p>'),
+        note(4, '<p>A fix has been deployed and messages are sending normally.</p>')
+    ]
+    clear = {'status': 'ok', 'date_updated': iso(start), 'active_incidents': []}
+    return {
+        'name': 'slack-escalation',
+        'provider': 'slack',
+        'description': 'Notice opens, gets an update, escalates to an outage and resolves',
+        'steps': [
+            {'note': 'all clear', 'payload': clear},
+            {'note': 'notice opens', 'payload': {'status': 'active', 'active_incidents': [
+                incident('notice', ['Messaging'], notes[:1])]}},
+            {'note': 'update', 'payload': {'status': 'active', 'active_incidents': [
+                incident('incident', ['Messaging', 'Huddles'], notes[:2])]}},
+            {'note': 'escalates to outage', 'payload': {'status': 'active', 'active_incidents': [
+                incident('outage', ['Messaging', 'Huddles'], notes[:3])]}},
+            {'note': 'unchanged', 'payload': {'status': 'active', 'active_incidents': [
+                incident('outage', ['Messaging', 'Huddles'], notes[:3])]}},
+            {'note': 'final update', 'payload': {'status': 'active', 'active_incidents': [
+                incident('outage', ['Messaging', 'Huddles'], notes)]}},
+            {'note': 'resolved', 'payload': clear}
+        ]
+    }
+
+def github_escalation(start: datetime) -> Dict[str, Any]:
+    """A GitHub Actions incident that escalates from minor to major and resolves"""
+    from watchy_core.providers.github import GITHUB_COMPONENTS
+
+    def update(minute: int, status: str, body: str) -> Dict[str, Any]:
+        return {'id': f"upd-{minute}", 'status': status, 'body': body,
+                'created_at': iso(start + timedelta(minutes=minute))}
+
+    def summary(indicator: str, component_status: str, incidents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'page': {'id': 'standin', 'name': 'GitHub', 'updated_at': iso(start)},
+            'status': {'indicator': indicator, 'description': 'Stand-in'},
+            'components': [{'id': f"c{i}", 'name': name,
+                            'status': component_status if name == 'Actions' else 'operational'}
+                           for i, name in enumerate(GITHUB_COMPONENTS)],
+            'incidents': incidents,
+            'scheduled_maintenances': []
+        }
+
+    def incident(impact: str, status: str, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'id': 'inc-actions', 'name': 'Degraded performance for Actions', 'status': status,
+            'impact': impact, 'shortlink': 'https://stspg.io/standin',
+            'created_at': updates[-1]['created_at'], 'updated_at': updates[0]['created_at'],
+            'components': [{'name': 'Actions', 'status': 'partial_outage'}],
+            'incident_updates': updates
+        }
+
+    # Statuspage lists updates newest first
+    updates = [
+        update(1, 'investigating', 'We are investigating reports of <b>delayed</b> Actions runs.'),
+        update(2, 'identified', 'Runs are queued for up to 30 minutes &amp; some fail to start.'),
+        update(3, 'monitoring', 'A fix is rolling out; queue times are recovering.')
+    ]
+    return {
+        'name': 'github-escalation',
+        'provider': 'github',
+        'description': 'Actions incident opens as minor, escalates to major and resolves',
+        'steps': [
+            {'note': 'all clear', 'payload': summary('none', 'operational', [])},
+            {'note': 'minor incident opens', 'payload': summary('minor', 'degraded_performance', [
+                incident('minor', 'investigating', updates[:1])])},
+            {'note': 'escalates to major', 'payload': summary('major', 'partial_outage', [
+                incident('major', 'identified', updates[1::-1])])},
+            {'note': 'monitoring', 'payload': summary('minor', 'degraded_performance', [
+                incident('major', 'monitoring', updates[::-1])])},
+            {'note': 'resolved', 'payload': summary('none', 'operational', [])}
+        ]
+    }
+
+def with_faults(scenario: Dict[str, Any], name: str, description: str,
+                faults: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy a scenario, merging fault injection settings into the given steps"""
+    steps = [dict(step, **faults.get(i, {})) for i, step in enumerate(scenario['steps'])]
+    return dict(scenario, name=name, description=description, steps=steps)
+
+SCENARIOS = {
+    'slack-escalation': slack_escalation,
+    'github-escalation': github_escalation,
+    'slack-flaky': lambda start: with_faults(
+        slack_escalation(start), 'slack-flaky',
+        'Escalation timeline with slow answers and half of the requests failing with 503',
+        {i: {'latency_ms': 200, 'error_status': 503, 'error_rate': 0.5} for i in range(1, 6)}),
+    'github-outage': lambda start: with_faults(
+        github_escalation(start), 'github-outage',
+        'Escalation timeline where the status API is down for one poll and slow for another',
+        {2: {'error_status': 503}, 3: {'latency_ms': 3000}}),
+}
+
+def load_scenario(name_or_path: str, start: Optional[datetime] = None) -> Dict[str, Any]:
+    """Build a built-in scenario (timestamps relative to start) or read a scenario file"""
+    if name_or_path in SCENARIOS:
+        start = start or datetime.now(timezone.utc) - timedelta(minutes=5)
+        return SCENARIOS[name_or_path](start)
+    with open(name_or_path) as f:
+        data = json.load(f)
+    if 'steps' not in data:
+        # A bare status document serves as a one-step scenario
+        data = {'name': os.path.basename(name_or_path), 'steps': [{'payload': data}]}
+    return data
+
+# ===== REPLAY =====
+
+def provider_for(name: str, api_url: str):
+    """Build a provider adapter pointed at the stand-in"""
+    from watchy_core.providers import build_provider
+    return build_provider({'type': name, 'api_url': api_url} if name in ('slack', 'github')
+                          else {'type': 'statuspage', 'name': name, 'api_url': api_url})
+
+def item_keys(provider, payload: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """(incident id, timestamp, cleaned body) of every log item in a payload, as logged"""
+    from watchy_core.text import format_timestamp_ms, strip_html_tags
+    return [(incident.key, format_timestamp_ms(item.created_ms), strip_html_tags(item.body))
+            for incident in provider.incidents(payload) for item in incident.items
+            if item.body and item.created_ms is not None]
+
+def replay(scenario: Dict[str, Any], provider_name: Optional[str] = None, seed: int = 0) -> Dict[str, Any]:
+    """Run the handler once per scenario step against the stand-ins and check deduplication
+
+    Every log item served by a step after the first must be published exactly
+    once by the end of the replay; items of the first step are only published
+    when they fall inside the polling window, as on a first deployment.
+    """
+    from watchy_core import run_monitor
+
+    provider_name = provider_name or scenario.get('provider', 'slack')
+    fakes = install_fake_clients(('logs', 'cloudwatch'))
+    os.environ['WATCHY_STATE_LOCATION'] = tempfile.mkdtemp(prefix='watchy-standin-')
+
+    steps = []
+    with ScenarioServer(scenario, seed=seed) as server:
+        # A unique URL keeps conditional GET validators of earlier replays out of this one
+        provider = provider_for(provider_name, f"{server.url}?replay={time.time_ns()}")
+        for index, step in enumerate(scenario['steps']):
+            if index:
+                server.advance()
+            requests_before = server.requests
+            logs_before = len(published_log_entries(fakes['logs']))
+            metrics_before = len(published_metrics(fakes['cloudwatch']))
+
+            start = time.perf_counter()
+            response = run_monitor(provider)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            body = json.loads(response['body'])
+            new_metrics = published_metrics(fakes['cloudwatch'])[metrics_before:]
+            steps.append({
+                'step': index,
+                'note': step.get('note', ''),
+                'status_code': response['statusCode'],
+                'api_response': next((value for _, name, value in new_metrics if name == 'APIResponse'), None),
+                'unchanged': body.get('unchanged'),
+                'http_requests': server.requests - requests_before,
+                'logs_published': len(published_log_entries(fakes['logs'])) - logs_before,
+                'metrics_published': len(new_metrics),
+                'elapsed_ms': round(elapsed_ms, 1)
+            })
+
+    expected = set()
+    for step in scenario['steps'][1:]:
+        expected.update(item_keys(provider, step.get('payload', {})))
+    published = Counter((str(entry['incident_id']), entry['timestamp'], entry[provider.body_field])
+                        for entry in published_log_entries(fakes['logs']))
+    duplicates = sorted(key for key, count in published.items() if count > 1)
+    missing = sorted(expected - set(published))
+
+    return {
+        'scenario': scenario.get('name', ''),
+        'provider': provider_name,
+        'steps': steps,
+        'items_expected': len(expected),
+        'items_published': sum(published.values()),
+        'duplicates': [list(key) for key in duplicates],
+        'missing': [list(key) for key in missing],
+        'ok': not duplicates and not missing
+    }
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_replays(scenario: Dict[str, Any], provider_name: Optional[str], loops: int, seed: int) -> Dict[str, Any]:
+    """Replay a scenario loops times with fresh state and summarise throughput and correctness"""
+    replays = [replay(scenario, provider_name, seed + loop) for loop in range(loops)]
+
+    report = replays[0] if loops == 1 else {
+        'scenario': replays[0]['scenario'],
+        'provider': replays[0]['provider'],
+        'loops': loops,
+        'ok': all(result['ok'] for result in replays),
+        'failed_loops': [loop for loop, result in enumerate(replays) if not result['ok']]
+    }
+    # Throughput counts handler time only, not starting and stopping the stand-ins
+    invocations = [step['elapsed_ms'] for result in replays for step in result['steps']]
+    handler_seconds = sum(invocations) / 1000
+    report['throughput'] = {
+        'invocations': len(invocations),
+        'invocations_per_second': round(len(invocations) / handler_seconds, 1) if handler_seconds else None,
+        'p50_ms': round(statistics.median(invocations), 1),
+        'p95_ms': round(percentile(invocations, 0.95), 1),
+        'max_ms': round(max(invocations), 1)
+    }
+    return report
+
+# ===== RECORDING =====
+
+def record(url: str, provider_name: str, polls: int, interval: float) -> Dict[str, Any]:
+    """Poll a real status API and keep every distinct document as a scenario step"""
+    steps = []
+    for poll in range(polls):
+        if poll:
+            time.sleep(interval)
+        request = urllib.request.Request(url, headers={'User-Agent': 'Watchy-StandinRecorder',
+                                                       'Accept': 'application/json'})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            payload = json.loads(response.read().decode('utf-8'))
+        if not steps or steps[-1]['payload'] != payload:
+            steps.append({'note': f"recorded {datetime.now(timezone.utc).isoformat()}", 'payload': payload})
+        print(f"Poll {poll + 1}/{polls}: {len(steps)} distinct documents", file=sys.stderr)
+    return {
+        'name': f"recorded-{provider_name}",
+        'provider': provider_name,
+        'description': f"Recorded from {url}",
+        'steps': steps
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Local status API stand-in and scenario replay')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List the built-in scenarios')
+
+    replay_parser = subparsers.add_parser('replay', help='Run the handler once per scenario step')
+    replay_parser.add_argument('scenario', help='Built-in scenario name or scenario/payload JSON file')
+    replay_parser.add_argument('--provider', help='Provider adapter to run (default: from the scenario)')
+    replay_parser.add_argument('--loops', type=int, default=1, help='Replay this many times for throughput')
+    replay_parser.add_argument('--seed', type=int, default=0, help='Seed of the error injection')
+
+    serve_parser = subparsers.add_parser('serve', help='Serve a scenario or payload for an external client')
+    serve_parser.add_argument('scenario', help='Built-in scenario name or scenario/payload JSON file')
+    serve_parser.add_argument('--advance-every', type=int, default=0,
+                              help='Move to the next step after this many requests (0: stay on the first)')
+    serve_parser.add_argument('--latency-ms', type=int, help='Override the latency of every step')
+    serve_parser.add_argument('--error-status', type=int, help='Override the error status of every step')
+    serve_parser.add_argument('--error-rate', type=float, help='Override the error rate of every step')
+
+    dump_parser = subparsers.add_parser('dump', help='Write a built-in scenario as JSON')
+    dump_parser.add_argument('scenario')
+    dump_parser.add_argument('-o', '--output')
+
+    record_parser = subparsers.add_parser('record', help='Record a scenario from a real status API')
+    record_parser.add_argument('url')
+    record_parser.add_argument('--provider', required=True)
+    record_parser.add_argument('--polls', type=int, default=12)
+    record_parser.add_argument('--interval', type=float, default=300, help='Seconds between polls')
+    record_parser.add_argument('-o', '--output')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        start = datetime.now(timezone.utc)
+        for name, build in SCENARIOS.items():
+            scenario = build(start)
+            print(f"{name:<20} {scenario['provider']:<8} {len(scenario['steps'])} steps  {scenario['description']}")
+        return 0
+
+    if args.command == 'replay':
+        os.environ.setdefault('WATCHY_LOG_LEVEL', 'ERROR')
+        os.environ.setdefault('WATCHY_METRICS_MODE', 'api')
+        os.environ['WATCHY_STATE_BACKEND'] = 'file'
+        # The handlers log to stdout; keep it for the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            report = run_replays(load_scenario(args.scenario), args.provider, max(1, args.loops), args.seed)
+        print(json.dumps(report, indent=2))
+        return 0 if report['ok'] else 1
+
+    if args.command in ('dump', 'record'):
+        scenario = (load_scenario(args.scenario) if args.command == 'dump'
+                    else record(args.url, args.provider, args.polls, args.interval))
+        output = json.dumps(scenario, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output + '\n')
+        else:
+            print(output)
+        return 0
+
+    scenario = load_scenario(args.scenario)
+    overrides = {key: value for key, value in (('latency_ms', args.latency_ms),
+                                               ('error_status', args.error_status),
+                                               ('error_rate', args.error_rate)) if value is not None}
+    scenario['steps'] = [dict(step, **overrides) for step in scenario['steps']]
+    with ScenarioServer(scenario, advance_every=args.advance_every) as server:
+        print(f"Serving {scenario.get('name', args.scenario)} ({len(scenario['steps'])} steps) at {server.url}",
+              file=sys.stderr)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())